@@ -1,12 +1,14 @@
 import logging
 
-from bloodytools.main import main
 from bloodytools.utils.args import arg_parse_config
-from bloodytools.utils.utils import logger_config
 
 if __name__ == "__main__":
     args = arg_parse_config()
 
-    logger_config(logging.getLogger("bloodytools"), args.debug)
+    # imported after parsing the arguments, --help stays fast
+    from bloodytools.main import main
+    from bloodytools.utils.utils import logger_config
+
+    logger_config(logging.getLogger("bloodytools"), args.debug, args.log_directory)
 
     main(args)
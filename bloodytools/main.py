@@ -19,14 +19,67 @@ May 2018
 
 import datetime
 import logging
+import typing
 
-from bloodytools.simulations import simulator_factory
+from bloodytools.pipeline import create_job_record, create_tasks, run_pipelined
+from bloodytools.utils import autotune, scratch
 from bloodytools.utils.args import arg_parse_config
 from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import (
+    CostModel,
+    Job,
+    get_job_key,
+    get_jobs,
+    order_longest_first,
+    project_duration,
+)
+from bloodytools.utils.history import JobHistory, JobRecord
+from bloodytools.utils.profile_extraction import get_profile_index
+from bloodytools.utils.result_registry import ResultRegistry
+from bloodytools.utils.run_metadata import get_run_metadata
+from bloodytools.worker_pool import run_worker_pool
+from simc_support.game_data.WowSpec import WowSpec, get_wow_spec
 
 logger = logging.getLogger(__name__)
 
 
+def run_simulators(
+    config: Config,
+    wow_spec: WowSpec,
+    fight_style: str,
+    result_registry: ResultRegistry,
+) -> JobRecord:
+    """Run all simulators of config for one spec and fight style."""
+    job_name = scratch.get_job_name(
+        (wow_spec.wow_class.simc_name, wow_spec.simc_name, fight_style)
+    )
+    with scratch.job_directory(config, job_name) as directory:
+        tasks = create_tasks(config, wow_spec, fight_style, result_registry, directory)
+        try:
+            for task in tasks:
+                task.run()
+        except Exception as e:
+            logger.exception(e)
+            raise e
+
+    return create_job_record(tasks)
+
+
+def _log_projection(
+    config: Config, jobs: typing.List[Job], estimates: typing.Dict[Job, float]
+) -> None:
+    seconds = project_duration(jobs, estimates, config.workers)
+    if not seconds:
+        logger.info(
+            f"No similar jobs in '{config.job_history}' yet, can't project the duration of the run."
+        )
+        return
+    duration = datetime.timedelta(seconds=round(seconds))
+    logger.info(
+        f"Projected duration of {len(jobs)} jobs: {duration}, finishing around {datetime.datetime.utcnow() + duration:%Y-%m-%d %H:%M} UTC."
+    )
+
+
 def main(args=None):
     logger.debug("main start")
     logger.info("Bloodytools at your service.")
@@ -40,23 +93,71 @@ def main(args=None):
 
     bloodytools_start_time = datetime.datetime.utcnow()
 
-    for wow_spec in config.wow_specs:
-        for simulator_name in config.simulator_type_names:
-            simulator = simulator_factory.get_simulator(simulator_name)
-            for fight_style in config.fight_styles:
-                logger.info(
-                    f"Starting {simulator.name()} simulation for {wow_spec} fighting {fight_style}."
+    # collected once, shared by all simulations
+    run_metadata = get_run_metadata(config.executable)
+    logger.info(
+        f"bloodytools revision: '{run_metadata.bloodytools_hash}', SimulationCraft: '{run_metadata.simc_version}' build '{config.simc_hash}'."
+    )
+
+    # report missing profiles of the whole run before simulating anything
+    if not config.custom_profile:
+        for wow_spec, fight_style in get_profile_index(
+            config.executable
+        ).get_missing_profiles(config.wow_specs, config.tier, config.fight_styles):
+            logger.warning(f"No profile found for {wow_spec} fighting {fight_style}.")
+
+    if config.autotune and config.workers == 1:
+        job_count = len(config.wow_class_spec_names) * len(config.fight_styles)
+        config.workers = autotune.tune_workers(job_count, autotune.get_core_count())
+        logger.info(
+            f"Autotuned {config.workers} workers for {job_count} spec and fight style combinations."
+        )
+
+    if config.plan:
+        # imports all simulators
+        from bloodytools.planner import write_plan
+
+        write_plan(config)
+        return
+
+    # simulators of the same spec and fight style often share profiles, e.g. baselines
+    result_registry = ResultRegistry()
+
+    jobs = get_jobs(config)
+    job_history = JobHistory(config.job_history)
+    estimates = CostModel(job_history, config).estimate_all(jobs)
+    if config.workers > 1:
+        jobs = order_longest_first(jobs, estimates)
+    _log_projection(config, jobs, estimates)
+
+    # temporary simc files of all jobs, removed even if the run fails
+    with scratch.run_directory(config):
+        if config.workers > 1:
+            if config.pipeline:
+                logger.warning(
+                    f"--pipeline is ignored with {config.workers} workers, workers already overlap their simulations."
                 )
-                try:
-                    simulator(
-                        wow_spec=wow_spec,
-                        fight_style=fight_style,
-                        settings=config,
-                    ).run()
-                except Exception as e:
-                    logger.exception(e)
-                    raise e
-                logger.info(f"{simulator.name()} simulations finished.")
+            result_registry.hits = run_worker_pool(config, jobs, job_history)
+        elif config.pipeline:
+            for job, record in run_pipelined(config, jobs, result_registry).items():
+                job_history.add(get_job_key(job, config), record)
+        else:
+            for job in jobs:
+                wow_class_name, wow_spec_name, fight_style = job
+                job_history.add(
+                    get_job_key(job, config),
+                    run_simulators(
+                        config,
+                        get_wow_spec(wow_class_name, wow_spec_name),
+                        fight_style,
+                        result_registry,
+                    ),
+                )
+
+    if result_registry.hits:
+        logger.info(
+            f"Reused {result_registry.hits} simulation results across simulators."
+        )
 
     logger.info(
         "Bloodytools took {} to finish.".format(
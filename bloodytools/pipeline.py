@@ -0,0 +1,277 @@
+"""Run the simulators of spec and fight style jobs in overlapping stages.
+
+Simulator.run() prepares the simulation group, simulates it and collects
+and writes the results. Only simulating keeps simc busy, preparing and
+finishing keep Python busy. With run_pipelined each stage runs in its own
+thread. While simc simulates one task, the next task is prepared and the
+previous one is finished. Stages are connected by bounded queues, so at
+most QUEUE_SIZE prepared or simulated tasks wait for the next stage.
+
+A task is one simulator, or all fused simulators of a job. Simulators with
+their own simulation flow run completely in the simulate stage.
+
+Probes started while preparing, e.g. to extract talent strings, run next
+to the simulation of the previous task.
+
+All tasks of a job write their temporary files to the job's directory, see
+scratch. The directory is removed once the last task of the job finished.
+"""
+
+import datetime
+import logging
+import queue
+import threading
+import typing
+
+from bloodytools.simulations import simulator_factory
+from bloodytools.simulations.fusion import (
+    FusedRun,
+    finish_fused,
+    is_fusable,
+    prepare_fused,
+    simulate_fused,
+)
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import Job
+from bloodytools.utils.history import JobRecord
+from bloodytools.utils import scratch
+from bloodytools.utils.result_registry import ResultRegistry
+from bloodytools.utils.simulation_objects import Simulation_Group
+from simc_support.game_data.WowSpec import WowSpec, get_wow_spec
+
+logger = logging.getLogger(__name__)
+
+# prepared and simulated tasks waiting for the next stage
+QUEUE_SIZE = 1
+# seconds between checks whether another stage failed
+POLL_INTERVAL = 0.1
+
+
+class Task:
+    """Simulators of one spec and fight style that run together, split into the stages of Simulator.run()."""
+
+    def __init__(
+        self,
+        simulators: typing.List[Simulator],
+        fused: bool = False,
+        directory: str = "",
+    ) -> None:
+        self.simulators = simulators
+        self.fused = fused
+        # temporary files of all stages, "" for the current directory
+        self.directory = directory
+        # time spent in all stages
+        self.seconds = 0.0
+        self._prepared: typing.Optional[typing.Tuple[dict, Simulation_Group]] = None
+        self._fused_run: typing.Optional[FusedRun] = None
+
+    @property
+    def _has_own_flow(self) -> bool:
+        return not self.fused and type(self.simulators[0]).run is not Simulator.run
+
+    def _log_start(self) -> None:
+        simulator = self.simulators[0]
+        if self.fused:
+            logger.info(
+                f"Starting fused {', '.join(s.name() for s in self.simulators)} simulations for {simulator.wow_spec} fighting {simulator.fight_style}."
+            )
+        else:
+            logger.info(
+                f"Starting {simulator.name()} simulation for {simulator.wow_spec} fighting {simulator.fight_style}."
+            )
+
+    def _add_time(self, start_time: datetime.datetime) -> None:
+        self.seconds += (datetime.datetime.utcnow() - start_time).total_seconds()
+
+    def prepare(self) -> None:
+        self._log_start()
+        start_time = datetime.datetime.utcnow()
+        with scratch.use_directory(self.directory):
+            if self.fused:
+                self._fused_run = prepare_fused(self.simulators)
+            elif not self._has_own_flow:
+                self._prepared = self.simulators[0].prepare()
+        self._add_time(start_time)
+
+    def simulate(self) -> None:
+        start_time = datetime.datetime.utcnow()
+        with scratch.use_directory(self.directory):
+            if self._fused_run is not None:
+                simulate_fused(self._fused_run)
+            elif self._prepared is not None:
+                self.simulators[0]._simulate(self._prepared[1])
+            else:
+                self.simulators[0].run()
+        self._add_time(start_time)
+
+    def finish(self) -> None:
+        start_time = datetime.datetime.utcnow()
+        with scratch.use_directory(self.directory):
+            if self._fused_run is not None:
+                finish_fused(self._fused_run)
+            elif self._prepared is not None:
+                self.simulators[0].finish(*self._prepared)
+        if not self.fused:
+            logger.info(f"{self.simulators[0].name()} simulations finished.")
+        # prepared groups can be large
+        self._prepared = None
+        self._fused_run = None
+        self._add_time(start_time)
+
+    def run(self) -> None:
+        self.prepare()
+        self.simulate()
+        self.finish()
+
+
+def create_tasks(
+    config: Config,
+    wow_spec: WowSpec,
+    fight_style: str,
+    result_registry: ResultRegistry,
+    directory: str = "",
+) -> typing.List[Task]:
+    """Tasks of all simulators of config for one spec and fight style. Fusable simulators share a task if config.fuse is set."""
+    simulators = [
+        simulator_factory.get_simulator(simulator_name)(
+            wow_spec=wow_spec,
+            fight_style=fight_style,
+            settings=config,
+            result_registry=result_registry,
+        )
+        for simulator_name in config.simulator_type_names
+    ]
+    fusable = [s for s in simulators if config.fuse and is_fusable(s)]
+    tasks = [Task([s], directory=directory) for s in simulators if s not in fusable]
+    if fusable:
+        tasks.append(Task(fusable, fused=True, directory=directory))
+    return tasks
+
+
+def create_job_record(tasks: typing.Iterable[Task]) -> JobRecord:
+    tasks = list(tasks)
+    simulators = [simulator for task in tasks for simulator in task.simulators]
+    return JobRecord(
+        seconds=sum(task.seconds for task in tasks),
+        profilesets=sum(s.simulated_profilesets for s in simulators),
+        iterations=sum(s.simulated_iterations for s in simulators),
+    )
+
+
+def _put(
+    task_queue: "queue.Queue[typing.Optional[Task]]",
+    task: typing.Optional[Task],
+    stop: threading.Event,
+) -> None:
+    """Put task into task_queue unless another stage failed."""
+    while not stop.is_set():
+        try:
+            task_queue.put(task, timeout=POLL_INTERVAL)
+            return
+        except queue.Full:
+            pass
+
+
+def _get(
+    task_queue: "queue.Queue[typing.Optional[Task]]", stop: threading.Event
+) -> typing.Optional[Task]:
+    """Next task of task_queue, None if the previous stage is done or another stage failed."""
+    while not stop.is_set():
+        try:
+            return task_queue.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return None
+
+
+def run_pipelined(
+    config: Config, jobs: typing.List[Job], result_registry: ResultRegistry
+) -> typing.Dict[Job, JobRecord]:
+    """Run all simulators of jobs with overlapping stages.
+
+    Returns:
+        typing.Dict[Job, JobRecord]: time spent in all stages and simulated profilesets of each job
+    """
+    job_tasks: typing.Dict[Job, typing.List[Task]] = {}
+    # directories of jobs with unfinished tasks
+    directories: typing.Dict[Job, str] = {}
+    last_tasks: typing.Dict[Task, Job] = {}
+    prepared: "queue.Queue[typing.Optional[Task]]" = queue.Queue(maxsize=QUEUE_SIZE)
+    simulated: "queue.Queue[typing.Optional[Task]]" = queue.Queue(maxsize=QUEUE_SIZE)
+    stop = threading.Event()
+    errors: typing.List[BaseException] = []
+
+    def fail(e: BaseException) -> None:
+        logger.exception(e)
+        errors.append(e)
+        stop.set()
+
+    def prepare_stage() -> None:
+        try:
+            for job in jobs:
+                wow_class_name, wow_spec_name, fight_style = job
+                directories[job] = scratch.create_job_directory(
+                    config, scratch.get_job_name(job)
+                )
+                job_tasks[job] = create_tasks(
+                    config,
+                    get_wow_spec(wow_class_name, wow_spec_name),
+                    fight_style,
+                    result_registry,
+                    directories[job],
+                )
+                if job_tasks[job]:
+                    last_tasks[job_tasks[job][-1]] = job
+                for task in job_tasks[job]:
+                    if stop.is_set():
+                        return
+                    task.prepare()
+                    _put(prepared, task, stop)
+        except BaseException as e:
+            fail(e)
+        finally:
+            _put(prepared, None, stop)
+
+    def finish_stage() -> None:
+        try:
+            while True:
+                task = _get(simulated, stop)
+                if task is None:
+                    return
+                task.finish()
+                if task in last_tasks:
+                    job = last_tasks[task]
+                    scratch.remove_job_directory(
+                        config, directories.pop(job), scratch.get_job_name(job)
+                    )
+        except BaseException as e:
+            fail(e)
+
+    stages = [
+        threading.Thread(target=prepare_stage, name="prepare", daemon=True),
+        threading.Thread(target=finish_stage, name="finish", daemon=True),
+    ]
+    for stage in stages:
+        stage.start()
+
+    # simulate stage
+    try:
+        while True:
+            task = _get(prepared, stop)
+            if task is None:
+                break
+            task.simulate()
+            _put(simulated, task, stop)
+    except BaseException as e:
+        fail(e)
+    finally:
+        _put(simulated, None, stop)
+        for stage in stages:
+            stage.join()
+        for job, directory in directories.items():
+            scratch.remove_job_directory(config, directory, scratch.get_job_name(job))
+
+    if errors:
+        raise errors[0]
+    return {job: create_job_record(tasks) for job, tasks in job_tasks.items()}
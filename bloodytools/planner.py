@@ -0,0 +1,275 @@
+"""Plan a run without simulating it, see --plan.
+
+Each simulator prepares its simulations for each spec and fight style as
+usual, but SimulationCraft isn't started (see dry_run()). Probes, e.g. the
+one iteration runs extracting talent strings, and the simulation group are
+recorded. Their input is written to nowhere to measure its size. Recorded
+profiles are registered with the value 0, so identical inputs of later
+simulations count as cache hits, like they would in the real run.
+
+Core hours are estimated from the runtime history of each simulator. Runs
+without runtime history get their share of their job's estimate from the
+job history (see cost_model), split by profilesets. Durations of spec and
+fight style jobs come from the job history.
+
+Simulations that depend on earlier results, e.g. the rounds of the talent
+optimizer, can't be planned. Simulators with their own simulation flow are
+listed without simulations, simulators with additional rounds are marked
+as adaptive.
+"""
+
+import dataclasses
+import datetime
+import json
+import logging
+import typing
+
+from bloodytools.simulations import simulator_factory
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils import autotune
+from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import (
+    CostModel,
+    get_jobs,
+    order_longest_first,
+    project_duration,
+)
+from bloodytools.utils.history import JobHistory, get_runtime_history
+from bloodytools.utils.result_registry import ResultRegistry
+from bloodytools.utils.simulation_objects import PlannedSimulation, dry_run
+from simc_support.game_data.WowSpec import get_wow_spec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class PlannedRun:
+    """Planned simulations of one simulator, spec and fight style."""
+
+    simulator: str
+    wow_class: str
+    wow_spec: str
+    fight_style: str
+    # simulations started while preparing, e.g. talent string extraction
+    probes: typing.List[PlannedSimulation] = dataclasses.field(default_factory=list)
+    simulation: typing.Optional[PlannedSimulation] = None
+    # results of identical inputs reused from the registry
+    reused: int = 0
+    core_hours: typing.Optional[float] = None
+    # "runtime history" or "job history"
+    core_hours_source: str = ""
+    # reason core_hours is None
+    core_hours_missing: str = ""
+    # later simulations depend on results and aren't planned
+    adaptive: bool = False
+    # reason the run couldn't be planned
+    error: str = ""
+
+    @property
+    def simulations(self) -> typing.List[PlannedSimulation]:
+        return self.probes + ([self.simulation] if self.simulation else [])
+
+    @property
+    def profilesets(self) -> int:
+        return sum(max(0, s.profiles - 1) for s in self.simulations)
+
+    @property
+    def expected_cache_hits(self) -> int:
+        return self.reused + sum(s.collapsed for s in self.simulations)
+
+    @property
+    def input_size(self) -> int:
+        return sum(s.input_size for s in self.simulations)
+
+    def to_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            "profilesets": self.profilesets,
+            "expected_cache_hits": self.expected_cache_hits,
+            "input_size": self.input_size,
+        }
+
+
+def _plan_simulator(
+    simulator: Simulator, result_registry: ResultRegistry
+) -> PlannedRun:
+    simulator_class = type(simulator)
+    planned_run = PlannedRun(
+        simulator=simulator.snake_case_name(),
+        wow_class=simulator.wow_spec.wow_class.simc_name,
+        wow_spec=simulator.wow_spec.simc_name,
+        fight_style=simulator.fight_style,
+        adaptive=simulator_class._simulate is not Simulator._simulate,
+    )
+    if simulator_class.run is not Simulator.run:
+        planned_run.error = "own simulation flow, can't be planned"
+        return planned_run
+
+    hits = result_registry.hits
+    try:
+        with dry_run() as recorder:
+            _, simulation_group = simulator.prepare()
+            planned_run.probes = list(recorder.simulations)
+            if simulation_group.profiles:
+                simulation_group.simulate()
+            if len(recorder.simulations) > len(planned_run.probes):
+                planned_run.simulation = recorder.simulations[-1]
+    except Exception as e:
+        logger.debug(e, exc_info=True)
+        planned_run.error = str(e) or type(e).__name__
+        planned_run.core_hours_missing = "not planned"
+        return planned_run
+    planned_run.reused = result_registry.hits - hits
+
+    if not planned_run.simulation or planned_run.simulation.profiles < 2:
+        planned_run.core_hours_missing = "no profilesets"
+        return planned_run
+    thread_seconds = get_runtime_history(simulator.settings.runtime_history).get(
+        simulator.get_runtime_history_key(simulation_group)
+    )
+    if thread_seconds is None:
+        planned_run.core_hours_missing = "no runtime history"
+    else:
+        planned_run.core_hours = (
+            thread_seconds * (planned_run.simulation.profiles - 1) / 3600
+        )
+        planned_run.core_hours_source = "runtime history"
+    return planned_run
+
+
+def _get_threads_per_job(config: Config) -> int:
+    """Threads each job's simulations run with, simc uses all cores by default."""
+    if config.threads:
+        return int(config.threads)
+    return max(1, autotune.get_core_count() // max(1, config.workers))
+
+
+def _estimate_core_hours_from_job(
+    planned_runs: typing.List[PlannedRun],
+    job_seconds: typing.Optional[float],
+    threads: int,
+) -> None:
+    """Split the core hours of a job, minus the known ones, over its runs without runtime history by profilesets."""
+    missing = [r for r in planned_runs if r.core_hours_missing == "no runtime history"]
+    if not missing:
+        return
+    if job_seconds is None:
+        for planned_run in missing:
+            planned_run.core_hours_missing = "no runtime history or job history"
+        return
+
+    known_core_hours = sum(r.core_hours or 0.0 for r in planned_runs)
+    core_hours = max(0.0, job_seconds * threads / 3600 - known_core_hours)
+    profilesets = sum(r.profilesets for r in missing)
+    for planned_run in missing:
+        planned_run.core_hours = core_hours * planned_run.profilesets / profilesets
+        planned_run.core_hours_source = "job history"
+        planned_run.core_hours_missing = ""
+
+
+def create_plan(config: Config) -> dict:
+    """Plan all simulators, specs and fight styles of config."""
+    planned_runs: typing.List[PlannedRun] = []
+    cost_model = CostModel(JobHistory(config.job_history), config)
+    threads = _get_threads_per_job(config)
+    # the worker pool shares results within a job, serial runs share them across the run
+    result_registry = ResultRegistry()
+    for job in get_jobs(config):
+        wow_class_name, wow_spec_name, fight_style = job
+        if config.workers > 1:
+            result_registry = ResultRegistry()
+        job_runs: typing.List[PlannedRun] = []
+        for simulator_name in config.simulator_type_names:
+            simulator = simulator_factory.get_simulator(simulator_name)(
+                wow_spec=get_wow_spec(wow_class_name, wow_spec_name),
+                fight_style=fight_style,
+                settings=config,
+                result_registry=result_registry,
+            )
+            job_runs.append(_plan_simulator(simulator, result_registry))
+        _estimate_core_hours_from_job(job_runs, cost_model.estimate(job), threads)
+        planned_runs.extend(job_runs)
+
+    jobs = get_jobs(config)
+    estimates = cost_model.estimate_all(jobs)
+    if config.workers > 1:
+        jobs = order_longest_first(jobs, estimates)
+    known_core_hours = [r.core_hours for r in planned_runs if r.core_hours is not None]
+
+    return {
+        "simulators": config.simulator_type_names,
+        "fight_styles": config.fight_styles,
+        "workers": config.workers,
+        "runs": [planned_run.to_dict() for planned_run in planned_runs],
+        "jobs": [
+            {
+                "wow_class": wow_class_name,
+                "wow_spec": wow_spec_name,
+                "fight_style": fight_style,
+                "estimated_seconds": estimates[
+                    (wow_class_name, wow_spec_name, fight_style)
+                ],
+            }
+            for wow_class_name, wow_spec_name, fight_style in jobs
+        ],
+        "totals": {
+            "profilesets": sum(r.profilesets for r in planned_runs),
+            "probes": sum(len(r.probes) for r in planned_runs),
+            "expected_cache_hits": sum(r.expected_cache_hits for r in planned_runs),
+            "input_size": sum(r.input_size for r in planned_runs),
+            "core_hours": sum(known_core_hours),
+            "runs_without_core_hours": len(planned_runs) - len(known_core_hours),
+            "adaptive_runs": sum(r.adaptive for r in planned_runs),
+            "failed_runs": sum(bool(r.error) for r in planned_runs),
+            "projected_duration_seconds": project_duration(
+                jobs, estimates, config.workers
+            ),
+        },
+    }
+
+
+def log_plan(plan: dict) -> None:
+    """Log the plan as human readable text."""
+    for run in plan["runs"]:
+        name = f"{run['simulator']} {run['wow_spec']} {run['wow_class']} {run['fight_style']}"
+        if run["error"]:
+            logger.info(f"{name}: {run['error']}")
+            continue
+        if run["core_hours"] is None:
+            core_hours = f"unknown ({run['core_hours_missing']})"
+        else:
+            core_hours = f"{run['core_hours']:.2f} ({run['core_hours_source']})"
+        logger.info(
+            f"{name}: {run['profilesets']} profilesets, {len(run['probes'])} probes, "
+            f"{run['expected_cache_hits']} cache hits, {run['input_size'] / 1024:.0f} KiB input, "
+            f"{core_hours} core hours{', adaptive' if run['adaptive'] else ''}"
+        )
+
+    totals = plan["totals"]
+    logger.info(
+        f"Total: {totals['profilesets']} profilesets, {totals['probes']} probes, "
+        f"{totals['expected_cache_hits']} cache hits, {totals['input_size'] / 1024 / 1024:.1f} MiB input."
+    )
+    logger.info(
+        f"{totals['core_hours']:.2f} core hours, {totals['runs_without_core_hours']} runs without core hours."
+    )
+    if totals["projected_duration_seconds"]:
+        logger.info(
+            f"Projected duration with {plan['workers']} workers: {datetime.timedelta(seconds=round(totals['projected_duration_seconds']))}."
+        )
+    if totals["adaptive_runs"]:
+        logger.info(
+            f"{totals['adaptive_runs']} adaptive runs simulate additional rounds that depend on results."
+        )
+    if totals["failed_runs"]:
+        logger.warning(f"{totals['failed_runs']} runs couldn't be planned.")
+
+
+def write_plan(config: Config) -> dict:
+    """Plan the run of config, log the plan and write it to config.plan."""
+    plan = create_plan(config)
+    log_plan(plan)
+    with open(config.plan, "w", encoding="utf-8") as f:
+        json.dump(plan, f, indent=2)
+    logger.info(f"Plan written to '{config.plan}'.")
+    return plan
@@ -1,33 +1,73 @@
-from bloodytools.simulations.consumable_simulator import PhialSimulator, PotionSimulator
-from bloodytools.simulations.power_infusion_simulator import PowerInfusionSimulator
-from bloodytools.simulations.race_simulator import RaceSimulator
-from bloodytools.simulations.secondary_distribution_simulator import (
-    SecondaryDistributionSimulator,
-)
-from bloodytools.simulations.simulator import SimulatorFactory
-from bloodytools.simulations.talent_simulator import TalentSimulator
-from bloodytools.simulations.tier_set_simulator import TierSetSimulator
-from bloodytools.simulations.trinket_simulator import TrinketSimulator
-from bloodytools.simulations.talent_removal_simulator import TalentRemovalSimulator
-from bloodytools.simulations.talent_add_simulator import TalentAddSimulator
-from bloodytools.simulations.talent_target_scaling_simulator import (
-    TalentTargetScalingSimulator,
-)
-from bloodytools.simulations.weapon_enchant_simulator import WeaponEnchantmentSimulator
-from bloodytools.simulations.windfury_totem_simulator import WindfuryTotemSimulator
+from bloodytools.simulations.factory import SimulatorFactory
 
 simulator_factory = SimulatorFactory()
 
-simulator_factory.register_simulator(PhialSimulator)
-simulator_factory.register_simulator(PotionSimulator)
-simulator_factory.register_simulator(PowerInfusionSimulator)
-simulator_factory.register_simulator(RaceSimulator)
-simulator_factory.register_simulator(SecondaryDistributionSimulator)
-simulator_factory.register_simulator(TalentAddSimulator)
-simulator_factory.register_simulator(TalentRemovalSimulator)
-simulator_factory.register_simulator(TalentSimulator)
-simulator_factory.register_simulator(TalentTargetScalingSimulator)
-simulator_factory.register_simulator(TierSetSimulator)
-simulator_factory.register_simulator(TrinketSimulator)
-simulator_factory.register_simulator(WeaponEnchantmentSimulator)
-simulator_factory.register_simulator(WindfuryTotemSimulator)
+# simulator modules are only imported on first use, listing names stays cheap
+simulator_factory.declare_simulator(
+    "phials", "bloodytools.simulations.consumable_simulator", "PhialSimulator"
+)
+simulator_factory.declare_simulator(
+    "potions", "bloodytools.simulations.consumable_simulator", "PotionSimulator"
+)
+simulator_factory.declare_simulator(
+    "power_infusion",
+    "bloodytools.simulations.power_infusion_simulator",
+    "PowerInfusionSimulator",
+)
+simulator_factory.declare_simulator(
+    "races", "bloodytools.simulations.race_simulator", "RaceSimulator"
+)
+simulator_factory.declare_simulator(
+    "secondary_distributions",
+    "bloodytools.simulations.secondary_distribution_simulator",
+    "SecondaryDistributionSimulator",
+)
+simulator_factory.declare_simulator(
+    "talent_addition",
+    "bloodytools.simulations.talent_add_simulator",
+    "TalentAddSimulator",
+)
+simulator_factory.declare_simulator(
+    "talent_interactions",
+    "bloodytools.simulations.talent_interaction_simulator",
+    "TalentInteractionSimulator",
+)
+simulator_factory.declare_simulator(
+    "talent_optimizer",
+    "bloodytools.simulations.talent_optimizer_simulator",
+    "TalentOptimizerSimulator",
+)
+simulator_factory.declare_simulator(
+    "talent_removal",
+    "bloodytools.simulations.talent_removal_simulator",
+    "TalentRemovalSimulator",
+)
+simulator_factory.declare_simulator(
+    "talents", "bloodytools.simulations.talent_simulator", "TalentSimulator"
+)
+simulator_factory.declare_simulator(
+    "talent_target_scaling",
+    "bloodytools.simulations.talent_target_scaling_simulator",
+    "TalentTargetScalingSimulator",
+)
+simulator_factory.declare_simulator(
+    "tier_set", "bloodytools.simulations.tier_set_simulator", "TierSetSimulator"
+)
+simulator_factory.declare_simulator(
+    "trinkets", "bloodytools.simulations.trinket_simulator", "TrinketSimulator"
+)
+simulator_factory.declare_simulator(
+    "trinket_pairs",
+    "bloodytools.simulations.trinket_pair_simulator",
+    "TrinketPairSimulator",
+)
+simulator_factory.declare_simulator(
+    "weapon_enchantments",
+    "bloodytools.simulations.weapon_enchant_simulator",
+    "WeaponEnchantmentSimulator",
+)
+simulator_factory.declare_simulator(
+    "windfury_totem",
+    "bloodytools.simulations.windfury_totem_simulator",
+    "WindfuryTotemSimulator",
+)
@@ -0,0 +1,82 @@
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from bloodytools.simulations.simulator import Simulator
+
+
+class SimulatorFactory:
+    """Factory to make Simulators available by snake_case_names().
+
+    Simulators can be declared by module and class name. Their modules, and
+    with them game data and other heavy dependencies, are only imported once
+    the Simulator is requested.
+    """
+
+    def __init__(self) -> None:
+        self._simulators: typing.Dict[str, typing.Type["Simulator"]] = {}
+        # snake_case_name -> (module name, class name)
+        self._declared_simulators: typing.Dict[str, typing.Tuple[str, str]] = {}
+
+    def register_simulator(self, klass: typing.Type["Simulator"]):
+        """Register an implemented Simulator.
+
+        Args:
+            klass (typing.Type[Simulator]): [description]
+        """
+        # str call makes mypy happy
+        self._simulators[str(klass.snake_case_name())] = klass
+
+    def declare_simulator(
+        self, simulator_name: str, module_name: str, class_name: str
+    ) -> None:
+        """Register a Simulator without importing it.
+
+        Args:
+            simulator_name (str): snake_case_name() of the Simulator
+            module_name (str): e.g. "bloodytools.simulations.race_simulator"
+            class_name (str): e.g. "RaceSimulator"
+        """
+        self._declared_simulators[simulator_name] = (module_name, class_name)
+
+    def _import_simulator(self, simulator_name: str) -> None:
+        module_name, class_name = self._declared_simulators[simulator_name]
+        klass = getattr(importlib.import_module(module_name), class_name)
+        if klass.snake_case_name() != simulator_name:
+            raise ValueError(
+                f"{module_name}.{class_name} was declared as '{simulator_name}' but is named '{klass.snake_case_name()}'."
+            )
+        self.register_simulator(klass)
+
+    def get_simulator(
+        self,
+        simulator_name: str,
+    ) -> typing.Type["Simulator"]:
+        """Get an appropriate Simulator class for the provided simulator_name (snake_case_name())."""
+
+        if (
+            simulator_name not in self._simulators
+            and simulator_name in self._declared_simulators
+        ):
+            self._import_simulator(simulator_name)
+
+        try:
+            simulator = self._simulators[simulator_name]
+        except KeyError:
+            raise KeyError(
+                f"No Simulator found matching '{simulator_name}'. Available options: {self.list_simulator_names()}"
+            )
+
+        return simulator
+
+    def list_simulator_names(self) -> typing.List[str]:
+        """List snake_case_names() of all available Simulators without importing them."""
+        return list(dict.fromkeys([*self._declared_simulators, *self._simulators]))
+
+    def list_simulators(self) -> typing.List[typing.Type["Simulator"]]:
+        """List available Simulators. Imports all declared Simulators.
+
+        Returns:
+            typing.List[typing.Type[Simulator]]: [description]
+        """
+        return [self.get_simulator(name) for name in self.list_simulator_names()]
@@ -0,0 +1,166 @@
+"""Simulate the profiles of several simulators of one spec and fight style in a single simc run.
+
+Each simulator prepares its simulation group as usual. The groups are merged
+into one profileset group. Profile names get the simulator's snake_case_name
+as namespace to keep them unique. The base actor of the first group is the
+base actor of the merged group, all other profiles are profilesets. After
+the simulation every simulator collects its results from its own group.
+
+Merging changes the base actor that profilesets inherit from. A group is
+only merged if this doesn't change the input of any of its profiles. Neither
+the merged base actor nor the group's own base actor may pass on arguments
+that a profile doesn't overwrite itself (see _get_inherited_keys). Appending
+(+=) and multi-line arguments, e.g. custom apls, prevent merging, as do
+different simulation settings and streamed profiles. All other groups are
+simulated on their own.
+"""
+
+import dataclasses
+import logging
+import typing
+
+from bloodytools.simulations.simulator import FUSED_GROUP_PREFIX, Simulator
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+
+logger = logging.getLogger(__name__)
+
+FUSED_NAME_SEPARATOR = "::"
+
+
+def is_fusable(simulator: Simulator) -> bool:
+    """Simulators with their own simulation flow can't be fused."""
+    simulator_class = type(simulator)
+    return (
+        simulator_class.run is Simulator.run
+        and simulator_class._simulate is Simulator._simulate
+    )
+
+
+def _get_keys(arguments: typing.Iterable[str]) -> typing.Set[str]:
+    return {argument.split("=")[0] for argument in arguments}
+
+
+def _is_appending(profile: Simulation_Data) -> bool:
+    return any(
+        "+=" in argument or "\n" in argument.strip()
+        for argument in profile.get_all_simc_arguments()
+    )
+
+
+def _get_inherited_keys(
+    base_actor: Simulation_Data, profile: Simulation_Data
+) -> typing.Set[str]:
+    """Keys profile inherits from base_actor as profileset without overwriting them."""
+    profile_keys = _get_keys(profile.profile_arguments) | _get_keys(
+        profile.simc_arguments
+    )
+    if profile.profile_arguments == base_actor.profile_arguments:
+        # profile lines overwritten by the base actor are restored
+        return _get_keys(base_actor.simc_arguments) - profile_keys
+    return _get_keys(base_actor.get_all_simc_arguments()) - profile_keys
+
+
+def _is_compatible(base_actor: Simulation_Data, group: Simulation_Group) -> bool:
+    """Whether all profiles of group keep their input with base_actor as base actor."""
+    if group.has_streams or not group.profiles[0].is_equal(base_actor):
+        return False
+    if _is_appending(base_actor):
+        return False
+
+    for profile in group.profiles:
+        if _is_appending(profile) or _get_inherited_keys(base_actor, profile):
+            return False
+        if profile is not group.profiles[0] and _get_inherited_keys(
+            group.profiles[0], profile
+        ):
+            return False
+    return True
+
+
+# (simulator, data_dict, simulation_group) of a prepared simulator
+Prepared = typing.Tuple[Simulator, dict, Simulation_Group]
+
+
+@dataclasses.dataclass
+class FusedRun:
+    """Prepared simulators, split into fused and separately simulated ones."""
+
+    fused: typing.List[Prepared]
+    separate: typing.List[Prepared]
+
+
+def prepare_fused(simulators: typing.List[Simulator]) -> FusedRun:
+    """Prepare all simulators and pick the groups that can be simulated together."""
+    prepared = [(simulator, *simulator.prepare()) for simulator in simulators]
+
+    fused: typing.List[Prepared] = []
+    separate: typing.List[Prepared] = []
+    for simulator, data_dict, simulation_group in prepared:
+        if not simulation_group.profiles:
+            separate.append((simulator, data_dict, simulation_group))
+        elif not fused:
+            # provides the base actor, its profiles keep their input
+            if simulation_group.has_streams:
+                separate.append((simulator, data_dict, simulation_group))
+            else:
+                fused.append((simulator, data_dict, simulation_group))
+        elif _is_compatible(fused[0][2].profiles[0], simulation_group):
+            fused.append((simulator, data_dict, simulation_group))
+        else:
+            separate.append((simulator, data_dict, simulation_group))
+
+    if len(fused) > 1:
+        return FusedRun(fused, separate)
+    return FusedRun([], fused + separate)
+
+
+def simulate_fused(fused_run: FusedRun) -> None:
+    """Simulate the fused groups in one simc run and all others on their own."""
+    fused = fused_run.fused
+    if fused:
+        fused_group = fused[0][0]._create_simulation_group(
+            FUSED_GROUP_PREFIX + "+".join(s.snake_case_name() for s, _, _ in fused)
+        )
+        # original name of each renamed profile
+        names: typing.Dict[Simulation_Data, str] = {}
+        for simulator, _, simulation_group in fused:
+            for profile in simulation_group.profiles:
+                names[profile] = profile.name
+                profile.name = FUSED_NAME_SEPARATOR.join(
+                    [simulator.snake_case_name(), profile.name]
+                )
+                fused_group.add(profile)
+
+        logger.info(
+            f"Simulating {len(fused_group.profiles)} profiles of {', '.join(s.name() for s, _, _ in fused)} in one run."
+        )
+        try:
+            fused[0][0]._simulate(fused_group)
+        finally:
+            for profile, name in names.items():
+                profile.name = name
+
+        for _, _, simulation_group in fused:
+            simulation_group.json_data = fused_group.json_data
+
+    for simulator, data_dict, simulation_group in fused_run.separate:
+        logger.info(f"Simulating {simulator.name()} on its own.")
+        simulator._simulate(simulation_group)
+
+
+def finish_fused(fused_run: FusedRun) -> None:
+    """Collect and write the results of all simulators."""
+    for simulator, data_dict, simulation_group in fused_run.fused + fused_run.separate:
+        simulator.finish(data_dict, simulation_group)
+        logger.info(f"{simulator.name()} simulations finished.")
+
+
+def run_fused(simulators: typing.List[Simulator]) -> None:
+    """Run all simulators, simulating all compatible groups in one simc run.
+
+    Args:
+        simulators (typing.List[Simulator]): fusable simulators of the same spec and fight style
+    """
+    fused_run = prepare_fused(simulators)
+    simulate_fused(fused_run)
+    finish_fused(fused_run)
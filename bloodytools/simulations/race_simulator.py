@@ -1,6 +1,7 @@
 import logging
 
 from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
 
 logger = logging.getLogger(__name__)
@@ -35,16 +36,14 @@ class RaceSimulator(Simulator):
             if race == self.wow_spec.wow_class.races[0]:
                 custom_apl = None
                 if self.settings.custom_apl:
-                    with open("custom_apl.txt") as f:
-                        custom_apl = f.read()
+                    custom_apl = read_text("custom_apl.txt")
                 if custom_apl:
                     simulation_data.simc_arguments.append("# custom_apl")
                     simulation_data.simc_arguments.append(custom_apl)
 
                 custom_fight_style = None
                 if self.settings.custom_fight_style:
-                    with open("custom_fight_style.txt") as f:
-                        custom_fight_style = f.read()
+                    custom_fight_style = read_text("custom_fight_style.txt")
                 if custom_fight_style:
                     simulation_data.simc_arguments.append("# custom_fight_style")
                     simulation_data.simc_arguments.append(custom_fight_style)
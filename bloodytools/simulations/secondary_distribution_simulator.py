@@ -4,8 +4,9 @@ import os
 import typing
 
 from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
-from bloodytools.utils.profile_extraction import create_simc_profile_path
+from bloodytools.utils.profile_extraction import get_profile_index
 
 logger = logging.getLogger(__name__)
 
@@ -46,26 +47,20 @@ class SecondaryDistributionSimulator(Simulator):
         ]
 
         # get secondary sum from profile
-        lines = None
-        try:
-            with open(
-                create_simc_profile_path(
-                    self.wow_spec, self.settings.tier, self.settings.executable
-                ),
-                "r",
-            ) as f:
-                lines = f.readlines()
-        except FileNotFoundError:
-            logger.warning(f"{self.wow_spec} profile not found. Skipping.")
-
-        if lines:
-            for line in lines:
+        simc_profile_path = get_profile_index(
+            self.settings.executable
+        ).get_simc_profile_path(self.wow_spec, self.settings.tier)
+        if simc_profile_path:
+            # gear ratings are only written as comments, extract_profile skips them
+            for line in read_text(simc_profile_path).splitlines():
                 for rating_name in rating_names:
                     combined_rating_name = f"gear_{rating_name}="
                     if combined_rating_name in line:
                         secondary_amount += int(
                             line.split(combined_rating_name)[1].strip()
                         )
+        else:
+            logger.warning(f"{self.wow_spec} profile not found. Skipping.")
 
         if self.settings.custom_profile:
             simulation = Simulation_Data(
@@ -109,6 +104,10 @@ class SecondaryDistributionSimulator(Simulator):
     def add_simulation_data(
         self, simulation_group: Simulation_Group, data_dict: dict
     ) -> None:
+        # small step sizes create thousands of profiles, stream them into the input file
+        simulation_group.add_stream(self._create_profiles(data_dict))
+
+    def _create_profiles(self, data_dict: dict) -> typing.Iterator[Simulation_Data]:
         step_size = self.settings.secondary_distributions_step_size
         lower_threshold = 10  # percent
         upper_threshold = 70  # percent
@@ -208,21 +207,23 @@ class SecondaryDistributionSimulator(Simulator):
                 ) == list(talent_combinations.items())[0]:
                     custom_apl = None
                     if self.settings.custom_apl:
-                        with open("custom_apl.txt") as f:
-                            custom_apl = f.readlines()
+                        custom_apl = read_text("custom_apl.txt").splitlines(
+                            keepends=True
+                        )
                     if custom_apl:
                         s_o.simc_arguments += ["# custom_apl"]
                         s_o.simc_arguments += custom_apl
 
                     custom_fight_style = None
                     if self.settings.custom_fight_style:
-                        with open("custom_fight_style.txt") as f:
-                            custom_fight_style = f.readlines()
+                        custom_fight_style = read_text(
+                            "custom_fight_style.txt"
+                        ).splitlines(keepends=True)
                     if custom_fight_style:
                         s_o.simc_arguments += ["# custom_fight_style"]
                         s_o.simc_arguments += custom_fight_style
 
-                simulation_group.add(s_o)
+                yield s_o
 
     def post_processing(self, data_dict: dict) -> dict:
         data_dict = super().post_processing(data_dict)
@@ -1,4 +1,5 @@
 import abc
+import copy
 import dataclasses
 import json
 import logging
@@ -8,8 +9,11 @@ import typing
 import yaml
 
 
+from bloodytools.utils import autotune, file_cache
 from bloodytools.utils.config import Config
 from bloodytools.utils.data_type import DataType
+from bloodytools.utils.history import get_runtime_history
+from bloodytools.utils.result_registry import ResultRegistry
 from bloodytools.utils.simulation_objects import Simulation_Group
 from bloodytools.utils.utils import create_base_json_dict
 from bloodytools.utils.profile_extraction import extract_profile, EmptyFileError
@@ -18,6 +22,10 @@ from simc_support.game_data.WowSpec import WowSpec
 logger = logging.getLogger(__name__)
 
 
+# names of groups holding the profiles of several simulators, see fusion
+FUSED_GROUP_PREFIX = "fused:"
+
+
 class UnknownFightStyleError(Exception):
     pass
 
@@ -26,6 +34,34 @@ class MissingTalentTreePathFileError(Exception):
     pass
 
 
+def _load_yaml(path: str) -> typing.Any:
+    with open(path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_talent_tree_paths(wow_spec: WowSpec) -> typing.Any:
+    """Predefined talent paths of wow_spec. The loaded data is shared, copy it before modifying it."""
+    file_path = os.path.join(
+        "talent_tree_paths",
+        f"{wow_spec.wow_class.simc_name}_{wow_spec.simc_name}.yaml",
+    )
+    try:
+        return file_cache.load(
+            pkg_resources.resource_filename(__name__, file_path), _load_yaml
+        )
+    except FileNotFoundError as e:
+        raise MissingTalentTreePathFileError() from e
+
+
+def _get_profileset_results(simulation_group: Simulation_Group) -> typing.List[dict]:
+    """Profileset results of the simc report of simulation_group."""
+    json_data = simulation_group.json_data or {}
+    results: typing.List[dict] = (
+        json_data.get("sim", {}).get("profilesets", {}).get("results", [])
+    )
+    return results
+
+
 @dataclasses.dataclass  # type: ignore # known mypy issue (abstract class + dataclass)
 class Simulator(abc.ABC):
     """Abstract baseclass for chart related simulations.
@@ -45,6 +81,11 @@ class Simulator(abc.ABC):
     wow_spec: WowSpec
     fight_style: str
     settings: Config
+    # shares results of identical inputs with the other simulators of a run
+    result_registry: typing.Optional[ResultRegistry] = None
+    # profilesets and their iterations simulated by _simulate(), e.g. for the job history
+    simulated_profilesets: int = dataclasses.field(default=0, init=False)
+    simulated_iterations: int = dataclasses.field(default=0, init=False)
 
     @classmethod
     @abc.abstractmethod
@@ -65,11 +106,24 @@ class Simulator(abc.ABC):
         """
         return str(cls.name()).lower().replace(" ", "_")
 
+    @classmethod
+    def preload(cls, wow_spec: WowSpec, settings: Config) -> None:
+        """Fill the caches of the game data this simulator selects for wow_spec, e.g. before workers are forked."""
+        pass
+
     def _get_talents(self, json_data: dict) -> str:
         return str(json_data["sim"]["players"][-1]["talents"])
 
     def run(self) -> None:
         """Manages the simulation flow. You can adjust by overwriting the provided methods."""
+        data_dict, simulation_group = self.prepare()
+
+        self._simulate(simulation_group)
+
+        self.finish(data_dict, simulation_group)
+
+    def prepare(self) -> typing.Tuple[dict, Simulation_Group]:
+        """First part of run(). Creates data_dict and the filled but not yet simulated simulation_group."""
         logger.debug(f"Start pipeline for {self.name()} of {self.wow_spec}")
         data_dict = create_base_json_dict(
             self.name(), self.wow_spec, self.fight_style, self.settings
@@ -78,23 +132,23 @@ class Simulator(abc.ABC):
         logger.debug("Starting pre processing")
         data_dict = self.pre_processing(data_dict)
 
-        simulation_group = Simulation_Group(
-            name="simulation_group",
-            threads=self.settings.threads,
-            profileset_work_threads=self.settings.profileset_work_threads,
-            executable=self.settings.executable,
-            remove_files=not self.settings.keep_files,
-        )
+        simulation_group = self._create_simulation_group()
         self.add_simulation_data(
             simulation_group,
             data_dict,
         )
 
-        self._simulate(simulation_group)
+        return data_dict, simulation_group
 
+    def finish(self, data_dict: dict, simulation_group: Simulation_Group) -> None:
+        """Last part of run(). Collects the results of the simulated simulation_group and writes them."""
         data_dict["data"] = self._collect_data(
             simulation_group, self.settings.data_type
         )
+        for data_type in self.settings.additional_data_types:
+            data_dict[f"data_{data_type.value}"] = self._collect_data(
+                simulation_group, data_type
+            )
 
         if simulation_group.json_data:
             data_dict["profile"]["character"]["talents"] = self._get_talents(
@@ -106,13 +160,104 @@ class Simulator(abc.ABC):
 
         self._write(data_dict)
 
+    def _create_simulation_group(
+        self, name: str = "simulation_group"
+    ) -> Simulation_Group:
+        return Simulation_Group(
+            name=name,
+            threads=self.settings.threads,
+            profileset_work_threads=self.settings.profileset_work_threads,
+            executable=self.settings.executable,
+            remove_files=not self.settings.keep_files,
+            data_types=self.settings.data_types,
+            registry=self.result_registry,
+        )
+
     def _simulate(self, simulation_group: Simulation_Group) -> None:
         if self.settings.use_raidbots and self.settings.apikey:
             self.settings.simc_hash = simulation_group.simulate_with_raidbots(
                 self.settings.apikey
             )
-        else:
-            simulation_group.simulate()
+            return
+
+        # streamed groups only keep the base actor in profiles
+        autotuned = self.settings.autotune and (
+            len(simulation_group.profiles) > 1 or simulation_group.has_streams
+        )
+        if autotuned:
+            self._autotune(simulation_group)
+        simulation_group.simulate()
+
+        profileset_results = _get_profileset_results(simulation_group)
+        self.simulated_profilesets += len(profileset_results)
+        self.simulated_iterations += sum(
+            int(result.get("iterations", 0)) for result in profileset_results
+        )
+        # all runs feed the history, e.g. for --plan and later --autotune runs
+        self._record_runtime(simulation_group, len(profileset_results))
+
+    def get_runtime_history_key(self, simulation_group: Simulation_Group) -> str:
+        """Key of simulation_group in the runtime history. Fused groups are kept apart from the groups of their simulators."""
+        workload = self.snake_case_name()
+        if simulation_group.name.startswith(FUSED_GROUP_PREFIX):
+            workload = simulation_group.name
+        return (
+            f"{workload}|{self.fight_style}|{simulation_group.profiles[0].target_error}"
+        )
+
+    def _autotune(self, simulation_group: Simulation_Group) -> None:
+        """Set threads and profileset_work_threads of simulation_group."""
+        base_profile = simulation_group.profiles[0]
+        try:
+            target_error: typing.Optional[float] = float(base_profile.target_error)
+        except ValueError:
+            target_error = None
+
+        tuned = autotune.tune_group(
+            (
+                None
+                if simulation_group.has_streams
+                else len(simulation_group.profiles) - 1
+            ),
+            int(base_profile.iterations),
+            target_error,
+            autotune.get_core_count(),
+            self.settings.workers,
+            get_runtime_history(self.settings.runtime_history).get(
+                self.get_runtime_history_key(simulation_group)
+            ),
+        )
+        simulation_group.threads = str(tuned.threads)
+        simulation_group.profileset_work_threads = str(tuned.profileset_work_threads)
+        logger.info(
+            f"{self.name()} '{simulation_group.name}': threads={tuned.threads}, profileset_work_threads={tuned.profileset_work_threads}, {tuned.reason}."
+        )
+
+    def _record_runtime(
+        self, simulation_group: Simulation_Group, profileset_count: int
+    ) -> None:
+        """Add the thread seconds per simulated profileset to the runtime history."""
+        if (
+            not profileset_count
+            or not simulation_group.sg_simulation_start_time
+            or not simulation_group.sg_simulation_end_time
+        ):
+            return
+
+        duration = (
+            simulation_group.sg_simulation_end_time
+            - simulation_group.sg_simulation_start_time
+        ).total_seconds()
+        # simc uses all cores if threads isn't set
+        threads = (
+            int(simulation_group.threads)
+            if simulation_group.threads
+            else autotune.get_core_count()
+        )
+        get_runtime_history(self.settings.runtime_history).add(
+            self.get_runtime_history_key(simulation_group),
+            duration * threads / profileset_count,
+        )
 
     def pre_processing(self, data_dict: dict) -> dict:
         """Adjusts data_dict before simulations are done. Use this to update profile information.
@@ -167,13 +312,10 @@ class Simulator(abc.ABC):
             dict: dictionary with simulated data
         """
         data: typing.Dict[str, typing.Any] = {}
-        for profile in simulation_group.profiles:
-            wanted_value = -1
-            if data_type == DataType.DPS:
-                wanted_value = profile.get_dps()
-            logger.debug(f"Profile '{profile.name}' {data_type.value}: {wanted_value}")
+        for profile_name, wanted_value in simulation_group.iter_results(data_type):
+            logger.debug(f"Profile '{profile_name}' {data_type.value}: {wanted_value}")
 
-            name_parts = profile.name.split(self.profile_split_character())
+            name_parts = profile_name.split(self.profile_split_character())
             name = name_parts[0]
             try:
                 nested_keys = name_parts[1:]
@@ -202,8 +344,8 @@ class Simulator(abc.ABC):
             last_dict.update({last_key: wanted_value})
 
             logger.debug(
-                "Added '{}' with {} dps to dictionary.".format(
-                    profile.name, profile.get_dps()
+                "Added '{}' with {} {} to dictionary.".format(
+                    profile_name, wanted_value, data_type.value
                 )
             )
 
@@ -399,57 +541,9 @@ class Simulator(abc.ABC):
             ]
 
         # load predefined talent paths from file
-        file_path = os.path.join(
-            "talent_tree_paths",
-            f"{self.wow_spec.wow_class.simc_name}_{self.wow_spec.simc_name}.yaml",
-        )
-        try:
-            with pkg_resources.resource_stream(__name__, file_path) as f:
-                loaded_data = yaml.safe_load(f)
-        except FileNotFoundError as e:
-            raise MissingTalentTreePathFileError() from e
+        loaded_data = copy.deepcopy(load_talent_tree_paths(self.wow_spec))
 
         if loaded_data is not None and isinstance(loaded_data, dict):
             data_dict["data_profile_overrides"].update(loaded_data)
 
         return data_dict
-
-
-class SimulatorFactory:
-    """Factory to make Simulators available by snake_case_names()."""
-
-    def __init__(self) -> None:
-        self._simulators: typing.Dict[str, typing.Type[Simulator]] = {}
-
-    def register_simulator(self, klass: typing.Type[Simulator]):
-        """Register an implemented Simulator.
-
-        Args:
-            klass (typing.Type[Simulator]): [description]
-        """
-        # str call makes mypy happy
-        self._simulators[str(klass.snake_case_name())] = klass
-
-    def get_simulator(
-        self,
-        simulator_name: str,
-    ) -> typing.Type[Simulator]:
-        """Get an appropriate Simulator class for the provided simulator_name (snake_case_name())."""
-
-        try:
-            simulator = self._simulators[simulator_name]
-        except KeyError:
-            names = [s.snake_case_name() for s in self.list_simulators()]
-            raise KeyError(
-                f"No Simulator found matching '{simulator_name}'. Available options: {names}"
-            )
-
-        return simulator
-
-    def list_simulators(self) -> typing.List[typing.Type[Simulator]]:
-        """List available Simulators.
-
-        Returns:
-            typing.List[typing.Type[Simulator]]: [description]
-        """
-        return list(self._simulators.values())
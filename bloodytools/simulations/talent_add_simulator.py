@@ -1,8 +1,11 @@
 import logging
 import typing
 
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
-from bloodytools.simulations.simulator import Simulator
+from bloodytools.simulations.talent_screening_simulator import (
+    TalentScreeningSimulator,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +14,7 @@ class MissingTalentTreePathFileError(Exception):
     pass
 
 
-class TalentAddSimulator(Simulator):
+class TalentAddSimulator(TalentScreeningSimulator):
     @classmethod
     def name(cls) -> str:
         return "Talent Addition"
@@ -55,7 +58,9 @@ class TalentAddSimulator(Simulator):
                 data_copy.get_simc_arguments_from_profile(data_dict["profile"])
                 + data_copy.simc_arguments
             )
-            tmp_group = Simulation_Group(data_copy, name="extract_talents")
+            tmp_group = Simulation_Group(
+                data_copy, name="extract_talents", registry=self.result_registry
+            )
             tmp_group.simulate()
             if tmp_group.profiles[0].json_data:
                 talent_string = "talents=" + self._get_talents(
@@ -68,14 +73,12 @@ class TalentAddSimulator(Simulator):
 
             if i == 0:
                 if self.settings.custom_apl:
-                    with open("custom_apl.txt") as f:
-                        custom_apl = f.read()
+                    custom_apl = read_text("custom_apl.txt")
                     simulation.simc_arguments.append("# custom_apl")
                     simulation.simc_arguments.append(custom_apl)
 
                 if self.settings.custom_fight_style:
-                    with open("custom_fight_style.txt") as f:
-                        custom_fight_style = f.read()
+                    custom_fight_style = read_text("custom_fight_style.txt")
                     simulation.simc_arguments.append("# custom_fight_style")
                     simulation.simc_arguments.append(custom_fight_style)
 
@@ -0,0 +1,173 @@
+"""Estimate how strongly pairs of talents depend on each other.
+
+Removing two talents at once is compared to removing each of them alone. The
+interaction of a pair is
+
+    (dps_ab - baseline) - (dps_a - baseline) - (dps_b - baseline)
+
+A negative interaction means both talents are worth more together than on
+their own. Simulating all pairs grows quadratically with the number of
+talents. Single removals are simulated first and only talents with a
+meaningful impact of their own are paired. Pairs are simulated in shards of
+profilesets to keep single simc runs at a manageable size.
+"""
+
+import itertools
+import logging
+import typing
+
+from bloodytools.simulations.talent_removal_simulator import TalentRemovalSimulator
+from bloodytools.simulations.talent_screening_simulator import (
+    TalentScreeningSimulator,
+)
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+
+logger = logging.getLogger(__name__)
+
+
+class TalentInteractionSimulator(TalentRemovalSimulator):
+    @classmethod
+    def name(cls) -> str:
+        return "Talent Interactions"
+
+    def add_simulation_data(
+        self, simulation_group: Simulation_Group, data_dict: dict
+    ) -> None:
+        super().add_simulation_data(simulation_group, data_dict)
+
+        # overrides now include the extracted talent strings
+        self._builds: typing.Dict[str, typing.List[str]] = data_dict[
+            "data_profile_overrides"
+        ]
+        # base actor of all shards, all pair profiles inherit from it like the profilesets of simulation_group
+        self._base_actor = simulation_group.profiles[0].copy()
+        # stay empty if _simulate is skipped, e.g. by --plan or --fuse
+        self._candidates: typing.Dict[str, typing.List[str]] = {}
+        # build -> talent_a -> talent_b -> dps difference
+        self._interactions: typing.Dict[
+            str, typing.Dict[str, typing.Dict[str, float]]
+        ] = {}
+
+    def _get_candidate_talents(
+        self, simulation_group: Simulation_Group, build: str
+    ) -> typing.List[str]:
+        """Talents whose single removal changes the build's dps by at least settings.talent_interaction_threshold percent. Strongest first, limited to settings.talent_interaction_max_talents."""
+        baseline = simulation_group.get_dps_of(self.get_profile_name(build, "baseline"))
+
+        impacts: typing.Dict[str, float] = {}
+        for talent_id in self._get_removable_talents(self._builds[build]):
+            dps = simulation_group.get_dps_of(self.get_profile_name(build, talent_id))
+            impacts[talent_id] = abs(dps - baseline) * 100 / baseline
+
+        candidates = sorted(
+            [
+                talent_id
+                for talent_id, impact in impacts.items()
+                if impact >= self.settings.talent_interaction_threshold
+            ],
+            key=lambda talent_id: impacts[talent_id],
+            reverse=True,
+        )
+        return candidates[: self.settings.talent_interaction_max_talents]
+
+    def _create_pair_profiles(
+        self, simulation_group: Simulation_Group
+    ) -> typing.List[typing.Tuple[str, str, str, Simulation_Data]]:
+        """Returns (build, talent_a, talent_b, profile) for all candidate pairs of all builds."""
+        pairs: typing.List[typing.Tuple[str, str, str, Simulation_Data]] = []
+        self._candidates = {}
+
+        for build, simc_args in self._builds.items():
+            candidates = self._get_candidate_talents(simulation_group, build)
+            self._candidates[build] = candidates
+            all_pairs = len(self._get_removable_talents(simc_args))
+            all_pairs = all_pairs * (all_pairs - 1) // 2
+            logger.info(
+                f"{build}: {len(candidates)} candidate talents, simulating {len(candidates) * (len(candidates) - 1) // 2} of {all_pairs} pairs."
+            )
+
+            for talent_a, talent_b in itertools.combinations(candidates, 2):
+                pairs.append(
+                    (
+                        build,
+                        talent_a,
+                        talent_b,
+                        Simulation_Data(
+                            name=self.get_profile_name(build, f"{talent_a}+{talent_b}"),
+                            fight_style=self.fight_style,
+                            simc_arguments=self._remove_talents(
+                                simc_args, [talent_a, talent_b]
+                            ),
+                            target_error=self.settings.target_error.get(
+                                self.fight_style, "0.1"
+                            ),
+                            ptr=self.settings.ptr,
+                            default_actions=self.settings.default_actions,
+                            executable=self.settings.executable,
+                            iterations=self.settings.iterations,
+                        ),
+                    )
+                )
+
+        return pairs
+
+    def _simulate(self, simulation_group: Simulation_Group) -> None:
+        # single removals, screened if enabled
+        super()._simulate(simulation_group)
+
+        pairs = self._create_pair_profiles(simulation_group)
+        shard_size = max(1, self.settings.talent_interaction_shard_size)
+
+        self._interactions = {}
+        for start in range(0, len(pairs), shard_size):
+            shard = pairs[start : start + shard_size]
+            shard_group = self._create_group_like(simulation_group)
+            shard_group.add(self._base_actor.copy())
+            for _, _, _, profile in shard:
+                shard_group.add(profile)
+
+            logger.info(
+                f"Simulating talent pair shard {start // shard_size + 1} of {(len(pairs) - 1) // shard_size + 1}."
+            )
+            # pair profiles don't follow the naming scheme of talent screening
+            super(TalentScreeningSimulator, self)._simulate(shard_group)
+
+            for build, talent_a, talent_b, profile in shard:
+                baseline = simulation_group.get_dps_of(
+                    self.get_profile_name(build, "baseline")
+                )
+                interaction = (
+                    profile.get_dps()
+                    - simulation_group.get_dps_of(
+                        self.get_profile_name(build, talent_a)
+                    )
+                    - simulation_group.get_dps_of(
+                        self.get_profile_name(build, talent_b)
+                    )
+                    + baseline
+                )
+                build_interactions = self._interactions.setdefault(build, {})
+                build_interactions.setdefault(talent_a, {})[talent_b] = interaction
+                build_interactions.setdefault(talent_b, {})[talent_a] = interaction
+
+    def post_processing(self, data_dict: dict) -> dict:
+        data_dict = super().post_processing(data_dict)
+
+        data_dict["interaction_candidates"] = self._candidates
+        data_dict["data_interactions"] = self._interactions
+
+        sorted_interactions = [
+            (build, talent_a, talent_b, interaction)
+            for build, build_interactions in self._interactions.items()
+            for talent_a, values in build_interactions.items()
+            for talent_b, interaction in values.items()
+            # each pair is mirrored, keep it once
+            if talent_a < talent_b
+        ]
+        sorted_interactions.sort(key=lambda item: abs(item[3]), reverse=True)
+        data_dict["sorted_interactions"] = [
+            [build, talent_a, talent_b]
+            for build, talent_a, talent_b, _ in sorted_interactions
+        ]
+
+        return data_dict
@@ -0,0 +1,342 @@
+"""Search for better talent builds around the predefined talent tree paths.
+
+Enumerating all talent trees is impossible. Instead a beam search starts from
+the builds of talent_tree_paths. A neighbour of a build moves one point from
+one node to another node of the same tree, or picks another talent of a
+choice node. Candidate nodes, max ranks, prerequisites and gates come from
+simc_support's talent trees, moves that break the rules of a tree are
+skipped (see talent_tree). Each round all unseen neighbours of the current
+beam are simulated as one profileset group and the best builds form the next
+beam. Every build is simulated at most once.
+
+Builds are read from talents= export strings or class_talents and
+spec_talents lists. Found builds are written as talents= export strings.
+"""
+
+import dataclasses
+import logging
+import typing
+
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.file_cache import read_text
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from bloodytools.utils.talent_tree import (
+    CLASS_TREE,
+    SPEC_TREE,
+    Choices,
+    Ranks,
+    TalentBuildError,
+    TalentTrees,
+    get_talent_trees,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class TalentBuild:
+    """A point-wise editable talent build."""
+
+    origin: str
+    """Name of the starting build"""
+    trees: TalentTrees
+    ranks: Ranks
+    choices: Choices
+    other_args: typing.List[str] = dataclasses.field(default_factory=list)
+    swaps: typing.List[str] = dataclasses.field(default_factory=list)
+    """Point swaps applied to the starting build, e.g. 'talent_a>talent_b'"""
+    tree_hash: int = 0
+    start_arguments: typing.List[str] = dataclasses.field(default_factory=list)
+    """simc arguments of the starting build, it's simulated as given"""
+
+    @classmethod
+    def from_simc_arguments(
+        cls, name: str, simc_args: typing.List[str], trees: TalentTrees
+    ) -> "TalentBuild":
+        """Raises TalentBuildError if the talents can't be read."""
+        ranks: Ranks = {}
+        choices: Choices = {}
+        tree_hash = 0
+        other_args: typing.List[str] = []
+        has_talents = False
+        for arg in simc_args:
+            prefix, _, value = arg.partition("=")
+            if prefix == "talents":
+                ranks, choices, tree_hash = trees.decode(value.split("#")[0].strip())
+                has_talents = True
+            elif prefix in (CLASS_TREE, SPEC_TREE):
+                tree_ranks, tree_choices = trees.parse_talent_list(prefix, value)
+                ranks.update(tree_ranks)
+                choices.update(tree_choices)
+                has_talents = True
+            else:
+                other_args.append(arg)
+
+        if not has_talents:
+            raise TalentBuildError(f"'{name}' doesn't define talents.")
+        return cls(
+            origin=name,
+            trees=trees,
+            ranks=ranks,
+            choices=choices,
+            other_args=other_args,
+            tree_hash=tree_hash,
+            start_arguments=list(simc_args),
+        )
+
+    def key(self) -> typing.Tuple:
+        """Canonical representation, identical for identical builds."""
+        return (
+            tuple(sorted(self.ranks.items())),
+            tuple(sorted(i for i in self.choices.items() if i[0] in self.ranks)),
+        )
+
+    def get_simc_arguments(self) -> typing.List[str]:
+        if not self.swaps and self.start_arguments:
+            return self.start_arguments
+        return self.other_args + [
+            "talents=" + self.trees.encode(self.ranks, self.choices, self.tree_hash)
+        ]
+
+    def _move(self, ranks: Ranks, choices: Choices, swap: str) -> "TalentBuild":
+        return TalentBuild(
+            origin=self.origin,
+            trees=self.trees,
+            ranks=ranks,
+            choices=choices,
+            other_args=self.other_args,
+            swaps=self.swaps + [swap],
+            tree_hash=self.tree_hash,
+        )
+
+    def neighbours(self) -> typing.Iterator["TalentBuild"]:
+        """All builds with one point moved to another node of the same tree or another talent picked in a choice node.
+
+        Moves mustn't break rules of the tree the build didn't break already.
+        """
+        nodes = self.trees.nodes
+        errors = {
+            tree: set(self.trees.get_errors(self.ranks, tree))
+            for tree in (CLASS_TREE, SPEC_TREE)
+        }
+        for removed, removed_rank in self.ranks.items():
+            tree = nodes[removed].tree
+            removed_name = self.trees.get_talent_name(removed, self.choices)
+            for added, added_node in nodes.items():
+                if (
+                    added == removed
+                    or added_node.tree != tree
+                    or added_node.is_free
+                    or self.ranks.get(added, 0) >= added_node.max_rank
+                ):
+                    continue
+
+                ranks = dict(self.ranks)
+                if removed_rank > 1:
+                    ranks[removed] = removed_rank - 1
+                else:
+                    del ranks[removed]
+                ranks[added] = ranks.get(added, 0) + 1
+                if set(self.trees.get_errors(ranks, tree)) - errors[tree]:
+                    continue
+
+                choices = {n: i for n, i in self.choices.items() if n in ranks}
+                picks: typing.Iterable[int] = [choices.get(added, 0)]
+                if added_node.is_choice and added not in self.ranks:
+                    picks = range(len(added_node.talents))
+                for pick in picks:
+                    if added_node.is_choice or added in choices:
+                        choices = {**choices, added: pick}
+                    yield self._move(
+                        dict(ranks),
+                        choices,
+                        f"{removed_name}>{self.trees.get_talent_name(added, choices)}",
+                    )
+
+        for node_id in self.ranks:
+            node = nodes[node_id]
+            if not node.is_choice:
+                continue
+            for pick in range(len(node.talents)):
+                if pick == self.choices.get(node_id, 0):
+                    continue
+                choices = {**self.choices, node_id: pick}
+                yield self._move(
+                    dict(self.ranks),
+                    choices,
+                    f"{self.trees.get_talent_name(node_id, self.choices)}>{node.talents[pick]}",
+                )
+
+
+class TalentOptimizerSimulator(Simulator):
+    @classmethod
+    def name(cls) -> str:
+        return "Talent Optimizer"
+
+    def pre_processing(self, data_dict: dict) -> dict:
+        data_dict = super().pre_processing(data_dict)
+
+        self.get_additional_talent_paths(data_dict)
+
+        trees = get_talent_trees(self.wow_spec)
+        self._start_builds: typing.List[TalentBuild] = []
+        for name, simc_args in data_dict["data_profile_overrides"].items():
+            try:
+                build = TalentBuild.from_simc_arguments(name, simc_args, trees)
+            except TalentBuildError as e:
+                logger.error(f"Can't read talents of '{name}', it isn't optimized: {e}")
+                continue
+            errors = trees.get_errors(build.ranks)
+            if errors:
+                logger.warning(
+                    f"'{name}' breaks the talent tree rules of simc_support, moves won't break further rules: {' '.join(errors.values())}"
+                )
+            if any(build.key() == b.key() for b in self._start_builds):
+                logger.info(f"Skipping '{name}', it's identical to another build.")
+                continue
+            self._start_builds.append(build)
+
+        if not self._start_builds:
+            raise TalentBuildError(
+                f"No talent build of {self.wow_spec} could be read, there's nothing to optimize."
+            )
+
+        self._data_dict = data_dict
+        return data_dict
+
+    def _create_profiles(
+        self, builds: typing.Iterable[TalentBuild], first_index: int
+    ) -> typing.Iterator[Simulation_Data]:
+        """Create one profile per build. The first profile is the base actor of the group."""
+        for i, build in enumerate(builds):
+            simulation = Simulation_Data(
+                name=f"build {first_index + i}",
+                fight_style=self.fight_style,
+                profile=self._data_dict["profile"] if i == 0 else {},
+                simc_arguments=build.get_simc_arguments(),
+                target_error=self.settings.target_error.get(self.fight_style, "0.1"),
+                ptr=self.settings.ptr,
+                default_actions=self.settings.default_actions,
+                executable=self.settings.executable,
+                iterations=self.settings.iterations,
+            )
+
+            if i == 0:
+                if self.settings.custom_apl:
+                    custom_apl = read_text("custom_apl.txt")
+                    simulation.simc_arguments.append("# custom_apl")
+                    simulation.simc_arguments.append(custom_apl)
+
+                if self.settings.custom_fight_style:
+                    custom_fight_style = read_text("custom_fight_style.txt")
+                    simulation.simc_arguments.append("# custom_fight_style")
+                    simulation.simc_arguments.append(custom_fight_style)
+
+            yield simulation
+
+    def add_simulation_data(
+        self, simulation_group: Simulation_Group, data_dict: dict
+    ) -> None:
+        # round 0, the starting builds
+        for profile in self._create_profiles(self._start_builds, 0):
+            simulation_group.add(profile)
+
+    def _simulate(self, simulation_group: Simulation_Group) -> None:
+        super()._simulate(simulation_group)
+
+        # build key -> (build, profile name, group holding the result)
+        seen: typing.Dict[
+            typing.Tuple, typing.Tuple[TalentBuild, str, Simulation_Group]
+        ] = {}
+        for build, profile in zip(self._start_builds, simulation_group.profiles):
+            seen[build.key()] = (build, profile.name, simulation_group)
+
+        def get_dps(key: typing.Tuple) -> int:
+            _, profile_name, group = seen[key]
+            return group.get_dps_of(profile_name)
+
+        beam = sorted(seen, key=get_dps, reverse=True)[
+            : self.settings.talent_optimizer_beam_width
+        ]
+
+        self._rounds = 0
+        while self._rounds < self.settings.talent_optimizer_max_rounds:
+            candidates: typing.Dict[typing.Tuple, TalentBuild] = {}
+            for key in beam:
+                for neighbour in seen[key][0].neighbours():
+                    neighbour_key = neighbour.key()
+                    if neighbour_key not in seen:
+                        candidates.setdefault(neighbour_key, neighbour)
+
+            if not candidates:
+                break
+
+            self._rounds += 1
+            logger.info(
+                f"Talent optimizer round {self._rounds}: simulating {len(candidates)} new builds."
+            )
+            round_group = Simulation_Group(
+                name=f"talent_optimizer_round_{self._rounds}",
+                threads=simulation_group.threads,
+                profileset_work_threads=simulation_group.profileset_work_threads,
+                executable=simulation_group.executable,
+                remove_files=simulation_group.remove_files,
+                data_types=simulation_group.data_types,
+                registry=simulation_group.registry,
+            )
+            # neighbourhoods grow quickly, profiles are only created while the input file is written
+            round_group.add_stream(
+                self._create_profiles(candidates.values(), len(seen))
+            )
+            super()._simulate(round_group)
+
+            for i, (key, build) in enumerate(candidates.items(), start=len(seen)):
+                seen[key] = (build, f"build {i}", round_group)
+
+            new_beam = sorted(set(beam) | set(candidates), key=get_dps, reverse=True)[
+                : self.settings.talent_optimizer_beam_width
+            ]
+            # local optimum, no new build made it into the beam
+            if not set(new_beam) - set(beam):
+                break
+            beam = new_beam
+
+        self._evaluated_builds = len(seen)
+        logger.info(
+            f"Talent optimizer evaluated {self._evaluated_builds} builds in {self._rounds} rounds."
+        )
+
+        # report the starting builds and the best found builds
+        self._builds: typing.Dict[str, TalentBuild] = {}
+        for build, profile in zip(self._start_builds, simulation_group.profiles):
+            profile.name = build.origin
+            self._builds[build.origin] = build
+        for i, key in enumerate(beam, start=1):
+            build, profile_name, group = seen[key]
+            if not build.swaps:
+                continue
+            result = next(self._create_profiles([build], 1))
+            result.name = f"Optimized {i} ({build.origin})"
+            for data_type in group.data_types:
+                value = group.get_value_of(profile_name, data_type)
+                if value > -1:
+                    result.set_value(data_type, value, external=False)
+            simulation_group.add(result)
+            self._builds[result.name] = build
+
+    def post_processing(self, data_dict: dict) -> dict:
+        data_dict = super().post_processing(data_dict)
+
+        data_dict["data_profile_overrides"] = {
+            name: build.get_simc_arguments() for name, build in self._builds.items()
+        }
+        data_dict["data_swaps"] = {
+            name: build.swaps for name, build in self._builds.items()
+        }
+        data_dict["evaluated_builds"] = self._evaluated_builds
+        data_dict["rounds"] = self._rounds
+
+        if data_dict["data"]:
+            data_dict = self.create_sorted_key_value_data(data_dict)
+
+        return data_dict
@@ -1,8 +1,11 @@
 import logging
 import typing
 
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
-from bloodytools.simulations.simulator import Simulator
+from bloodytools.simulations.talent_screening_simulator import (
+    TalentScreeningSimulator,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +14,7 @@ class MissingTalentTreePathFileError(Exception):
     pass
 
 
-class TalentRemovalSimulator(Simulator):
+class TalentRemovalSimulator(TalentScreeningSimulator):
     @classmethod
     def name(cls) -> str:
         return "Talent Removal"
@@ -55,7 +58,9 @@ class TalentRemovalSimulator(Simulator):
                 data_copy.get_simc_arguments_from_profile(data_dict["profile"])
                 + data_copy.simc_arguments
             )
-            tmp_group = Simulation_Group(data_copy, name="extract_talents")
+            tmp_group = Simulation_Group(
+                data_copy, name="extract_talents", registry=self.result_registry
+            )
             tmp_group.simulate()
             if tmp_group.profiles[0].json_data:
                 talent_string = "talents=" + self._get_talents(
@@ -68,72 +73,101 @@ class TalentRemovalSimulator(Simulator):
 
             if i == 0:
                 if self.settings.custom_apl:
-                    with open("custom_apl.txt") as f:
-                        custom_apl = f.read()
+                    custom_apl = read_text("custom_apl.txt")
                     simulation.simc_arguments.append("# custom_apl")
                     simulation.simc_arguments.append(custom_apl)
 
                 if self.settings.custom_fight_style:
-                    with open("custom_fight_style.txt") as f:
-                        custom_fight_style = f.read()
+                    custom_fight_style = read_text("custom_fight_style.txt")
                     simulation.simc_arguments.append("# custom_fight_style")
                     simulation.simc_arguments.append(custom_fight_style)
 
             simulation_group.add(simulation)
 
             # create simulations for each missing talent
-            talent_strings: typing.List[str] = [
-                args
-                for args in simc_args
-                if args.startswith("talents=")
-                or args.startswith("class_talents=")
-                or args.startswith("spec_talents=")
+            for talent_id in self._get_removable_talents(simc_args):
+                simulation = Simulation_Data(
+                    name=self.get_profile_name(human_name, talent_id),
+                    fight_style=self.fight_style,
+                    profile=profile,
+                    simc_arguments=self._remove_talents(simc_args, [talent_id]),
+                    target_error=self.settings.target_error.get(
+                        self.fight_style, "0.1"
+                    ),
+                    ptr=self.settings.ptr,
+                    default_actions=self.settings.default_actions,
+                    executable=self.settings.executable,
+                    iterations=self.settings.iterations,
+                )
+                simulation_group.add(simulation)
+
+    def _get_talent_strings(self, simc_args: typing.List[str]) -> typing.List[str]:
+        return [
+            args
+            for args in simc_args
+            if args.startswith("talents=")
+            or args.startswith("class_talents=")
+            or args.startswith("spec_talents=")
+        ]
+
+    def _split_talent_string(
+        self, talent_string: str
+    ) -> typing.Tuple[str, typing.List[str]]:
+        """Split 'class_talents=a:1/b:2 # comment' into ('class_talents', ['a:1', 'b:2'])."""
+        prefix = talent_string.split("=")[0]
+        cleaned_talents = talent_string.split("=")[1].split("#")[0].strip()
+        return prefix, cleaned_talents.split("/")
+
+    def _get_removable_talents(self, simc_args: typing.List[str]) -> typing.List[str]:
+        """Ids of all talents with at least one invested point in class_talents and spec_talents."""
+        talent_ids: typing.List[str] = []
+        for talent_string in self._get_talent_strings(simc_args):
+            if talent_string.startswith("talents="):
+                continue
+            _, talents = self._split_talent_string(talent_string)
+            for talent in talents:
+                talent_id, invested_points = talent.split(":")
+                if int(invested_points) >= 1:
+                    talent_ids.append(talent_id)
+        return talent_ids
+
+    def _remove_talents(
+        self, simc_args: typing.List[str], talent_ids: typing.Iterable[str]
+    ) -> typing.List[str]:
+        """Rebuild simc_args with one point removed from each talent in talent_ids. Modified talent strings are moved to the end to override the unmodified ones."""
+        talent_ids = set(talent_ids)
+        talent_strings = self._get_talent_strings(simc_args)
+        other_args = [arg for arg in simc_args if arg not in talent_strings]
+
+        unchanged_talent_strings: typing.List[str] = []
+        active_talent_strings: typing.List[str] = []
+        for talent_string in talent_strings:
+            if talent_string.startswith("talents="):
+                unchanged_talent_strings.append(talent_string)
+                continue
+
+            prefix, talents = self._split_talent_string(talent_string)
+            removed = [
+                t
+                for t in talents
+                if t.split(":")[0] in talent_ids and int(t.split(":")[-1]) >= 1
             ]
-            other_args = [arg for arg in simc_args if arg not in talent_strings]
-            for talent_string in talent_strings:
-                if talent_string.startswith("talents="):
-                    continue
-                other_talent_strings = [s for s in talent_strings if s != talent_string]
-                prefix = talent_string.split("=")[0]
-                cleaned_talents = talent_string.split("=")[1].split("#")[0].strip()
-                talents = cleaned_talents.split("/")
-                for talent in talents:
-                    talent_id, invested_points = talent.split(":")
-                    if int(invested_points) < 1:
-                        continue
-
-                    other_talents = [
-                        t for t in talents if t != talent and int(t.split(":")[-1]) > 0
-                    ]
-
-                    active_talents = "=".join(
-                        [
-                            prefix,
-                            "/".join(
-                                other_talents
-                                + [talent_id + ":" + str(int(invested_points) - 1)]
-                            ),
-                        ]
-                    )
-                    logger.debug(f"{active_talents=}")
-
-                    # TODO: continue here. rebuild the current talent string, add other simc_args too
-                    simulation = Simulation_Data(
-                        name=self.get_profile_name(human_name, talent_id),
-                        fight_style=self.fight_style,
-                        profile=profile,
-                        simc_arguments=other_talent_strings
-                        + other_args
-                        + [active_talents],
-                        target_error=self.settings.target_error.get(
-                            self.fight_style, "0.1"
-                        ),
-                        ptr=self.settings.ptr,
-                        default_actions=self.settings.default_actions,
-                        executable=self.settings.executable,
-                        iterations=self.settings.iterations,
-                    )
-                    simulation_group.add(simulation)
+            if not removed:
+                unchanged_talent_strings.append(talent_string)
+                continue
+
+            other_talents = [
+                t for t in talents if t not in removed and int(t.split(":")[-1]) > 0
+            ]
+            for talent in removed:
+                talent_id, invested_points = talent.split(":")
+                other_talents.append(talent_id + ":" + str(int(invested_points) - 1))
+
+            active_talents = "=".join([prefix, "/".join(other_talents)])
+            logger.debug(f"{active_talents=}")
+            active_talent_strings.append(active_talents)
+
+        return unchanged_talent_strings + other_args + active_talent_strings
 
     def post_processing(self, data_dict: dict) -> dict:
         data_dict = super().post_processing(data_dict)
@@ -0,0 +1,116 @@
+import abc
+import logging
+import typing
+
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.simulation_objects import Simulation_Group
+
+logger = logging.getLogger(__name__)
+
+
+class TalentScreeningSimulator(Simulator, abc.ABC):
+    """Abstract base simulator for single talent point changes of builds.
+
+    Expects profile names like "<build>|||baseline" and "<build>|||<talent>".
+
+    If enabled via settings.talent_screening, all profiles are simulated with a
+    loose target_error first. Talents that are clearly close to their build's
+    baseline are tagged "screened" and keep the screening result (relative to
+    the final baseline). Only baselines and the remaining talents get
+    "measured" at full precision.
+    """
+
+    def pre_processing(self, data_dict: dict) -> dict:
+        data_dict = super().pre_processing(data_dict)
+        # build -> talent -> "screened" or "measured", stays empty if _simulate is skipped, e.g. by --plan or --fuse
+        self._talent_status: typing.Dict[str, typing.Dict[str, str]] = {}
+        return data_dict
+
+    def _simulate(self, simulation_group: Simulation_Group) -> None:
+        if not self.settings.talent_screening:
+            super()._simulate(simulation_group)
+            return
+
+        screening_group = self._create_group_like(simulation_group)
+        for profile in simulation_group.profiles:
+            screening_profile = profile.copy()
+            screening_profile.target_error = self.settings.talent_screening_target_error
+            screening_group.add(screening_profile)
+
+        logger.info(
+            f"Screening {len(screening_group.profiles)} profiles with target_error {self.settings.talent_screening_target_error}."
+        )
+        super()._simulate(screening_group)
+
+        screened = self._get_screened_profile_names(screening_group)
+        measured_group = self._create_group_like(simulation_group)
+        for profile in simulation_group.profiles:
+            if profile.name not in screened:
+                measured_group.add(profile)
+
+        logger.info(
+            f"{len(screened)} profiles are close to their baseline. Measuring {len(measured_group.profiles)} profiles."
+        )
+        super()._simulate(measured_group)
+        simulation_group.json_data = measured_group.json_data
+
+        self._talent_status = {}
+        for profile in simulation_group.profiles:
+            build, talent = self._split_name(profile.name)
+            if profile.name in screened:
+                baseline_name = self.get_profile_name(build, "baseline")
+                profile.set_dps(
+                    simulation_group.get_dps_of(baseline_name)
+                    + screening_group.get_dps_of(profile.name)
+                    - screening_group.get_dps_of(baseline_name),
+                    external=False,
+                )
+            self._talent_status.setdefault(build, {})[talent] = (
+                "screened" if profile.name in screened else "measured"
+            )
+
+    def _create_group_like(
+        self, simulation_group: Simulation_Group
+    ) -> Simulation_Group:
+        return Simulation_Group(
+            name=simulation_group.name,
+            threads=simulation_group.threads,
+            profileset_work_threads=simulation_group.profileset_work_threads,
+            executable=simulation_group.executable,
+            remove_files=simulation_group.remove_files,
+            data_types=simulation_group.data_types,
+            registry=simulation_group.registry,
+        )
+
+    def _split_name(self, profile_name: str) -> typing.Tuple[str, str]:
+        build, talent = profile_name.split(self.profile_split_character())
+        return build, talent
+
+    def _get_screened_profile_names(
+        self, screening_group: Simulation_Group
+    ) -> typing.Set[str]:
+        """Names of all non-baseline profiles whose screening difference to their baseline, including the possible error of both results, stays below settings.talent_screening_threshold."""
+        noise = 2 * float(self.settings.talent_screening_target_error)
+
+        screened: typing.Set[str] = set()
+        for profile in screening_group.profiles:
+            build, talent = self._split_name(profile.name)
+            if talent == "baseline":
+                continue
+
+            baseline_dps = screening_group.get_dps_of(
+                self.get_profile_name(build, "baseline")
+            )
+            difference = abs(profile.get_dps() - baseline_dps) * 100 / baseline_dps
+            if difference + noise < self.settings.talent_screening_threshold:
+                screened.add(profile.name)
+
+        return screened
+
+    def post_processing(self, data_dict: dict) -> dict:
+        data_dict = super().post_processing(data_dict)
+
+        if self.settings.talent_screening:
+            data_dict["talent_status"] = self._talent_status
+
+        return data_dict
@@ -1,5 +1,6 @@
 import logging
 
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
 from bloodytools.simulations.simulator import Simulator
 
@@ -49,14 +50,12 @@ class TalentSimulator(Simulator):
 
             if i == 0:
                 if self.settings.custom_apl:
-                    with open("custom_apl.txt") as f:
-                        custom_apl = f.read()
+                    custom_apl = read_text("custom_apl.txt")
                     profile.simc_arguments.append("# custom_apl")
                     profile.simc_arguments.append(custom_apl)
 
                 if self.settings.custom_fight_style:
-                    with open("custom_fight_style.txt") as f:
-                        custom_fight_style = f.read()
+                    custom_fight_style = read_text("custom_fight_style.txt")
                     profile.simc_arguments.append("# custom_fight_style")
                     profile.simc_arguments.append(custom_fight_style)
 
@@ -1,6 +1,7 @@
 import logging
 import typing
 
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
 from bloodytools.simulations.simulator import Simulator
 from bloodytools.utils.utils import create_base_json_dict
@@ -88,7 +89,9 @@ class TalentTargetScalingSimulator(Simulator):
                 data_copy.get_simc_arguments_from_profile(data_dict["profile"])
                 + data_copy.simc_arguments
             )
-            tmp_group = Simulation_Group(data_copy, name="extract_talents")
+            tmp_group = Simulation_Group(
+                data_copy, name="extract_talents", registry=self.result_registry
+            )
             tmp_group.simulate()
             if tmp_group.profiles[0].json_data:
                 talents = "talents=" + self._get_talents(
@@ -99,8 +102,7 @@ class TalentTargetScalingSimulator(Simulator):
 
             if i == 0:
                 if self.settings.custom_apl:
-                    with open("custom_apl.txt") as f:
-                        custom_apl = f.read()
+                    custom_apl = read_text("custom_apl.txt")
                     simulation_data.simc_arguments.append("# custom_apl")
                     simulation_data.simc_arguments.append(custom_apl)
 
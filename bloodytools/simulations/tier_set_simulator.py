@@ -1,3 +1,4 @@
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
 from .simulator import Simulator
 
@@ -79,7 +80,9 @@ class TierSetSimulator(Simulator):
                     data_copy.get_simc_arguments_from_profile(data_dict["profile"])
                     + data_copy.simc_arguments
                 )
-                tmp_group = Simulation_Group(data_copy, name="extract_talents")
+                tmp_group = Simulation_Group(
+                    data_copy, name="extract_talents", registry=self.result_registry
+                )
                 tmp_group.simulate()
                 if tmp_group.profiles[0].json_data:
                     talents = "talents=" + self._get_talents(
@@ -91,16 +94,14 @@ class TierSetSimulator(Simulator):
                 if len(simulation_group.profiles) == 0:
                     custom_apl = None
                     if self.settings.custom_apl:
-                        with open("custom_apl.txt") as f:
-                            custom_apl = f.read()
+                        custom_apl = read_text("custom_apl.txt")
                     if custom_apl:
                         data.simc_arguments.append("# custom_apl")
                         data.simc_arguments.append(custom_apl)
 
                     custom_fight_style = None
                     if self.settings.custom_fight_style:
-                        with open("custom_fight_style.txt") as f:
-                            custom_fight_style = f.read()
+                        custom_fight_style = read_text("custom_fight_style.txt")
                     if custom_fight_style:
                         data.simc_arguments.append("# custom_fight_style")
                         data.simc_arguments.append(custom_fight_style)
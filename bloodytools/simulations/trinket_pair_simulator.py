@@ -0,0 +1,310 @@
+"""Rank pairs of trinkets instead of single trinkets next to a stat stick.
+
+Simulating every pair at every itemlevel is far too expensive. Each trinket is
+simulated on its own first (at its highest valid itemlevel). The summed gains
+of two single trinkets are used as estimate for the pair and only pairs close
+to the best estimate are simulated. All other pairs are marked as pruned.
+
+Pairs depend on the single trinket results, so both runs happen in
+_simulate. --plan only prepares the baseline and marks the run as adaptive.
+"""
+
+import dataclasses
+import itertools
+import logging
+import typing
+
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.simulations.trinket_simulator import (
+    ALLOWED_NON_SEASONAL_DUNGEON_ITEMS,
+    M0_ITEMLEVEL,
+    PREVIOUS_SEASON_ITEMLEVELS,
+    SPECIAL_CASE_BONUS_IDS,
+    SPECIAL_CASE_SIMC_OPTIONS,
+    _get_trinkets,
+    _is_valid_itemlevel,
+)
+from bloodytools.utils.config import Config
+from bloodytools.utils.file_cache import read_text
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.Trinket import Trinket
+from simc_support.game_data.WowSpec import WowSpec
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class TrinketCandidate:
+    """One equipable trinket setup, independent of the slot it ends up in."""
+
+    name: str
+    trinket: Trinket
+    itemlevel: int
+    item_string: str
+    """Slot-less item definition, e.g. ',id=1234,ilevel=447'"""
+    simc_options: typing.List[str] = dataclasses.field(default_factory=list)
+
+    def get_simc_arguments(self, slot: str) -> typing.List[str]:
+        return [f"{slot}={self.item_string}"] + self.simc_options
+
+
+def _get_max_itemlevel(trinket: Trinket, settings: Config) -> int:
+    if trinket.item_id in ALLOWED_NON_SEASONAL_DUNGEON_ITEMS:
+        return max(M0_ITEMLEVEL, *PREVIOUS_SEASON_ITEMLEVELS)
+    return max(i for i in trinket.itemlevels if _is_valid_itemlevel(i, settings))
+
+
+class TrinketPairSimulator(Simulator):
+    @classmethod
+    def name(cls) -> str:
+        return "Trinket Pairs"
+
+    @classmethod
+    def preload(cls, wow_spec: WowSpec, settings: Config) -> None:
+        _get_trinkets(wow_spec, settings)
+
+    def _get_candidates(self) -> typing.List[TrinketCandidate]:
+        candidates: typing.List[TrinketCandidate] = []
+        for trinket in _get_trinkets(self.wow_spec, self.settings):
+            itemlevel = _get_max_itemlevel(trinket, self.settings)
+            item_string = f",id={trinket.item_id},ilevel={itemlevel}"
+
+            candidates.append(
+                TrinketCandidate(
+                    name=trinket.name,
+                    trinket=trinket,
+                    itemlevel=itemlevel,
+                    item_string=item_string,
+                )
+            )
+
+            for stat, bonus_id in SPECIAL_CASE_BONUS_IDS.get(
+                trinket.item_id, {}
+            ).items():
+                candidates.append(
+                    TrinketCandidate(
+                        name=f"{trinket.name} [{stat.title()}]",
+                        trinket=trinket,
+                        itemlevel=itemlevel,
+                        item_string=f"{item_string},bonus_id={bonus_id}",
+                    )
+                )
+
+            for option, simc_option in SPECIAL_CASE_SIMC_OPTIONS.get(
+                trinket.item_id, {}
+            ).items():
+                candidates.append(
+                    TrinketCandidate(
+                        name=f"{trinket.name} [{option.title()}]",
+                        trinket=trinket,
+                        itemlevel=itemlevel,
+                        item_string=item_string,
+                        simc_options=(
+                            [simc_option]
+                            if isinstance(simc_option, str)
+                            else list(simc_option)
+                        ),
+                    )
+                )
+
+        return candidates
+
+    def _create_baseline(self, data_dict: dict) -> Simulation_Data:
+        simulation_data = Simulation_Data(
+            name="baseline",
+            fight_style=self.fight_style,
+            iterations=self.settings.iterations,
+            target_error=self.settings.target_error.get(self.fight_style, "0.1"),
+            profile=data_dict["profile"],
+            simc_arguments=[
+                "trinket1=",
+                "trinket2=",
+            ],
+            ptr=self.settings.ptr,
+            default_actions=self.settings.default_actions,
+            executable=self.settings.executable,
+        )
+
+        if self.settings.custom_apl:
+            custom_apl = read_text("custom_apl.txt")
+            simulation_data.simc_arguments.append("# custom_apl")
+            simulation_data.simc_arguments.append(custom_apl)
+
+        if self.settings.custom_fight_style:
+            custom_fight_style = read_text("custom_fight_style.txt")
+            simulation_data.simc_arguments.append("# custom_fight_style")
+            simulation_data.simc_arguments.append(custom_fight_style)
+
+        return simulation_data
+
+    def _simulate_single_trinkets(
+        self, baseline: Simulation_Data, candidates: typing.List[TrinketCandidate]
+    ) -> typing.Dict[str, int]:
+        """Simulate each candidate alone in trinket1. Returns the dps gain of each candidate."""
+        single_group = self._create_simulation_group()
+        single_group.add(baseline.copy())
+
+        for candidate in candidates:
+            single_group.add(
+                Simulation_Data(
+                    name=candidate.name,
+                    fight_style=self.fight_style,
+                    iterations=self.settings.iterations,
+                    target_error=self.settings.target_error.get(
+                        self.fight_style, "0.1"
+                    ),
+                    simc_arguments=candidate.get_simc_arguments("trinket1"),
+                    ptr=self.settings.ptr,
+                    default_actions=self.settings.default_actions,
+                    executable=self.settings.executable,
+                )
+            )
+
+        logger.info(f"Simulating {len(candidates)} single trinkets to seed pairs.")
+        super()._simulate(single_group)
+
+        baseline_dps = single_group.get_dps_of("baseline")
+        for candidate in candidates:
+            self._single_trinkets[candidate.name] = single_group.get_dps_of(
+                candidate.name
+            )
+        self._single_trinkets["baseline"] = baseline_dps
+
+        return {
+            candidate.name: single_group.get_dps_of(candidate.name) - baseline_dps
+            for candidate in candidates
+        }
+
+    def _select_pairs(
+        self,
+        candidates: typing.List[TrinketCandidate],
+        gains: typing.Dict[str, int],
+        baseline_dps: int,
+    ) -> typing.Tuple[
+        typing.List[typing.Tuple[TrinketCandidate, TrinketCandidate]],
+        typing.List[typing.Tuple[TrinketCandidate, TrinketCandidate]],
+    ]:
+        """Split all equipable pairs into (simulated, pruned) by their estimated gain."""
+        ordered = sorted(candidates, key=lambda c: gains[c.name], reverse=True)
+
+        pairs = [
+            (a, b)
+            for a, b in itertools.combinations(ordered, 2)
+            # unique-equipped, this also catches special case variants of the same trinket
+            if a.trinket.item_id != b.trinket.item_id
+        ]
+        if not pairs:
+            return [], []
+
+        def estimate(pair: typing.Tuple[TrinketCandidate, TrinketCandidate]) -> int:
+            return gains[pair[0].name] + gains[pair[1].name]
+
+        pairs.sort(key=estimate, reverse=True)
+        margin = baseline_dps * self.settings.trinket_pair_pruning_margin / 100
+        threshold = estimate(pairs[0]) - margin
+
+        simulated = [p for p in pairs if estimate(p) >= threshold][
+            : self.settings.trinket_pair_max_pairs
+        ]
+        pruned = pairs[len(simulated) :]
+
+        logger.info(
+            f"Simulating {len(simulated)} of {len(pairs)} trinket pairs. {len(pruned)} pairs were pruned."
+        )
+        return simulated, pruned
+
+    def pre_processing(self, data_dict: dict) -> dict:
+        data_dict = super().pre_processing(data_dict)
+
+        data_dict["profile"]["items"].pop("trinket1", None)
+        data_dict["profile"]["items"].pop("trinket2", None)
+
+        data_dict["data_active"] = {}
+        data_dict["data_sources"] = {}
+        data_dict["item_ids"] = {}
+        data_dict["itemlevels"] = {}
+        for candidate in self._get_candidates():
+            translations = candidate.trinket.translations.get_dict()
+            if candidate.name != candidate.trinket.name:
+                suffix = candidate.name[len(candidate.trinket.name) :]
+                for key in translations:
+                    translations[key] = translations[key] + suffix
+            data_dict["translations"][candidate.name] = translations
+            data_dict["data_active"][candidate.name] = candidate.trinket.on_use
+            data_dict["data_sources"][candidate.name] = candidate.trinket.source.value
+            data_dict["item_ids"][candidate.name] = candidate.trinket.item_id
+            data_dict["itemlevels"][candidate.name] = candidate.itemlevel
+
+        return data_dict
+
+    def add_simulation_data(
+        self, simulation_group: Simulation_Group, data_dict: dict
+    ) -> None:
+        simulation_group.add(self._create_baseline(data_dict))
+        self._candidates = self._get_candidates()
+        # stay empty if _simulate is skipped, e.g. by --plan
+        self._single_trinkets: typing.Dict[str, int] = {}
+        self._pruned: typing.Dict[str, typing.Dict[str, bool]] = {}
+
+    def _simulate(self, simulation_group: Simulation_Group) -> None:
+        gains = self._simulate_single_trinkets(
+            simulation_group.profiles[0], self._candidates
+        )
+        simulated, pruned = self._select_pairs(
+            self._candidates, gains, self._single_trinkets["baseline"]
+        )
+
+        for pair_list, is_pruned in ((simulated, False), (pruned, True)):
+            for a, b in pair_list:
+                self._pruned.setdefault(a.name, {})[b.name] = is_pruned
+                self._pruned.setdefault(b.name, {})[a.name] = is_pruned
+
+        for a, b in simulated:
+            simulation_group.add(
+                Simulation_Data(
+                    name=self.get_profile_name(a.name, b.name),
+                    fight_style=self.fight_style,
+                    iterations=self.settings.iterations,
+                    target_error=self.settings.target_error.get(
+                        self.fight_style, "0.1"
+                    ),
+                    simc_arguments=a.get_simc_arguments("trinket1")
+                    + b.get_simc_arguments("trinket2"),
+                    ptr=self.settings.ptr,
+                    default_actions=self.settings.default_actions,
+                    executable=self.settings.executable,
+                )
+            )
+
+        super()._simulate(simulation_group)
+
+    def post_processing(self, data_dict: dict) -> dict:
+        data_dict = super().post_processing(data_dict)
+
+        data_dict["data_single_trinkets"] = self._single_trinkets
+        data_dict["data_pruned"] = self._pruned
+
+        sorted_pairs: typing.List[typing.Tuple[str, str, int]] = [
+            (a, b, dps)
+            for a, values in data_dict["data"].items()
+            if a != "baseline"
+            for b, dps in values.items()
+        ]
+        # mirror the pair matrix, a|||b and b|||a describe the same pair
+        for a, b, dps in sorted_pairs:
+            data_dict["data"].setdefault(b, {})[a] = dps
+
+        sorted_pairs.sort(key=lambda pair: pair[2], reverse=True)
+        data_dict["sorted_pairs"] = [[a, b] for a, b, _ in sorted_pairs]
+
+        if not sorted_pairs:
+            # all pairs were pruned, only single trinkets were simulated
+            logger.warning(
+                f"No trinket pair was simulated for {self.wow_spec} fighting {self.fight_style}."
+            )
+            data_dict["sorted_data_keys"] = []
+            return data_dict
+
+        self.create_sorted_key_key_value_data(data_dict, ignore_key="baseline")
+
+        return data_dict
@@ -2,17 +2,16 @@
 https://github.com/WarcraftPriests/df-shadow-priest/blob/main/trinkets/other.simc#L40-L58
 """
 
+import functools
 import logging
 import typing
 
 from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils import game_data
 from bloodytools.utils.config import Config
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
-from simc_support.game_data.Trinket import (
-    Trinket,
-    get_trinkets_for_spec,
-    get_versatility_trinket,
-)
+from simc_support.game_data.Trinket import Trinket, get_versatility_trinket
 from simc_support.game_data.WowSpec import WowSpec
 from simc_support.game_data.Season import Season
 from simc_support.game_data.Source import Source
@@ -149,8 +148,15 @@ def _is_valid_itemlevel(itemlevel: int, settings: Config) -> bool:
 
 
 def _get_trinkets(wow_spec: WowSpec, settings: Config) -> typing.List[Trinket]:
+    return list(_select_trinkets(wow_spec, settings.min_ilevel, settings.max_ilevel))
+
+
+@functools.lru_cache(maxsize=None)
+def _select_trinkets(
+    wow_spec: WowSpec, min_ilevel: int, max_ilevel: int
+) -> typing.Tuple[Trinket, ...]:
     # get main-trinkets
-    trinket_list = list(get_trinkets_for_spec(wow_spec))
+    trinket_list = list(game_data.get_trinkets_for_spec(wow_spec))
 
     allowed_season = [Season.SEASON_1, Season.SEASON_2]
 
@@ -167,7 +173,7 @@ def _get_trinkets(wow_spec: WowSpec, settings: Config) -> typing.List[Trinket]:
     trinket_list = [
         t
         for t in new_trinket_list
-        if any([_is_valid_itemlevel(ilevel, settings) for ilevel in t.itemlevels])
+        if any([min_ilevel <= ilevel <= max_ilevel for ilevel in t.itemlevels])
     ]
 
     trinket_list = [
@@ -180,11 +186,11 @@ def _get_trinkets(wow_spec: WowSpec, settings: Config) -> typing.List[Trinket]:
     # add special case trinkets
     special_trinkets = [
         t
-        for t in list(get_trinkets_for_spec(wow_spec))
+        for t in game_data.get_trinkets_for_spec(wow_spec)
         if t.item_id in ALLOWED_NON_SEASONAL_DUNGEON_ITEMS
     ]
 
-    return trinket_list + special_trinkets
+    return tuple(trinket_list + special_trinkets)
 
 
 def _get_second_trinket(wow_spec: WowSpec) -> Trinket:
@@ -196,6 +202,10 @@ class TrinketSimulator(Simulator):
     def name(cls) -> str:
         return "Trinkets"
 
+    @classmethod
+    def preload(cls, wow_spec: WowSpec, settings: Config) -> None:
+        _get_trinkets(wow_spec, settings)
+
     def pre_processing(self, data_dict: dict) -> dict:
         data_dict = super().pre_processing(data_dict)
 
@@ -285,14 +295,12 @@ class TrinketSimulator(Simulator):
         )
 
         if self.settings.custom_apl:
-            with open("custom_apl.txt") as f:
-                custom_apl = f.read()
+            custom_apl = read_text("custom_apl.txt")
             simulation_data.simc_arguments.append("# custom_apl")
             simulation_data.simc_arguments.append(custom_apl)
 
         if self.settings.custom_fight_style:
-            with open("custom_fight_style.txt") as f:
-                custom_fight_style = f.read()
+            custom_fight_style = read_text("custom_fight_style.txt")
             simulation_data.simc_arguments.append("# custom_fight_style")
             simulation_data.simc_arguments.append(custom_fight_style)
 
@@ -357,8 +365,9 @@ class TrinketSimulator(Simulator):
                         simulation_group.add(new_data)
 
                 if trinket.item_id in SPECIAL_CASE_SIMC_OPTIONS:
-                    base_simulation = simulation_group.profiles[-1].copy()
-                    simulation_group.profiles = simulation_group.profiles[:-1]
+                    base_simulation = simulation_group.remove(
+                        simulation_group.profiles[-1].name
+                    )
                     for option in SPECIAL_CASE_SIMC_OPTIONS[trinket.item_id]:
                         new_data = base_simulation.copy()
                         if isinstance(
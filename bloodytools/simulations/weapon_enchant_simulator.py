@@ -2,6 +2,7 @@ import logging
 import typing
 
 from bloodytools.simulations.simulator import Simulator
+from bloodytools.utils.file_cache import read_text
 from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
 from simc_support.game_data.SimcObject import SimcObject
 from simc_support.game_data.WowClass import DEATHKNIGHT
@@ -100,16 +101,14 @@ class WeaponEnchantmentSimulator(Simulator):
 
         custom_apl = None
         if self.settings.custom_apl:
-            with open("custom_apl.txt") as f:
-                custom_apl = f.read()
+            custom_apl = read_text("custom_apl.txt")
         if custom_apl:
             simulation_data.simc_arguments.append("# custom_apl")
             simulation_data.simc_arguments.append(custom_apl)
 
         custom_fight_style = None
         if self.settings.custom_fight_style:
-            with open("custom_fight_style.txt") as f:
-                custom_fight_style = f.read()
+            custom_fight_style = read_text("custom_fight_style.txt")
         if custom_fight_style:
             simulation_data.simc_arguments.append("# custom_fight_style")
             simulation_data.simc_arguments.append(custom_fight_style)
@@ -117,8 +116,7 @@ class WeaponEnchantmentSimulator(Simulator):
         simulation_group.add(simulation_data)
 
         weapon_base_string = ""
-        strings = simulation_data.get_simc_arguments_from_profile(profile)
-        for string in strings:
+        for string in simulation_data.profile_arguments:
             if string.startswith("main_hand"):
                 weapon_base_string = string
 
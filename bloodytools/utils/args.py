@@ -1,6 +1,7 @@
 import argparse
 from bloodytools.simulations import simulator_factory
 from bloodytools.utils.config import Config
+from bloodytools.utils.data_type import DataType
 
 
 def arg_parse_config():
@@ -47,12 +48,7 @@ def arg_parse_config():
         default=False,
         help="Enables ptr.",
     )
-    names = ", ".join(
-        [
-            simulator.snake_case_name()
-            for simulator in simulator_factory.list_simulators()
-        ]
-    )
+    names = ", ".join(simulator_factory.list_simulator_names())
     # sim only one type of data generation for one spec
     parser.add_argument(
         "-s",
@@ -100,7 +96,22 @@ def arg_parse_config():
         action="store_const",
         const=True,
         default=False,
-        help="Keep generated simc input and output files.",
+        help="Keep generated simc input and output files in '{}'.".format(
+            settings.kept_files_directory
+        ),
+    )
+    parser.add_argument(
+        "--scratch_directory",
+        metavar="DIRECTORY",
+        type=str,
+        help="Directory for temporary SimulationCraft files. Each run uses and removes its own subdirectory. Default: '/dev/shm' if available, the system's temporary directory otherwise",
+    )
+    parser.add_argument(
+        "--log_directory",
+        metavar="DIRECTORY",
+        type=str,
+        default="",
+        help="Directory of debug.log and error.log. Default: the current directory",
     )
     parser.add_argument(
         "--pretty",
@@ -109,6 +120,66 @@ def arg_parse_config():
         default=False,
         help="Indent result files to make them more human readable.",
     )
+    parser.add_argument(
+        "--metrics",
+        metavar="STRING",
+        type=str,
+        help="Comma separated metrics collected in addition to '{}', e.g. hps,dtps. Available: {}".format(
+            settings.data_type.value,
+            ", ".join(data_type.value for data_type in DataType),
+        ),
+    )
+    parser.add_argument(
+        "--talent_screening",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Screen talent addition and removal profiles with a loose target_error first and only simulate relevant talents with full precision. Default: '{}'".format(
+            settings.talent_screening
+        ),
+    )
+    parser.add_argument(
+        "--fuse",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Simulate compatible simulation types of the same spec and fight style in one SimulationCraft run, e.g. races, trinkets and consumables. Default: '{}'".format(
+            settings.fuse
+        ),
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Prepare the next and write the previous simulation while SimulationCraft runs. Only without --workers. Default: '{}'".format(
+            settings.pipeline
+        ),
+    )
+    parser.add_argument(
+        "--plan",
+        metavar="FILE",
+        nargs="?",
+        const="plan.json",
+        help="Prepare all simulations without running SimulationCraft. Logs profilesets, probes, expected cache hits, input sizes and estimated core hours and writes them to FILE. Default FILE: 'plan.json'",
+    )
+    parser.add_argument(
+        "--autotune",
+        action="store_const",
+        const=True,
+        default=False,
+        help="Pick threads and profileset_work_threads per simulation from the number of cores, profilesets and earlier runtimes. Picks --workers as well if it is left at 1. Default: '{}'".format(
+            settings.autotune
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        metavar="NUMBER",
+        type=int,
+        help="Number of processes simulating specs and fight styles in parallel. Each runs its own SimulationCraft, consider limiting --threads. Default: '{}'".format(
+            settings.workers
+        ),
+    )
     parser.add_argument(
         "--raidbots",
         action="store_const",
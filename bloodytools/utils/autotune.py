@@ -0,0 +1,101 @@
+"""Pick threads, profileset_work_threads and worker processes for a run.
+
+SimulationCraft scales well across profilesets but badly within a single
+profile. A group with a few profilesets should therefore spread its threads
+over the profilesets it has, while a large group is fastest with one or two
+work threads per profileset. Several smaller simc processes side by side
+beat one large process, because parsing, the base profile and writing the
+report are single threaded.
+"""
+
+import dataclasses
+import logging
+import os
+import typing
+
+logger = logging.getLogger(__name__)
+
+# threads per simc process below which additional worker processes don't pay off
+MIN_THREADS_PER_WORKER = 4
+# profilesets taking less thread seconds than this use a single work thread
+SHORT_PROFILESET_THREAD_SECONDS = 5.0
+# without history, profilesets up to this many iterations or with at least this target_error are considered short
+SHORT_PROFILESET_ITERATIONS = 1000
+SHORT_PROFILESET_TARGET_ERROR = 0.3
+# simc default
+DEFAULT_PROFILESET_WORK_THREADS = 2
+
+
+@dataclasses.dataclass(frozen=True)
+class TunedSettings:
+    threads: int
+    profileset_work_threads: int
+    reason: str
+
+
+def get_core_count() -> int:
+    """Cores this process may run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def tune_workers(job_count: int, cores: int) -> int:
+    """Number of worker processes for job_count spec and fight style combinations."""
+    return max(1, min(job_count, cores // MIN_THREADS_PER_WORKER))
+
+
+def tune_group(
+    profileset_count: typing.Optional[int],
+    iterations: int,
+    target_error: typing.Optional[float],
+    cores: int,
+    workers: int = 1,
+    thread_seconds_per_profileset: typing.Optional[float] = None,
+) -> TunedSettings:
+    """Pick threads and profileset_work_threads of one simulation group.
+
+    Args:
+        profileset_count (typing.Optional[int]): None if unknown, e.g. for streamed groups
+        iterations (int): maximum iterations of each profileset
+        target_error (typing.Optional[float]): None for fixed iterations
+        cores (int): cores of the machine
+        workers (int, optional): simc processes running at the same time. Defaults to 1.
+        thread_seconds_per_profileset (typing.Optional[float], optional): from the runtime history. Defaults to None.
+    """
+    threads = max(1, cores // max(1, workers))
+
+    if profileset_count is not None and profileset_count < threads:
+        return TunedSettings(
+            threads,
+            max(1, threads // max(1, profileset_count)),
+            f"{profileset_count} profilesets share {threads} threads",
+        )
+
+    if thread_seconds_per_profileset is not None:
+        if thread_seconds_per_profileset < SHORT_PROFILESET_THREAD_SECONDS:
+            return TunedSettings(
+                threads,
+                1,
+                f"profilesets took {thread_seconds_per_profileset:.1f} thread seconds before",
+            )
+        return TunedSettings(
+            threads,
+            min(threads, DEFAULT_PROFILESET_WORK_THREADS),
+            f"profilesets took {thread_seconds_per_profileset:.1f} thread seconds before",
+        )
+
+    if iterations <= SHORT_PROFILESET_ITERATIONS:
+        return TunedSettings(
+            threads, 1, f"short profilesets of {iterations} iterations"
+        )
+    if target_error is not None and target_error >= SHORT_PROFILESET_TARGET_ERROR:
+        return TunedSettings(
+            threads, 1, f"short profilesets with target_error {target_error}"
+        )
+    return TunedSettings(
+        threads,
+        min(threads, DEFAULT_PROFILESET_WORK_THREADS),
+        "long profilesets",
+    )
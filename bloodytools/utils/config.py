@@ -4,10 +4,13 @@ import sys
 import typing
 
 from bloodytools.utils.data_type import DataType
-from simc_support.game_data.WowSpec import WowSpec, get_wow_spec
 
 from bloodytools.utils.simc import get_simc_hash
 
+if typing.TYPE_CHECKING:
+    # game data is slow to import and not needed to parse arguments
+    from simc_support.game_data.WowSpec import WowSpec
+
 logger = logging.getLogger(__name__)
 
 # ! Hier sitz ich nun ich armer Tor. Bin so klug als wie zuvor.
@@ -19,25 +22,46 @@ logger = logging.getLogger(__name__)
 class Config:
     """Configuration that doesn't simulate anything but has otherwise sensible default values."""
 
+    # pick threads, profileset_work_threads and workers from the machine, the simulations and runtime_history
+    autotune: bool = False
     custom_apl: bool = False
     custom_fight_style: bool = False
     custom_profile: bool = False
     data_type: DataType = DataType.DPS
+    # collected in the same simc run, written to "data_<metric>"
+    additional_data_types: typing.List[DataType] = dataclasses.field(
+        default_factory=list
+    )
     debug: bool = False
     default_actions: str = "1"
     executable: str = "../SimulationCraft/simc"
     """Path to the executable, including the executable"""
+    # simulate compatible simulators of the same spec and fight style in one simc run
+    fuse: bool = False
     iterations: str = "60000"
+    # wall time, profilesets and iterations of earlier spec and fight style jobs, orders the jobs of the worker pool
+    job_history: str = "job_history.json"
+    # keep simc input and output files in kept_files_directory
     keep_files: bool = False
+    # kept files and inputs of failed simulations, one subdirectory per spec and fight style
+    kept_files_directory: str = "kept_files"
     # affects trinkets
     max_ilevel: int = 457
     # affects trinkets
     min_ilevel: int = 411
+    # prepare and finish simulators while simc simulates, see pipeline
+    pipeline: bool = False
+    # path of the json plan, plans the run instead of simulating it if set
+    plan: str = ""
     pretty: bool = False
     profileset_work_threads: str = "2"
     ptr: str = "0"
     raidbots: bool = False
     remove_files: bool = False
+    # thread seconds per profileset of earlier runs, used by autotune and --plan
+    runtime_history: str = "runtime_history.json"
+    # private directory per run for temporary simc files, "" for /dev/shm or the system's temporary directory, see scratch
+    scratch_directory: str = ""
     secondary_distributions_step_size: int = 10
     simc_hash: str = ""
     single_sim: str = ""
@@ -49,14 +73,38 @@ class Config:
     #   ],
     # }  # example for a talent list for Elemental Shamans
     # set to False, to sim only the base profile talent combinations
-    talent_list: typing.Dict[WowSpec, typing.Iterable[str]] = dataclasses.field(
+    talent_list: typing.Dict["WowSpec", typing.Iterable[str]] = dataclasses.field(
         default_factory=dict
     )
     talent_permutations: bool = False
+    # Affects talent addition and talent removal simulations
+    # simulate all talents with talent_screening_target_error first and only measure talents with full precision that are not clearly close to the baseline
+    talent_screening: bool = False
+    talent_screening_target_error: str = "0.3"
+    # percent of the baseline dps
+    talent_screening_threshold: float = 1.0
+    # Affects talent interaction simulations
+    # only talents whose single removal changes dps by at least this percent of the baseline are paired
+    talent_interaction_threshold: float = 1.0
+    # strongest candidate talents per build, limits pairs to n * (n - 1) / 2
+    talent_interaction_max_talents: int = 12
+    # pair profiles per simc run
+    talent_interaction_shard_size: int = 100
+    # Affects talent optimizer simulations
+    # number of best builds whose neighbours are simulated each round
+    talent_optimizer_beam_width: int = 3
+    talent_optimizer_max_rounds: int = 5
     target_error: typing.Dict[str, str] = dataclasses.field(default_factory=dict)
     threads: str = ""
     tier: str = "30"
+    # affects trinket pairs
+    # pairs whose summed single-trinket gain is further than this (percent of baseline dps) behind the best pair are pruned
+    trinket_pair_pruning_margin: float = 2.0
+    # affects trinket pairs
+    trinket_pair_max_pairs: int = 100
     use_raidbots: bool = False
+    # processes simulating specs and fight styles in parallel, forked after preloading shared input data
+    workers: int = 1
     write_humanreadable_secondary_distribution_file: bool = False
     apikey: str = ""
     simulator_type_names: typing.List[str] = dataclasses.field(default_factory=list)
@@ -80,7 +128,18 @@ class Config:
             self.simc_hash = new_hash
 
     @property
-    def wow_specs(self) -> typing.List[WowSpec]:
+    def data_types(self) -> typing.List[DataType]:
+        """All metrics to collect, the main data_type first."""
+        return [self.data_type] + [
+            data_type
+            for data_type in self.additional_data_types
+            if data_type != self.data_type
+        ]
+
+    @property
+    def wow_specs(self) -> typing.List["WowSpec"]:
+        from simc_support.game_data.WowSpec import get_wow_spec
+
         return [get_wow_spec(*name_tuple) for name_tuple in self.wow_class_spec_names]
 
     @classmethod
@@ -149,8 +208,33 @@ class Config:
             for fight_style in config.target_error.keys():
                 config.target_error[fight_style] = args.target_error  # type: ignore
 
+        if args.metrics:  # type: ignore
+            try:
+                config.additional_data_types = [
+                    DataType(metric.strip())
+                    for metric in args.metrics.split(",")  # type: ignore
+                    if metric.strip()
+                ]
+            except ValueError:
+                logger.error(
+                    f"--metrics must be a comma separated list of {', '.join(d.value for d in DataType)}."
+                )
+                sys.exit("Input error. Bloodytools terminates.")
+            logger.debug(f"Set additional_data_types to {config.additional_data_types}")
+
+        config.talent_screening = args.talent_screening  # type: ignore
+        config.fuse = args.fuse  # type: ignore
+        config.autotune = args.autotune  # type: ignore
+        config.pipeline = args.pipeline  # type: ignore
+        if args.plan:  # type: ignore
+            config.plan = args.plan  # type: ignore
+        if args.workers:  # type: ignore
+            config.workers = args.workers  # type: ignore
+
         config.use_raidbots = args.raidbots  # type: ignore
         config.keep_files = args.keep_files  # type: ignore
+        if args.scratch_directory:  # type: ignore
+            config.scratch_directory = args.scratch_directory  # type: ignore
         config.pretty = args.pretty  # type: ignore
 
         config.set_simc_hash()
@@ -0,0 +1,158 @@
+"""Estimate how long spec and fight style jobs take, to start the longest first.
+
+A job runs all simulators of a run for one spec and fight style. Its cost
+is the wall time of the same job in earlier runs, see JobHistory. Jobs
+without history are estimated from the same job at another precision
+(target_error and iterations), then from the same job of other specs, and
+finally from the average of all estimated jobs.
+
+Runs at another precision are scaled by the iterations simc needs per
+profileset: target_error shrinks with the square root of the iterations, up
+to the configured iterations. The recorded iterations per profileset show
+where an earlier run stood. Runs whose profilesets stopped at the
+configured iterations missed their target_error, a tighter target_error is
+expected to stop at the configured iterations as well.
+
+Longest jobs first keeps a single long job, e.g. secondary distributions
+on hecticaddcleave, from starting last and delaying the whole run.
+"""
+
+import heapq
+import statistics
+import typing
+
+from bloodytools.utils.config import Config
+from bloodytools.utils.history import JobHistory, JobRecord
+
+# (wow class name, wow spec name, fight style)
+Job = typing.Tuple[str, str, str]
+
+KEY_SEPARATOR = "|"
+
+
+def get_jobs(config: Config) -> typing.List[Job]:
+    """All jobs of the run, in the order of config."""
+    return [
+        (wow_class_name, wow_spec_name, fight_style)
+        for wow_class_name, wow_spec_name in config.wow_class_spec_names
+        for fight_style in config.fight_styles
+    ]
+
+
+def get_job_key(job: Job, config: Config) -> str:
+    """Jobs share a key if they simulate the same with the same precision."""
+    wow_class_name, wow_spec_name, fight_style = job
+    return KEY_SEPARATOR.join(
+        [
+            wow_class_name,
+            wow_spec_name,
+            fight_style,
+            config.target_error.get(fight_style, ""),
+            config.iterations,
+            "+".join(sorted(config.simulator_type_names)),
+            "fused" if config.fuse else "separate",
+        ]
+    )
+
+
+def _get_spec_independent_key(key: str) -> str:
+    fields = key.split(KEY_SEPARATOR)
+    return KEY_SEPARATOR.join(fields[2:3] + fields[5:])
+
+
+def _get_precision_independent_key(key: str) -> str:
+    fields = key.split(KEY_SEPARATOR)
+    return KEY_SEPARATOR.join(fields[:3] + fields[5:])
+
+
+def _get_precision(key: str) -> typing.Tuple[float, float]:
+    """(target_error, iterations) of key, 0.0 if unset."""
+    values = []
+    for field in key.split(KEY_SEPARATOR)[3:5]:
+        try:
+            values.append(float(field))
+        except ValueError:
+            values.append(0.0)
+    return values[0], values[1]
+
+
+def scale_to_precision(record: JobRecord, from_key: str, to_key: str) -> float:
+    """Seconds of record, simulated with the precision of from_key, at the precision of to_key."""
+    from_error, from_iterations = _get_precision(from_key)
+    to_error, to_iterations = _get_precision(to_key)
+    if from_error > 0 and to_error > 0:
+        factor = (from_error / to_error) ** 2
+    elif from_iterations > 0 and to_iterations > 0:
+        factor = to_iterations / from_iterations
+    else:
+        return record.seconds
+
+    if not record.profilesets or not record.iterations:
+        return record.seconds * factor
+    iterations = record.iterations / record.profilesets
+    expected_iterations = iterations * factor
+    if from_error > 0 and 0 < from_iterations <= iterations and factor >= 1:
+        # the record missed its target_error, a tighter one runs into the cap as well
+        expected_iterations = max(expected_iterations, to_iterations)
+    if to_iterations > 0:
+        expected_iterations = min(expected_iterations, to_iterations)
+    return record.seconds * expected_iterations / iterations
+
+
+class CostModel:
+    def __init__(self, history: JobHistory, config: Config) -> None:
+        self.config = config
+        self._records = history.records()
+
+    def _estimate_from(
+        self, key: str, get_similar_key: typing.Callable[[str], str]
+    ) -> typing.Optional[float]:
+        """Mean of all records sharing get_similar_key with key, scaled to the precision of key."""
+        similar_key = get_similar_key(key)
+        estimates = [
+            scale_to_precision(record, record_key, key)
+            for record_key, record in self._records.items()
+            if get_similar_key(record_key) == similar_key
+        ]
+        return statistics.mean(estimates) if estimates else None
+
+    def estimate(self, job: Job) -> typing.Optional[float]:
+        """Seconds job is expected to take, None if nothing similar ran before."""
+        key = get_job_key(job, self.config)
+        if key in self._records:
+            return self._records[key].seconds
+        for get_similar_key in (
+            _get_precision_independent_key,
+            _get_spec_independent_key,
+        ):
+            estimate = self._estimate_from(key, get_similar_key)
+            if estimate is not None:
+                return estimate
+        return None
+
+    def estimate_all(self, jobs: typing.Iterable[Job]) -> typing.Dict[Job, float]:
+        """Estimates of all jobs. Unknown jobs get the average estimate, all are 0.0 without history."""
+        estimates = {job: self.estimate(job) for job in jobs}
+        known = [seconds for seconds in estimates.values() if seconds is not None]
+        default = statistics.mean(known) if known else 0.0
+        return {
+            job: default if seconds is None else seconds
+            for job, seconds in estimates.items()
+        }
+
+
+def order_longest_first(
+    jobs: typing.Iterable[Job], estimates: typing.Dict[Job, float]
+) -> typing.List[Job]:
+    """Jobs with equal estimates keep their order."""
+    return sorted(jobs, key=lambda job: -estimates[job])
+
+
+def project_duration(
+    jobs: typing.Sequence[Job], estimates: typing.Dict[Job, float], workers: int
+) -> float:
+    """Seconds until workers finished jobs if each idle worker takes the next job."""
+    finish_times = [0.0] * max(1, min(workers, len(jobs)))
+    for job in jobs:
+        heapq.heapreplace(finish_times, finish_times[0] + estimates[job])
+    return max(finish_times)
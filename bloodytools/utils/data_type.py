@@ -2,4 +2,9 @@ import enum
 
 
 class DataType(enum.Enum):
+    """Metrics SimulationCraft can collect. Values are the simc names used in profileset_metric and collected_data."""
+
     DPS = "dps"
+    PRIORITY_DPS = "prioritydps"
+    HPS = "hps"
+    DTPS = "dtps"
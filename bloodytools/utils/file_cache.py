@@ -0,0 +1,66 @@
+"""Process-wide cache of loaded input files.
+
+Profiles, custom files and talent tree paths are read by every simulator of
+every spec and fight style. Loaded values are kept per path and loader and
+only reloaded once the file's modification time or size changes.
+
+Cached values are shared between all callers. Copy them before modifying
+them.
+"""
+
+import logging
+import os
+import typing
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+# (loader, absolute path, loader arguments) -> (mtime_ns, size), value
+_cache: typing.Dict[
+    typing.Tuple[typing.Callable, str, typing.Tuple],
+    typing.Tuple[typing.Tuple[int, int], typing.Any],
+] = {}
+
+
+def load(path: str, loader: typing.Callable[..., T], *args: typing.Hashable) -> T:
+    """Returns loader(path, *args). loader is only called again if path changed since the last call.
+
+    Args:
+        path (str): path to file, relative or absolute
+        loader (typing.Callable[..., T]): function loading the file
+        args (typing.Hashable): additional arguments of loader
+
+    Raises:
+        FileNotFoundError: path doesn't exist
+
+    Returns:
+        T: shared return value of loader
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = (loader, os.path.abspath(path), args)
+
+    cached = _cache.get(key, None)
+    if cached is not None and cached[0] == signature:
+        return typing.cast(T, cached[1])
+
+    logger.debug(f"Loading '{path}'.")
+    value = loader(path, *args)
+    _cache[key] = (signature, value)
+    return value
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def read_text(path: str) -> str:
+    """Returns the content of path."""
+    return load(path, _read_text)
+
+
+def clear() -> None:
+    """Forget all loaded files."""
+    _cache.clear()
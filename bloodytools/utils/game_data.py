@@ -0,0 +1,29 @@
+"""Cached queries of simc_support's game data.
+
+simc_support walks all of its items for each query. The results don't change
+while bloodytools runs, so each query is answered once per process. preload
+answers all queries of a run up front, e.g. before worker processes are
+forked. Returned values are shared, don't modify them.
+"""
+
+import functools
+import logging
+import typing
+
+from simc_support.game_data import Trinket
+from simc_support.game_data.WowSpec import WowSpec
+
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def get_trinkets_for_spec(wow_spec: WowSpec) -> typing.Tuple[Trinket.Trinket, ...]:
+    """All trinkets usable by wow_spec."""
+    return Trinket.get_trinkets_for_spec(wow_spec)
+
+
+def preload(wow_specs: typing.Iterable[WowSpec]) -> None:
+    """Answer all queries for wow_specs."""
+    for wow_spec in wow_specs:
+        get_trinkets_for_spec(wow_spec)
+    logger.debug("Preloaded game data.")
@@ -0,0 +1,121 @@
+"""Runtimes of past simulations, used to tune and schedule future ones.
+
+RuntimeHistory stores thread seconds per profileset, that's independent of
+the number of threads a simulation used. JobHistory stores the wall time,
+simulated profilesets and iterations of each spec and fight style job. Each
+key keeps a moving average over its recent runs.
+
+The files are read again before each update, so parallel workers only lose
+an update if they write at exactly the same time.
+"""
+
+import dataclasses
+import json
+import logging
+import os
+import typing
+
+logger = logging.getLogger(__name__)
+
+# weight of a new runtime in the moving average
+SMOOTHING = 0.3
+
+
+def _load(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logger.warning(f"Ignoring broken history '{path}'.")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save(path: str, data: dict) -> None:
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    with open(temporary_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(temporary_path, path)
+
+
+def _average(previous: typing.Optional[float], value: float) -> float:
+    if previous is None:
+        return value
+    return (1 - SMOOTHING) * previous + SMOOTHING * value
+
+
+class RuntimeHistory:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._runtimes: typing.Dict[str, float] = _load(self.path)
+
+    def get(self, key: str) -> typing.Optional[float]:
+        """Thread seconds per profileset of key, None if unknown."""
+        return self._runtimes.get(key, None)
+
+    def add(self, key: str, thread_seconds_per_profileset: float) -> None:
+        """Update the moving average of key and save the history."""
+        self._runtimes = _load(self.path)
+        self._runtimes[key] = _average(
+            self._runtimes.get(key, None), thread_seconds_per_profileset
+        )
+        _save(self.path, self._runtimes)
+
+
+@dataclasses.dataclass(frozen=True)
+class JobRecord:
+    seconds: float
+    profilesets: float = 0
+    iterations: float = 0
+
+
+class JobHistory:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._records: typing.Dict[str, JobRecord] = self._load()
+
+    def _load(self) -> typing.Dict[str, JobRecord]:
+        records = {}
+        for key, values in _load(self.path).items():
+            try:
+                records[key] = JobRecord(**values)
+            except TypeError:
+                logger.warning(f"Ignoring broken job record '{key}' in '{self.path}'.")
+        return records
+
+    def get(self, key: str) -> typing.Optional[JobRecord]:
+        return self._records.get(key, None)
+
+    def records(self) -> typing.Dict[str, JobRecord]:
+        return dict(self._records)
+
+    def add(self, key: str, record: JobRecord) -> None:
+        """Update the moving averages of key and save the history."""
+        self._records = self._load()
+        previous = self._records.get(key, None)
+        self._records[key] = JobRecord(
+            *[
+                _average(
+                    getattr(previous, field.name) if previous else None,
+                    getattr(record, field.name),
+                )
+                for field in dataclasses.fields(JobRecord)
+            ]
+        )
+        _save(
+            self.path,
+            {key: dataclasses.asdict(record) for key, record in self._records.items()},
+        )
+
+
+# path -> history
+_histories: typing.Dict[str, RuntimeHistory] = {}
+
+
+def get_runtime_history(path: str) -> RuntimeHistory:
+    """Loads the history on the first call for path."""
+    if path not in _histories:
+        _histories[path] = RuntimeHistory(path)
+    return _histories[path]
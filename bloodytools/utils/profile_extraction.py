@@ -1,8 +1,10 @@
+import copy
 import logging
 import os
 import re
 import typing
 
+from bloodytools.utils import file_cache
 from bloodytools.utils.config import Config
 from simc_support.game_data.WowClass import WowClass
 from simc_support.game_data.WowSpec import WowSpec
@@ -18,6 +20,72 @@ class IncompleteProfileError(Exception):
     pass
 
 
+# character options copied from profiles
+CHARACTER_OPTIONS = (
+    "level",
+    "race",
+    "role",
+    "position",
+    "talents",
+    "class_talents",
+    "spec_talents",
+    "spec",
+    "default_pet",
+    "gear_agility",
+    "gear_intellect",
+    "gear_strength",
+    "gear_crit_rating",
+    "gear_haste_rating",
+    "gear_mastery_rating",
+    "gear_versatility_rating",
+    "deathknight.ams_absorb_percent",
+    "deathknight.amz_absorb_percent",
+)
+# copied as "set_bonus=<name>"
+SET_BONUSES = (
+    "tier28_2pc",
+    "tier28_4pc",
+    "tier29_2pc",
+    "tier29_4pc",
+    "tier30_2pc",
+    "tier30_4pc",
+)
+REQUIRED_CHARACTER_KEYS = ("class", "level", "race", "role", "spec")
+# item slot -> official slot name
+ITEM_SLOTS = {
+    "head": "head",
+    "neck": "neck",
+    "shoulders": "shoulders",
+    "shoulder": "shoulders",
+    "back": "back",
+    "chest": "chest",
+    "wrists": "wrists",
+    "wrist": "wrists",
+    "hands": "hands",
+    "waist": "waist",
+    "legs": "legs",
+    "feet": "feet",
+    "finger1": "finger1",
+    "finger2": "finger2",
+    "trinket1": "trinket1",
+    "trinket2": "trinket2",
+    "main_hand": "main_hand",
+    "off_hand": "off_hand",
+}
+# item defining attributes, in the order they are added to an item
+ITEM_ELEMENTS = (
+    "id",
+    "bonus_id",
+    "enchant",
+    "ilevel",
+    "gem_id",
+    "enchant_id",
+    "crafted_stats",
+    "drop_level",
+)
+_ITEM_ELEMENT_VALUE = re.compile(r"[a-zA-Z0-9_/:]*")
+
+
 def _get_tier_directory_name(tier: str) -> str:
     """PreRaids vs TierXX"""
     return "PreRaids" if tier == "PR" else f"Tier{tier}"
@@ -42,6 +110,33 @@ def _get_simc_profile_file_name(tier: str, wow_spec: WowSpec) -> str:
     )
 
 
+def _get_simc_profiles_directory(executable_path: str) -> str:
+    """e.g. ./SimulationCraft/profiles"""
+    split_path: list = executable_path.split("simc")
+    simc_directory: str
+    if len(split_path) > 2:
+        # the path contains multiple "simc", e.g. executable and directory name
+        simc_directory = "simc".join(split_path[:-1])
+    else:
+        simc_directory = split_path[0]
+
+    # fix path for linux users
+    if simc_directory.endswith("/engine/"):
+        simc_directory = simc_directory.rstrip("engine/")
+
+    return os.path.join(simc_directory, "profiles")
+
+
+def _get_fallback_profiles_directory() -> str:
+    """e.g. ./fallback_profiles"""
+    # ./bloodytools/utils
+    self_file_path = os.path.dirname(os.path.abspath(__file__))
+    # ./
+    bloodytools_root_path = os.path.dirname(os.path.dirname(self_file_path))
+
+    return os.path.join(bloodytools_root_path, "fallback_profiles")
+
+
 def create_simc_profile_path(wow_spec: WowSpec, tier: str, executable_path: str) -> str:
     """Create basic profile string to get the standard profile of a spec. Use this function to get the necessary string for your first argument of a simulation_data object.
 
@@ -54,22 +149,8 @@ def create_simc_profile_path(wow_spec: WowSpec, tier: str, executable_path: str)
       str -- relative link to the standard simc profile. E.g. ./SimulationCraft/profiles/<tier>/<tier>_<wow_spec>.simc
     """
 
-    # create the base profile string
-    split_path: list = executable_path.split("simc")
-    base_profile_string: str
-    if len(split_path) > 2:
-        # the path contains multiple "simc", e.g. executable and directory name
-        base_profile_string = "simc".join(split_path[:-1])
-    else:
-        base_profile_string = split_path[0]
-
-    # fix path for linux users
-    if base_profile_string.endswith("/engine/"):
-        base_profile_string = base_profile_string.rstrip("engine/")
-
     base_profile_string = os.path.join(
-        base_profile_string,
-        "profiles",
+        _get_simc_profiles_directory(executable_path),
         _get_tier_directory_name(tier),
         _get_simc_profile_file_name(tier, wow_spec),
     )
@@ -83,14 +164,8 @@ def create_simc_profile_path(wow_spec: WowSpec, tier: str, executable_path: str)
 def create_fallback_profile_path(wow_spec: WowSpec, tier: str, fight_style: str) -> str:
     """e.g. ./fallback_profiles/<fight_style>/<tier>/<tier>_<wow_spec>.simc"""
 
-    # ./bloodytools/utils
-    self_file_path = os.path.dirname(os.path.abspath(__file__))
-    # ./
-    bloodytools_root_path = os.path.dirname(os.path.dirname(self_file_path))
-
     fallback_profile_path = os.path.join(
-        bloodytools_root_path,
-        "fallback_profiles",
+        _get_fallback_profiles_directory(),
         fight_style.lower(),
         _get_tier_directory_name(tier),
         _get_simc_profile_file_name(tier, wow_spec),
@@ -105,6 +180,7 @@ def create_fallback_profile_path(wow_spec: WowSpec, tier: str, fight_style: str)
 def extract_profile(path: str, wow_class: WowClass) -> dict:
     """Extract all character specific data from a given file.
     These options are expansion specific, so be careful when using this with other SimulatonCraft versions.
+    Each file is only parsed again if it changed.
 
     Arguments:
         path {str} -- path to file, relative or absolute
@@ -113,209 +189,78 @@ def extract_profile(path: str, wow_class: WowClass) -> dict:
     Returns:
         dict -- all known character data
     """
-    minimal_profile_keys: typing.Dict[
-        str,
-        typing.Dict[
-            str,
-            typing.Union[
-                str, typing.Dict[str, typing.Union[str, typing.Dict[str, str]]]
-            ],
-        ],
-    ] = {
-        "character": {
-            "class": "",
-            "level": "",
-            # "position": "",  # optional
-            "race": "",
-            "role": "",
-            "spec": "",
-        },
-        "items": {
-            "back": {},
-            "chest": {},
-            "feet": {},
-            "finger1": {},
-            "finger2": {},
-            "hands": {},
-            "head": {},
-            "legs": {},
-            "main_hand": {},
-            "neck": {},
-            "off_hand": {},
-            "shoulders": {},
-            "trinket1": {},
-            "trinket2": {},
-            "waist": {},
-            "wrists": {},
-        },
-    }
+    return copy.deepcopy(file_cache.load(path, _parse_profile, wow_class))
 
-    if os.stat(path).st_size == 0:
-        raise EmptyFileError("Empty file")
+
+def _unquote(value: str) -> str:
+    return value.replace('"', "").replace("'", "")
+
+
+def _parse_character_option(profile: dict, key: str, value: str) -> None:
+    profile["character"][key] = _unquote(value)
+
+
+def _parse_set_bonus(profile: dict, key: str, value: str) -> None:
+    """set_bonus=tier30_2pc=1"""
+    set_bonus, separator, value = value.partition("=")
+    set_bonus = set_bonus.strip("\"'")
+    if separator and set_bonus in SET_BONUSES:
+        profile["character"][f"{key}={set_bonus}"] = _unquote(value)
+
+
+def _parse_item(profile: dict, slot: str, value: str) -> None:
+    """head=item_name,id=1234,bonus_id=1/2,..."""
+    item = profile["items"].setdefault(ITEM_SLOTS[slot], {})
+
+    # the first occurrence of an element in the line wins
+    elements: typing.Dict[str, str] = {}
+    for element in _unquote(value).split(",")[1:]:
+        element_key, separator, element_value = element.partition("=")
+        if separator and element_key in ITEM_ELEMENTS:
+            elements.setdefault(
+                element_key,
+                _ITEM_ELEMENT_VALUE.match(element_value).group(),  # type: ignore[union-attr]
+            )
+
+    for element_key in ITEM_ELEMENTS:
+        if element_key in elements:
+            item[element_key] = elements[element_key]
+
+
+# option name -> function adding the option value to a profile
+_OPTION_PARSERS: typing.Dict[str, typing.Callable[[dict, str, str], None]] = {
+    **{key: _parse_character_option for key in CHARACTER_OPTIONS},
+    "set_bonus": _parse_set_bonus,
+    **{slot: _parse_item for slot in ITEM_SLOTS},
+}
+
+
+def _parse_profile(path: str, wow_class: WowClass) -> dict:
     with open(path, "r") as f:
         file_content = f.read()
     if file_content.strip() == "":
         raise EmptyFileError("Empty file")
 
-    profile: typing.Dict[
-        str,
-        typing.Dict[
-            str,
-            typing.Union[
-                str,
-                typing.Dict[
-                    str,
-                    typing.Union[
-                        str,
-                        typing.Dict[str, str],
-                    ],
-                ],
-            ],
-        ],
-    ] = {
+    profile: dict = {
         "character": {"class": wow_class.simc_name},
         "items": {},
     }
 
-    # prepare regex for each extractable item slot
-    item_slots = [
-        "head",
-        "neck",
-        "shoulders",
-        "shoulder",
-        "back",
-        "chest",
-        "wrists",
-        "wrist",
-        "hands",
-        "waist",
-        "legs",
-        "feet",
-        "finger1",
-        "finger2",
-        "trinket1",
-        "trinket2",
-        "main_hand",
-        "off_hand",
-    ]
-    official_name = {
-        "shoulder": "shoulders",
-        "wrist": "wrists",
-    }
-    pattern_slots: typing.Dict[str, re.Pattern] = {}
-    for element in item_slots:
-        pattern_slots[element] = re.compile(
-            r'^{}=["\']?(?P<information>.*)["\']?$'.format(element)
-        )
-
-    # prepare regex for item defining attributes
-    item_elements = [
-        "id",
-        "bonus_id",
-        # "azerite_powers",
-        "enchant",
-        # "azerite_level",  # neck
-        "ilevel",
-        "gem_id",
-        "enchant_id",
-        "crafted_stats",
-        "drop_level",
-    ]
-    pattern_element: typing.Dict[str, re.Pattern] = {}
-    # don't recompile this for each slot
-    for element in item_elements:
-        pattern_element[element] = re.compile(
-            r',{}=["\']?(?P<information>[a-zA-Z0-9_/:]*)["\']?'.format(element)
-        )
-
-    # prepare regex for character defining information. like spec
-    character_specifics = [
-        "level",
-        "race",
-        "role",
-        "position",
-        "talents",
-        "class_talents",
-        "spec_talents",
-        "spec",
-        "default_pet",
-        r"set_bonus=[\"']?tier28_2pc[\"']?",
-        r"set_bonus=[\"']?tier28_4pc[\"']?",
-        r"set_bonus=[\"']?tier29_2pc[\"']?",
-        r"set_bonus=[\"']?tier29_4pc[\"']?",
-        r"set_bonus=[\"']?tier30_2pc[\"']?",
-        r"set_bonus=[\"']?tier30_4pc[\"']?",
-        "gear_agility",
-        "gear_intellect",
-        "gear_strength",
-        "gear_crit_rating",
-        "gear_haste_rating",
-        "gear_mastery_rating",
-        "gear_versatility_rating",
-        "deathknight.ams_absorb_percent",
-        "deathknight.amz_absorb_percent",
-    ]
-    clean_character_specifics = {
-        r"set_bonus=[\"']?tier28_2pc[\"']?": "set_bonus=tier28_2pc",
-        r"set_bonus=[\"']?tier28_4pc[\"']?": "set_bonus=tier28_4pc",
-        r"set_bonus=[\"']?tier29_2pc[\"']?": "set_bonus=tier29_2pc",
-        r"set_bonus=[\"']?tier29_4pc[\"']?": "set_bonus=tier29_4pc",
-        r"set_bonus=[\"']?tier30_2pc[\"']?": "set_bonus=tier30_2pc",
-        r"set_bonus=[\"']?tier30_4pc[\"']?": "set_bonus=tier30_4pc",
-    }
-    pattern_specifics: typing.Dict[str, re.Pattern] = {}
-    for element in character_specifics:
-        pattern_specifics[element] = re.compile(
-            r'^{}=["\']?(?P<information>.*)["\']?'.format(element)
-        )
+    for line in file_content.split("\n"):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
 
-    with open(path, "r") as f:
-        for line in f:
-            if line.lstrip().startswith("#"):
-                continue
-
-            if not line.strip():
-                continue
-
-            for specific in character_specifics:
-                matches = pattern_specifics[specific].search(line)
-                if matches:
-                    profile["character"][
-                        clean_character_specifics.get(specific, specific)
-                    ] = (matches.group("information").replace('"', "").replace("'", ""))
-
-            for slot in item_slots:
-                matches = pattern_slots[slot].search(line)
-
-                slot_name = official_name.get(slot, slot)
-
-                if matches:
-                    new_line = (
-                        matches.group("information").replace('"', "").replace("'", "")
-                    )
-                    if not slot_name in profile["items"]:
-                        profile["items"][slot_name] = {}
-
-                    # check for all elements
-                    for element in item_elements:
-                        new_matches: typing.Union[re.Match, None] = pattern_element[
-                            element
-                        ].search(new_line)
-
-                        if new_matches:
-                            profile["items"][slot_name][element] = (  # type: ignore[index]
-                                new_matches.group("information")
-                                .replace('"', "")
-                                .replace("'", "")
-                            )
+        key, separator, value = line.partition("=")
+        parser = _OPTION_PARSERS.get(key, None)
+        if separator and parser:
+            parser(profile, key, value)
 
     logger.debug(f"extracted profile from '{path}' : {profile}")
 
     # validate profile
-    missing_character_keys = []
-    for key in minimal_profile_keys["character"].keys():
-        if key not in profile["character"]:
-            missing_character_keys.append(key)
+    missing_character_keys = [
+        key for key in REQUIRED_CHARACTER_KEYS if key not in profile["character"]
+    ]
     if missing_character_keys:
         raise IncompleteProfileError(
             f"'{path}' does not contain a complete profile. Missing keys: {missing_character_keys}"
@@ -325,6 +270,77 @@ def extract_profile(path: str, wow_class: WowClass) -> dict:
     return profile
 
 
+class ProfileIndex:
+    """All fallback and SimulationCraft profile files, collected once.
+
+    Resolving the profile file of a spec becomes a lookup instead of probing
+    the file system path by path. Files added after the creation aren't
+    known.
+    """
+
+    def __init__(self, executable_path: str) -> None:
+        self.executable_path = executable_path
+        self._paths: typing.Set[str] = set()
+
+        for directory in (
+            _get_fallback_profiles_directory(),
+            _get_simc_profiles_directory(executable_path),
+        ):
+            for root, _, file_names in os.walk(directory):
+                for file_name in file_names:
+                    if file_name.endswith(".simc"):
+                        self._paths.add(self._normalize(os.path.join(root, file_name)))
+
+        logger.debug(f"Indexed {len(self._paths)} profiles.")
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _get_path(self, path: str) -> typing.Optional[str]:
+        if self._normalize(path) in self._paths:
+            return path
+        return None
+
+    def get_fallback_profile_path(
+        self, wow_spec: WowSpec, tier: str, fight_style: str
+    ) -> typing.Optional[str]:
+        return self._get_path(create_fallback_profile_path(wow_spec, tier, fight_style))
+
+    def get_simc_profile_path(
+        self, wow_spec: WowSpec, tier: str
+    ) -> typing.Optional[str]:
+        return self._get_path(
+            create_simc_profile_path(wow_spec, tier, self.executable_path)
+        )
+
+    def get_missing_profiles(
+        self,
+        wow_specs: typing.Iterable[WowSpec],
+        tier: str,
+        fight_styles: typing.Iterable[str],
+    ) -> typing.List[typing.Tuple[WowSpec, str]]:
+        """All combinations of wow_specs and fight_styles without a fallback or SimulationCraft profile."""
+        return [
+            (wow_spec, fight_style)
+            for wow_spec in wow_specs
+            for fight_style in fight_styles
+            if not self.get_fallback_profile_path(wow_spec, tier, fight_style)
+            and not self.get_simc_profile_path(wow_spec, tier)
+        ]
+
+
+# executable path -> index
+_profile_indices: typing.Dict[str, ProfileIndex] = {}
+
+
+def get_profile_index(executable_path: str) -> ProfileIndex:
+    """Creates the index on the first call for executable_path."""
+    if executable_path not in _profile_indices:
+        _profile_indices[executable_path] = ProfileIndex(executable_path)
+    return _profile_indices[executable_path]
+
+
 def _get_profile(
     profile_type: str,
     path: str,
@@ -373,20 +389,24 @@ def get_profile(wow_spec: WowSpec, fight_style: str, settings: Config) -> dict:
         if custom_profile:
             return custom_profile
 
-    fallback_profile = _get_profile(
-        "fallback",
-        create_fallback_profile_path(wow_spec, settings.tier, fight_style),
-        wow_spec.wow_class,
-    )
-    if fallback_profile:
-        return fallback_profile
+    profile_index = get_profile_index(settings.executable)
 
-    simc_profile = _get_profile(
-        "SimulationCraft",
-        create_simc_profile_path(wow_spec, settings.tier, settings.executable),
-        wow_spec.wow_class,
+    fallback_profile_path = profile_index.get_fallback_profile_path(
+        wow_spec, settings.tier, fight_style
     )
-    if simc_profile:
-        return simc_profile
+    if fallback_profile_path:
+        fallback_profile = _get_profile(
+            "fallback", fallback_profile_path, wow_spec.wow_class
+        )
+        if fallback_profile:
+            return fallback_profile
+
+    simc_profile_path = profile_index.get_simc_profile_path(wow_spec, settings.tier)
+    if simc_profile_path:
+        simc_profile = _get_profile(
+            "SimulationCraft", simc_profile_path, wow_spec.wow_class
+        )
+        if simc_profile:
+            return simc_profile
 
     raise FileNotFoundError(f"No profile found or provided for {wow_spec}.")
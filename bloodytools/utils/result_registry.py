@@ -0,0 +1,61 @@
+"""Results of already simulated inputs, shared by all simulators of one run.
+
+Several simulators of the same spec and fight style simulate identical
+profiles, e.g. the baselines of talent builds or the one iteration runs that
+extract talent strings. Simulation_Group looks up each input before
+simulating it and registers all new results.
+"""
+
+import logging
+import threading
+import typing
+
+from bloodytools.utils.data_type import DataType
+
+logger = logging.getLogger(__name__)
+
+
+class ResultRegistry:
+    """Maps canonical simulation inputs (digests created by Simulation_Group) to their results."""
+
+    def __init__(self) -> None:
+        # key -> data_type.value -> value
+        self._values: typing.Dict[bytes, typing.Dict[str, int]] = {}
+        # key -> json report, only kept for single profile simulations
+        self._json_data: typing.Dict[bytes, dict] = {}
+        self.hits = 0
+        # simulators of a pipelined run look up results from several threads
+        self._hits_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def get(
+        self, key: bytes, data_types: typing.Iterable[DataType]
+    ) -> typing.Optional[typing.Dict[str, int]]:
+        """Returns the registered values of key if all data_types are available."""
+        values = self._values.get(key, None)
+        if values is None or any(
+            data_type.value not in values for data_type in data_types
+        ):
+            return None
+        with self._hits_lock:
+            self.hits += 1
+        return values
+
+    def get_json_data(self, key: bytes) -> typing.Optional[dict]:
+        """Returns the registered json report of key. The report is shared, don't modify it."""
+        return self._json_data.get(key, None)
+
+    def add(
+        self,
+        key: bytes,
+        values: typing.Dict[str, int],
+        json_data: typing.Optional[dict] = None,
+    ) -> None:
+        """Register the results of a simulated input. Known values are kept."""
+        registered_values = self._values.setdefault(key, {})
+        for data_type, value in values.items():
+            registered_values.setdefault(data_type, value)
+        if json_data is not None:
+            self._json_data.setdefault(key, json_data)
@@ -0,0 +1,72 @@
+"""Information about the programs used in a run.
+
+The revisions don't change while bloodytools runs. They are collected once
+per process and executable and shared by all simulations. Worker processes
+receive them from the main process via set_run_metadata.
+"""
+
+import dataclasses
+import logging
+import subprocess
+import typing
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class RunMetadata:
+    bloodytools_hash: typing.Optional[str]
+    """Git revision of bloodytools, None if unknown"""
+    simc_version: str
+    """First line of SimulationCraft's output, e.g. 'SimulationCraft 1015-01 for World of Warcraft 10.1.5.50000 Live', empty if unknown"""
+
+
+# executable -> metadata
+_run_metadata: typing.Dict[str, RunMetadata] = {}
+
+
+def _get_bloodytools_hash() -> typing.Optional[str]:
+    try:
+        return (
+            subprocess.check_output(["git", "log", "-1", "--format=oneline"])
+            .strip()
+            .decode()
+            .split(" ")[0]
+        )
+    except Exception:
+        return None
+
+
+def _get_simc_version(executable: str) -> str:
+    """Run simc without input, it starts its output with its version."""
+    try:
+        output = subprocess.run(
+            [executable],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            timeout=30,
+        ).stdout.decode(errors="replace")
+    except Exception as e:
+        logger.debug(f"Couldn't probe SimulationCraft version of '{executable}': {e}")
+        return ""
+
+    first_line = output.strip().split("\n")[0].strip()
+    if first_line.startswith("SimulationCraft"):
+        return first_line
+    return ""
+
+
+def get_run_metadata(executable: str) -> RunMetadata:
+    """Collects the metadata on the first call for executable."""
+    if executable not in _run_metadata:
+        _run_metadata[executable] = RunMetadata(
+            bloodytools_hash=_get_bloodytools_hash(),
+            simc_version=_get_simc_version(executable),
+        )
+        logger.debug(f"Collected run metadata {_run_metadata[executable]}")
+    return _run_metadata[executable]
+
+
+def set_run_metadata(executable: str, run_metadata: RunMetadata) -> None:
+    """Use already collected metadata, e.g. from the main process."""
+    _run_metadata[executable] = run_metadata
@@ -0,0 +1,147 @@
+"""Private working directories for the temporary files of simc runs.
+
+Each run gets its own directory below the scratch directory, a tmpfs like
+/dev/shm if available. Each spec and fight style job gets a subdirectory.
+Simulation_Data and Simulation_Group write their input and json files to
+the job directory active in the current thread (see use_directory()), or
+to the current directory outside of jobs.
+
+Job and run directories are removed after success, failure and interrupts.
+SIGTERM, e.g. sent by a job runner, raises SystemExit within the run (see
+handle_sigterm()), so it removes them as well.
+Only kept files are moved to the kept files directory: all files of a job
+with keep_files, otherwise files marked with keep(), e.g. the input of a
+failed simulation.
+"""
+
+import contextlib
+import logging
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import typing
+
+from bloodytools.utils.config import Config
+
+logger = logging.getLogger(__name__)
+
+TMPFS_DIRECTORY = "/dev/shm"
+
+_local = threading.local()
+# paths of files to move to the kept files directory
+_kept: typing.Set[str] = set()
+_kept_lock = threading.Lock()
+
+
+def get_default_root() -> str:
+    """/dev/shm if it's writable, the system's temporary directory (TMPDIR) otherwise."""
+    if os.path.isdir(TMPFS_DIRECTORY) and os.access(TMPFS_DIRECTORY, os.W_OK):
+        return TMPFS_DIRECTORY
+    return tempfile.gettempdir()
+
+
+def get_directory() -> str:
+    """Directory for temporary files of the current thread, "" for the current directory."""
+    return typing.cast(str, getattr(_local, "directory", ""))
+
+
+def get_path(file_name: str) -> str:
+    """Path of a temporary file in the directory of the current thread."""
+    return os.path.join(get_directory(), file_name)
+
+
+def keep(path: str) -> None:
+    """Move path to the kept files directory once its job is done."""
+    with _kept_lock:
+        _kept.add(os.path.abspath(path))
+
+
+@contextlib.contextmanager
+def use_directory(directory: str) -> typing.Iterator[None]:
+    """Write temporary files of the current thread to directory."""
+    previous = get_directory()
+    _local.directory = directory
+    try:
+        yield
+    finally:
+        _local.directory = previous
+
+
+def _exit(signal_number: int, frame: typing.Any) -> None:
+    raise SystemExit(128 + signal_number)
+
+
+def handle_sigterm() -> typing.Any:
+    """Raise SystemExit on SIGTERM, so finally blocks remove directories. Returns the previous handler.
+
+    Only the main thread of a process can install signal handlers.
+    """
+    return signal.signal(signal.SIGTERM, _exit)
+
+
+@contextlib.contextmanager
+def run_directory(config: Config) -> typing.Iterator[str]:
+    """Create the directory of the run and remove it with everything left in it.
+
+    config.scratch_directory points to the run directory within the context,
+    so worker processes create their job directories in it.
+    """
+    root = config.scratch_directory or get_default_root()
+    os.makedirs(root, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix="bloodytools_", dir=root)
+    logger.debug(f"Temporary files are written to '{directory}'.")
+    previous = config.scratch_directory
+    config.scratch_directory = directory
+    is_main_thread = threading.current_thread() is threading.main_thread()
+    if is_main_thread:
+        previous_handler = handle_sigterm()
+    try:
+        yield directory
+    finally:
+        if is_main_thread:
+            signal.signal(signal.SIGTERM, previous_handler)
+        config.scratch_directory = previous
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def get_job_name(job: typing.Tuple[str, str, str]) -> str:
+    """(wow class name, wow spec name, fight style) joined for directory names."""
+    return "_".join(job)
+
+
+def create_job_directory(config: Config, name: str) -> str:
+    """Create a private directory for the temporary files of job name."""
+    return tempfile.mkdtemp(prefix=f"{name}_", dir=config.scratch_directory or None)
+
+
+def remove_job_directory(config: Config, directory: str, name: str) -> None:
+    """Remove directory, kept files are moved to the kept files directory of job name."""
+    directory = os.path.abspath(directory)
+    with _kept_lock:
+        kept = {path for path in _kept if os.path.dirname(path) == directory}
+        _kept.difference_update(kept)
+    if config.keep_files and os.path.isdir(directory):
+        kept.update(os.path.join(directory, f) for f in os.listdir(directory))
+
+    kept_directory = os.path.join(config.kept_files_directory, name)
+    for path in sorted(kept):
+        if not os.path.isfile(path):
+            continue
+        os.makedirs(kept_directory, exist_ok=True)
+        shutil.move(path, os.path.join(kept_directory, os.path.basename(path)))
+        logger.info(f"Kept '{os.path.join(kept_directory, os.path.basename(path))}'.")
+
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@contextlib.contextmanager
+def job_directory(config: Config, name: str) -> typing.Iterator[str]:
+    """Write temporary files of the current thread to a new directory for job name."""
+    directory = create_job_directory(config, name)
+    try:
+        with use_directory(directory):
+            yield directory
+    finally:
+        remove_job_directory(config, directory, name)
@@ -1,5 +1,7 @@
 import logging
 
+from bloodytools.utils import file_cache
+
 SIMC_BRANCH = "dragonflight"
 
 logger = logging.getLogger(__name__)
@@ -26,8 +28,7 @@ def get_simc_hash(path: str, log_warning: bool = True) -> str:
     new_path += f".git/refs/heads/{SIMC_BRANCH}"
     simc_hash: str = ""
     try:
-        with open(new_path, "r", encoding="utf-8") as f:
-            simc_hash = f.read().strip()
+        simc_hash = file_cache.read_text(new_path).strip()
     except FileNotFoundError as e:
         if log_warning:
             logger.warning(e)
@@ -1,4 +1,9 @@
+import contextlib
+import dataclasses
 import datetime
+import functools
+import hashlib
+import itertools
 import json
 import logging
 import json
@@ -11,6 +16,10 @@ import threading
 import time
 import uuid
 
+from bloodytools.utils import scratch
+from bloodytools.utils.data_type import DataType
+from bloodytools.utils.result_registry import ResultRegistry
+
 # wow game data and simc input checks
 from simc_support.simc_data import FightStyle
 from simc_support.simc_data.FightStyle import FIGHTSTYLES
@@ -57,13 +66,321 @@ class SimulationError(Error):
     pass
 
 
+@dataclasses.dataclass
+class PlannedSimulation:
+    """Simulation that was recorded by a DryRun instead of being simulated."""
+
+    name: str
+    # simulated profiles, including the base actor
+    profiles: int
+    iterations: str
+    target_error: str
+    # bytes of the generated simc input
+    input_size: int
+    # profilesets with the same input as an earlier profile of the group
+    collapsed: int = 0
+    # profilesets whose results were known to the registry
+    reused: int = 0
+
+
+class DryRun:
+    """Records simulations instead of running SimulationCraft, see dry_run()."""
+
+    def __init__(self) -> None:
+        self.simulations: List[PlannedSimulation] = []
+
+
+# simulations are recorded instead of simulated while a dry run is active
+_dry_run: typing.Optional[DryRun] = None
+
+
+@contextlib.contextmanager
+def dry_run() -> typing.Iterator[DryRun]:
+    """Record all simulations of the context instead of running SimulationCraft.
+
+    Simulated values are 0 and no reports are created. Results of recorded
+    profiles are registered like simulated ones, so the registry reports
+    which inputs would be reused.
+    """
+    global _dry_run
+    previous = _dry_run
+    _dry_run = DryRun()
+    try:
+        yield _dry_run
+    finally:
+        _dry_run = previous
+
+
+@dataclasses.dataclass(frozen=True)
+class SimulationSettings:
+    """Validated simc settings of a Simulation_Data. Profiles with equal settings can be simulated together.
+
+    Instances are immutable and interned. Profiles created with the same settings share one instance.
+    """
+
+    calculate_scale_factors: str = "0"
+    default_actions: str = "1"
+    default_skill: str = "1.0"
+    executable: str = ""
+    fight_style: str = "patchwerk"
+    fixed_time: str = "1"
+    html: str = ""
+    iterations: str = "250000"
+    log: str = "0"
+    optimize_expressions: str = "1"
+    ptr: str = "0"
+    ready_trigger: str = "1"
+    target_error: str = "0.1"
+    threads: str = ""
+
+
+_SETTINGS_INSTANCES: typing.Dict[SimulationSettings, SimulationSettings] = {}
+
+
+def _intern_settings(settings: SimulationSettings) -> SimulationSettings:
+    """Returns the shared instance equal to settings."""
+    return _SETTINGS_INSTANCES.setdefault(settings, settings)
+
+
+def _validate_settings(
+    calculate_scale_factors: str,
+    default_actions: str,
+    default_skill: str,
+    executable: str,
+    fight_style: str,
+    fixed_time: str,
+    html: str,
+    iterations: str,
+    log: str,
+    optimize_expressions: str,
+    ptr: str,
+    ready_trigger: str,
+    target_error: str,
+    threads: str,
+) -> SimulationSettings:
+    """Check and normalise the raw settings of Simulation_Data. Invalid values are replaced by defaults."""
+    # simc setting to calculate scale factors (stat weights)
+    if calculate_scale_factors != "0" and calculate_scale_factors != "1":
+        calculate_scale_factors = "0"
+    # simc setting to manage default apl usage
+    if default_actions not in ["0", "1"]:
+        default_actions = "1"
+    # simc setting to manage the accuracy of used apl lines (leave it at 1.0)
+    try:
+        default_skill = str(float(default_skill))
+    except Exception as e:
+        logger.error("{} -- Using default value instead.".format(e))
+        default_skill = "1.0"
+    # describes the location and type of the simc executable
+    # if no value was set, determine a standard value
+    if executable == "":
+        if sys.platform == "win32":
+            logger.debug(
+                "Setting Windows default value for executable. This might not work for your system."
+            )
+            executable = "../simc.exe"
+        else:
+            logger.debug(
+                "Setting Linux default value for executable. This might not work for your system."
+            )
+            executable = "../simc"
+    else:
+        try:
+            executable = str(executable)
+        except Exception as e:
+            logger.error("{}".format(e))
+            raise e
+    # simc setting to determine the fight style
+    if not (
+        fight_style == "custom"
+        or fight_style in FIGHTSTYLES
+        or FightStyle.CASTINGPATCHWERK in fight_style
+    ):
+        logger.warning(
+            "{} -- Using default (patchwerk) value instead.".format(fight_style)
+        )
+        fight_style = "patchwerk"
+    # simc setting to enable/diable the fixed fight length
+    if fixed_time != "0" and fixed_time != "1":
+        fixed_time = "1"
+    # simc setting to enable html output
+    if type(html) != str:
+        html = ""
+    # simc setting to determine the maximum number of run iterations
+    #   (target_error and iterations determine the actually simulated
+    #   iterations count)
+    iterations = str(int(iterations.split(".")[0]))
+    # simc setting to enable/disable a log file
+    if log != "0" and log != "1":
+        log = "0"
+    # simc setting to enable/disable optimize expressions
+    if optimize_expressions != "0" and optimize_expressions != "1":
+        optimize_expressions = "1"
+    # simc setting to enable/disable ptr data
+    if str(ptr) == "0" or str(ptr) == "1":
+        ptr = str(ptr)
+    else:
+        ptr = "0"
+    # simc setting to enable/disable ready_trigger
+    if ready_trigger != "0" and ready_trigger != "1":
+        ready_trigger = "1"
+    # simc setting to determine the target_error
+    try:
+        target_error = str(float(target_error))
+    except Exception as e:
+        target_error = "0.1"
+    # simc setting to determine the number of used threads, empty string uses
+    #   all available
+    if type(threads) == int or type(threads) == str or type(threads) == float:
+        try:
+            threads = str(int(float(threads)))
+        except Exception as e:
+            threads = ""
+    else:
+        threads = ""
+
+    return _intern_settings(
+        SimulationSettings(
+            calculate_scale_factors=calculate_scale_factors,
+            default_actions=default_actions,
+            default_skill=default_skill,
+            executable=executable,
+            fight_style=fight_style,
+            fixed_time=fixed_time,
+            html=html,
+            iterations=iterations,
+            log=log,
+            optimize_expressions=optimize_expressions,
+            ptr=ptr,
+            ready_trigger=ready_trigger,
+            target_error=target_error,
+            threads=threads,
+        )
+    )
+
+
+# most profiles are created with identical raw settings, validate them once
+_cached_validate_settings = functools.lru_cache(maxsize=256)(_validate_settings)
+
+
+_PROFILE_ARGUMENTS_INSTANCES: typing.Dict[
+    typing.Tuple[str, ...], typing.Tuple[str, ...]
+] = {}
+
+
+def _intern_profile_arguments(
+    profile_arguments: typing.Tuple[str, ...],
+) -> typing.Tuple[str, ...]:
+    """Returns the shared instance equal to profile_arguments."""
+    return _PROFILE_ARGUMENTS_INSTANCES.setdefault(profile_arguments, profile_arguments)
+
+
+FrozenProfile = typing.Tuple[typing.Tuple[str, typing.Any], ...]
+
+
+def _freeze(value: typing.Any) -> typing.Any:
+    """Hashable representation of nested dicts and lists. Order is kept."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=128)
+def _render_frozen_profile(frozen_profile: FrozenProfile) -> typing.Tuple[str, ...]:
+    profile = dict(frozen_profile)
+
+    character = []
+    for name, value in profile["character"]:
+        if name != "class":
+            character.append("{}={}".format(name, value))
+        else:
+            character.append("{}=baseline".format(value.replace("_", "")))
+
+    items = []
+    for slot, item in profile.get("items", ()) or ():
+        if item:
+            string = "{}=,".format(slot)
+            string += ",".join("{}={}".format(key, value) for key, value in item)
+            items.append(string)
+
+    return _intern_profile_arguments(tuple(character + items))
+
+
+def render_profile(profile: dict) -> typing.Tuple[str, ...]:
+    """Render a profile dict into simc arguments. Results are cached and shared, equal profiles return the same tuple.
+
+    Raises:
+        ValueError -- Raised if the profile has no character data.
+    """
+    if not profile.get("character", None):  #  or not profile.get("items", None):
+        raise ValueError(
+            "When providing a profile it must have 'character' and 'items' keys."
+        )
+    return _render_frozen_profile(_freeze(profile))
+
+
+def _settings_property(field: str) -> property:
+    """Read a field of the shared settings. Assigning a value replaces the settings of this profile only."""
+
+    def getter(self: "Simulation_Data") -> str:
+        value: str = getattr(self.settings, field)
+        return value
+
+    def setter(self: "Simulation_Data", value: str) -> None:
+        self.settings = _intern_settings(
+            dataclasses.replace(self.settings, **{field: value})
+        )
+
+    return property(getter, setter)
+
+
 class Simulation_Data:
     """Manages all META-information for a single simulation and the result.
 
+    simc settings are held by a shared SimulationSettings instance. They can still be read and assigned like attributes.
+
     TODO: add max_time, vary_combat_length
     TODO: dumb the standard values down. There is no need for extended complexity here. The user/creator functions decide what they want/need. Simulation_data is simply a dumb data holder.
     """
 
+    __slots__ = (
+        "settings",
+        "name",
+        "profile_arguments",
+        "simc_arguments",
+        "remove_files",
+        "_so_creation_time",
+        "dps",
+        "values",
+        "external_simulation",
+        "full_report",
+        "json_data",
+        "so_simulation_end_time",
+        "so_simulation_start_time",
+        "uuid",
+        "filename",
+        "json_filename",
+        "success",
+        "error",
+    )
+
+    calculate_scale_factors = _settings_property("calculate_scale_factors")
+    default_actions = _settings_property("default_actions")
+    default_skill = _settings_property("default_skill")
+    executable = _settings_property("executable")
+    fight_style = _settings_property("fight_style")
+    fixed_time = _settings_property("fixed_time")
+    html = _settings_property("html")
+    iterations = _settings_property("iterations")
+    log = _settings_property("log")
+    optimize_expressions = _settings_property("optimize_expressions")
+    ptr = _settings_property("ptr")
+    ready_trigger = _settings_property("ready_trigger")
+    target_error = _settings_property("target_error")
+    threads = _settings_property("threads")
+
     def __init__(
         self,
         calculate_scale_factors: str = "0",
@@ -84,131 +401,61 @@ class Simulation_Data:
         target_error: str = "0.1",
         threads: str = "",
         remove_files: bool = True,
+        settings: typing.Optional[SimulationSettings] = None,
     ) -> None:
+        """All simc settings are ignored if an already validated settings instance is provided."""
         super(Simulation_Data, self).__init__()
 
-        logger.debug("simulation_data initiated.")
-
-        # simc setting to calculate scale factors (stat weights)
-        if calculate_scale_factors == "0" or calculate_scale_factors == "1":
-            self.calculate_scale_factors = calculate_scale_factors
-        else:
-            self.calculate_scale_factors = "0"
-        # simc setting to manage default apl usage
-        if default_actions in ["0", "1"]:
-            self.default_actions = default_actions
-        else:
-            self.default_actions = "1"
-        # simc setting to manage the accuracy of used apl lines (leave it at 1.0)
-        try:
-            self.default_skill = str(float(default_skill))
-        except Exception as e:
-            logger.error("{} -- Using default value instead.".format(e))
-            self.default_skill = "1.0"
-        # describes the location and type of the simc executable
-        # if no value was set, determine a standard value
-        if executable == "":
-            if sys.platform == "win32":
-                logger.debug(
-                    "Setting Windows default value for executable. This might not work for your system."
-                )
-                self.executable = "../simc.exe"
-            else:
-                logger.debug(
-                    "Setting Linux default value for executable. This might not work for your system."
-                )
-                self.executable = "../simc"
-        else:
-            try:
-                self.executable = str(executable)
-            except Exception as e:
-                logger.error("{}".format(e))
-                raise e
-        # simc setting to determine the fight style
-        if (
-            fight_style == "custom"
-            or fight_style in FIGHTSTYLES
-            or FightStyle.CASTINGPATCHWERK in fight_style
-        ):
-            self.fight_style = fight_style
-        else:
-            logger.warning(
-                "{} -- Using default (patchwerk) value instead.".format(fight_style)
+        if settings is None:
+            raw_settings = (
+                calculate_scale_factors,
+                default_actions,
+                default_skill,
+                executable,
+                fight_style,
+                fixed_time,
+                html,
+                iterations,
+                log,
+                optimize_expressions,
+                ptr,
+                ready_trigger,
+                target_error,
+                threads,
             )
-            self.fight_style = "patchwerk"
-        # simc setting to enable/diable the fixed fight length
-        if fixed_time == "0" or fixed_time == "1":
-            self.fixed_time = fixed_time
-        else:
-            self.fixed_time = "1"
-        # simc setting to enable html output
-        if type(html) == str:
-            self.html = html
-        else:
-            self.html = ""
-        # simc setting to determine the maximum number of run iterations
-        #   (target_error and iterations determine the actually simulated
-        #   iterations count)
-        self.iterations = str(int(iterations.split(".")[0]))
-        # simc setting to enable/disable a log file
-        if log == "0" or log == "1":
-            self.log = log
-        else:
-            self.log = "0"
+            try:
+                settings = _cached_validate_settings(*raw_settings)
+            except TypeError:
+                # unhashable input
+                settings = _validate_settings(*raw_settings)
+        self.settings: SimulationSettings = _intern_settings(settings)
+
         # optional name for the data
         if not name:
             self.name = str(uuid.uuid4())
         else:
             self.name = name
-        # simc setting to enable/disable optimize expressions
-        if optimize_expressions == "0" or optimize_expressions == "1":
-            self.optimize_expressions = optimize_expressions
-        else:
-            self.optimize_expressions = "1"
-        # simc setting to enable/disable ptr data
-        if str(ptr) == "0" or str(ptr) == "1":
-            self.ptr = str(ptr)
-        else:
-            self.ptr = "0"
-        # simc setting to enable/disable ready_trigger
-        if ready_trigger == "0" or ready_trigger == "1":
-            self.ready_trigger = ready_trigger
-        else:
-            self.ready_trigger = "1"
         # specific data to be run, like talent combinations, specific gear or
         #   traits
         if isinstance(simc_arguments, list):
             self.simc_arguments = simc_arguments
         else:
             self.simc_arguments = [simc_arguments]
-        # craft simc input for a proper profile
+        # craft simc input for a proper profile. Kept apart from simc_arguments and
+        #   shared between all profiles with the same profile.
+        self.profile_arguments: typing.Tuple[str, ...] = ()
         if profile:
-            # prepend created character profile input
-            self.simc_arguments = (
-                self.get_simc_arguments_from_profile(profile) + self.simc_arguments
-            )
+            self.profile_arguments = render_profile(profile)
 
-        # simc setting to determine the target_error
-        try:
-            self.target_error = str(float(target_error))
-        except Exception as e:
-            self.target_error = "0.1"
-        # simc setting to determine the number of used threads, empty string uses
-        #   all available
-        if type(threads) == int or type(threads) == str or type(threads) == float:
-            try:
-                self.threads = str(int(float(threads)))
-            except Exception as e:
-                self.threads = ""
-        else:
-            self.threads = ""
         self.remove_files = remove_files
 
         # set independent default values
-        # creation time of the simulation object
-        self.so_creation_time = datetime.datetime.utcnow()
+        # creation time of the simulation object, timestamp is cheaper than datetime
+        self._so_creation_time = time.time()
         # simulation dps result
         self.dps: int = -1
+        # simulation results of other metrics, DataType.value -> value
+        self.values: typing.Dict[str, int] = {}
         # flag to know whether data was generated with external simulation function
         self.external_simulation = False
         # simulation full report (command line print out)
@@ -219,33 +466,19 @@ class Simulation_Data:
         # simulation start time
         self.so_simulation_start_time: typing.Optional[datetime.datetime] = None
 
-    def get_simc_arguments_from_profile(self, profile: dict) -> typing.List[str]:
-        if not profile.get("character", None):  #  or not profile.get("items", None):
-            raise ValueError(
-                "When providing a profile it must have 'character' and 'items' keys."
-            )
+    @property
+    def so_creation_time(self) -> datetime.datetime:
+        """Creation time of the simulation object (UTC)."""
+        return datetime.datetime.fromtimestamp(
+            self._so_creation_time, datetime.timezone.utc
+        ).replace(tzinfo=None)
 
-        character = []
-        for name in profile["character"]:
-            if name != "class":
-                character.append("{}={}".format(name, profile["character"][name]))
-            else:
-                character.append(
-                    "{}=baseline".format(profile["character"][name].replace("_", ""))
-                )
+    def get_all_simc_arguments(self) -> typing.List[str]:
+        """Rendered profile followed by the profile specific simc_arguments."""
+        return list(self.profile_arguments) + self.simc_arguments
 
-        items = []
-        if profile.get("items", None):
-            for slot in profile["items"]:
-                if profile["items"][slot]:
-                    string = "{}=,".format(slot)
-                    string += ",".join(
-                        "{}={}".format(key, value)
-                        for key, value in profile["items"][slot].items()
-                    )
-                    items.append(string)
-
-        return character + items
+    def get_simc_arguments_from_profile(self, profile: dict) -> typing.List[str]:
+        return list(render_profile(profile))
 
     def is_equal(self, simulation_instance: "Simulation_Data") -> bool:
         """Determines if the current and given simulation_data share the
@@ -266,35 +499,11 @@ class Simulation_Data:
                 f"Expected Simulation_Data, got <{type(simulation_instance)}> instead."
             )
 
-        if self.calculate_scale_factors != simulation_instance.calculate_scale_factors:
-            return False
-        if self.default_actions != simulation_instance.default_actions:
-            return False
-        if self.default_skill != simulation_instance.default_skill:
-            return False
-        if self.executable != simulation_instance.executable:
-            return False
-        if self.fight_style != simulation_instance.fight_style:
-            return False
-        if self.fixed_time != simulation_instance.fixed_time:
-            return False
-        if self.html != simulation_instance.html:
-            return False
-        if self.iterations != simulation_instance.iterations:
-            return False
-        if self.log != simulation_instance.log:
-            return False
-        if self.optimize_expressions != simulation_instance.optimize_expressions:
-            return False
-        if self.ptr != simulation_instance.ptr:
-            return False
-        if self.ready_trigger != simulation_instance.ready_trigger:
-            return False
-        if self.target_error != simulation_instance.target_error:
-            return False
-        if self.threads != simulation_instance.threads:
-            return False
-        return True
+        # interned settings make this an identity check in almost all cases
+        return (
+            self.settings is simulation_instance.settings
+            or self.settings == simulation_instance.settings
+        )
 
     def get_dps(self) -> int:
         """Get the dps of the simulation_instance.
@@ -341,6 +550,52 @@ class Simulation_Data:
             raise e
         logger.debug("Set DPS of profile '{}' to {}.".format(self.name, self.get_dps()))
 
+    def get_value(self, data_type: DataType) -> int:
+        """Get the simulated value of a metric. DataType.DPS is the same as get_dps().
+
+        Arguments:
+            data_type {DataType} -- wanted metric
+
+        Returns:
+            int -- value, -1 if not set
+        """
+        if data_type == DataType.DPS:
+            return self.get_dps()
+        return self.values.get(data_type.value, -1)
+
+    def set_value(
+        self,
+        data_type: DataType,
+        value: Union[int, float, str],
+        external: bool = True,
+    ) -> None:
+        """Set the simulated value of a metric. DataType.DPS is the same as set_dps().
+
+        Arguments:
+            data_type {DataType} -- metric of the value
+            value {int} -- simulated value
+
+        Raises:
+            AlreadySetError -- Raised if the value was already set.
+        """
+        if data_type == DataType.DPS:
+            self.set_dps(value, external=external)
+            return
+
+        if self.get_value(data_type) > -1:
+            raise AlreadySetError(
+                "Profile '{}' already had its {} value set to {}.".format(
+                    self.name, data_type.value, self.get_value(data_type)
+                )
+            )
+
+        self.values[data_type.value] = int(float(value))
+        logger.debug(
+            "Set {} of profile '{}' to {}.".format(
+                data_type.value, self.name, self.get_value(data_type)
+            )
+        )
+
     def get_simulation_duration(self) -> datetime.timedelta:
         """Return the simulation duration.
 
@@ -407,8 +662,8 @@ class Simulation_Data:
         """
         # temporary file names
         self.uuid = str(uuid.uuid4())
-        self.filename = "{}.simc".format(self.uuid)
-        self.json_filename = "{}.json".format(self.uuid)
+        self.filename = scratch.get_path("{}.simc".format(self.uuid))
+        self.json_filename = scratch.get_path("{}.json".format(self.uuid))
 
         if (
             FightStyle.CASTINGPATCHWERK in self.fight_style
@@ -435,7 +690,7 @@ class Simulation_Data:
             argument.append("ptr=" + self.ptr)
         argument.append("threads=" + self.threads)
 
-        for simc_argument in self.simc_arguments:
+        for simc_argument in self.get_all_simc_arguments():
             argument.append(simc_argument)
         argument.append(f'name="{self.name}"')
 
@@ -444,6 +699,21 @@ class Simulation_Data:
         # drop empty, pseudo empty, and comment args
         argument = [a for a in argument if a and a.strip() and a.strip()[0] != "#"]
 
+        if _dry_run is not None:
+            _dry_run.simulations.append(
+                PlannedSimulation(
+                    self.name,
+                    1,
+                    self.iterations,
+                    self.target_error,
+                    len("\n".join(argument[1:]).encode()),
+                )
+            )
+            self.set_dps(0, external=False)
+            # registered like a report, identical probes are reused
+            self.json_data = {}
+            return self.get_dps()
+
         fail_counter = 0
         simulation_output: subprocess.CompletedProcess
         # should prevent additional empty windows popping up...on win32 systems without breaking different OS
@@ -513,26 +783,15 @@ class Simulation_Data:
             Simulation_Data -- Deep copy of the current Simulation_Data
         """
         new_sim_data = Simulation_Data(
-            calculate_scale_factors=self.calculate_scale_factors,
-            default_actions=self.default_actions,
-            default_skill=self.default_skill,
-            executable=self.executable,
-            fight_style=self.fight_style,
-            fixed_time=self.fixed_time,
-            html=self.html,
-            iterations=self.iterations,
-            log=self.log,
             name=self.name,
-            optimize_expressions=self.optimize_expressions,
-            ptr=self.ptr,
-            ready_trigger=self.ready_trigger,
             simc_arguments=list(self.simc_arguments).copy(),
-            target_error=self.target_error,
-            threads=self.threads,
+            settings=self.settings,
         )
+        new_sim_data.profile_arguments = self.profile_arguments
 
-        new_sim_data.so_creation_time = self.so_creation_time
+        new_sim_data._so_creation_time = self._so_creation_time
         new_sim_data.dps = self.dps
+        new_sim_data.values = dict(self.values)
         new_sim_data.external_simulation = self.external_simulation
         new_sim_data.full_report = self.full_report
         new_sim_data.so_simulation_end_time = self.so_simulation_end_time
@@ -547,10 +806,18 @@ class Simulation_Data:
           data {dict} -- json data from SimulationCraft json report
         """
         logger.debug("Setting dps for baseprofile.")
+        collected_data = data["sim"]["players"][0]["collected_data"]
         self.set_dps(
-            data["sim"]["players"][0]["collected_data"]["dps"]["mean"],
+            collected_data["dps"]["mean"],
             external=False,
         )
+        for data_type in DataType:
+            if data_type != DataType.DPS and data_type.value in collected_data:
+                self.set_value(
+                    data_type,
+                    collected_data[data_type.value]["mean"],
+                    external=False,
+                )
         logger.debug("Set dps for profile.")
 
 
@@ -565,6 +832,8 @@ class Simulation_Group:
         profileset_work_threads: str = "",
         executable: str = "",
         remove_files: bool = True,
+        data_types: typing.Optional[List[DataType]] = None,
+        registry: typing.Optional[ResultRegistry] = None,
     ) -> None:
         logger.debug("simulation_group initiated.")
 
@@ -577,7 +846,26 @@ class Simulation_Group:
         # simulationcrafts own multithreading
         self.profileset_work_threads = profileset_work_threads
         self.executable = executable
-        self.profiles: List[Simulation_Data]
+        # metrics collected for all profiles, dps is always the first (primary) one
+        self.data_types: List[DataType] = [DataType.DPS]
+        for data_type in data_types or []:
+            if data_type not in self.data_types:
+                self.data_types.append(data_type)
+        self._profiles: List[Simulation_Data] = []
+        # profile name -> profile, keeps result assignment by name O(1)
+        self._profile_index: typing.Dict[str, Simulation_Data] = {}
+        # lazily consumed profilesets, see add_stream()
+        self._streams: List[typing.Iterator[Simulation_Data]] = []
+        # streamed profile name -> data_type.value -> value, the profiles themselves aren't kept
+        self._streamed_results: typing.Dict[str, typing.Dict[str, int]] = {}
+        # streamed profile name -> hash of its arguments, to detect conflicting duplicates
+        self._streamed_hashes: typing.Dict[str, int] = {}
+        # profileset name -> name of the profileset with identical input, see _iter_unique_profilesets()
+        self._aliases: typing.Dict[str, str] = {}
+        # results of identical inputs are shared with other groups of the run
+        self.registry = registry
+        # simulated profile name -> registry key
+        self._result_keys: typing.Dict[str, bytes] = {}
         self.sg_simulation_start_time: typing.Optional[datetime.datetime] = None
         self.sg_simulation_end_time: typing.Optional[datetime.datetime] = None
 
@@ -610,6 +898,283 @@ class Simulation_Group:
 
         self.simulation_output = ""
 
+    @property
+    def profiles(self) -> List[Simulation_Data]:
+        return self._profiles
+
+    @profiles.setter
+    def profiles(self, profiles: List[Simulation_Data]) -> None:
+        self._profiles = profiles
+        self._rebuild_index()
+
+    @property
+    def has_streams(self) -> bool:
+        """True if streamed profiles (see add_stream()) weren't written yet."""
+        return bool(self._streams)
+
+    def _rebuild_index(self) -> None:
+        """Recreate the name index from profiles.
+
+        Raises:
+            AlreadySetError -- Raised if two profiles share a name.
+        """
+        index: typing.Dict[str, Simulation_Data] = {}
+        for profile in self._profiles or []:
+            if profile.name in index:
+                raise AlreadySetError(
+                    "Profile name '{}' is used more than once in simulation_group '{}'.".format(
+                        profile.name, self.name
+                    )
+                )
+            index[profile.name] = profile
+        self._profile_index = index
+
+    def _get_profile(self, profile_name: str) -> Simulation_Data:
+        """Returns the named profile. The index is rebuilt if profiles were renamed, appended or removed without using the methods of the group.
+
+        Raises:
+            KeyError -- Raised if no profile has this name.
+        """
+        profile = self._profile_index.get(profile_name, None)
+        if (
+            profile is None
+            or profile.name != profile_name
+            or len(self._profile_index) != len(self._profiles or [])
+        ):
+            self._rebuild_index()
+            profile = self._profile_index.get(profile_name, None)
+
+        if profile is None:
+            raise KeyError(
+                "Profile_name '{}' wasn't found in the simulation_group.".format(
+                    profile_name
+                )
+            )
+        return profile
+
+    def _get_argument_keys(self, profile: Simulation_Data) -> typing.Set[str]:
+        return {argument.split("=")[0] for argument in profile.simc_arguments}
+
+    def _get_profileset_arguments(
+        self, profile: Simulation_Data, base_keys: typing.Set[str]
+    ) -> typing.List[str]:
+        """Arguments a profileset needs on top of the base actor (first profile).
+
+        If the profileset uses the same profile as the base actor only its own
+        simc_arguments are written. Profile lines overwritten by the base
+        actor's simc_arguments are restored unless the profileset sets them
+        itself.
+
+        Arguments:
+            profile {Simulation_Data} -- profile written as profileset
+            base_keys {typing.Set[str]} -- keys of the base actor's simc_arguments
+        """
+        if profile.profile_arguments != self.profiles[0].profile_arguments:
+            return profile.get_all_simc_arguments()
+
+        changed_keys = base_keys - self._get_argument_keys(profile)
+        restored = [
+            argument
+            for argument in profile.profile_arguments
+            if argument.split("=")[0] in changed_keys
+        ]
+        return restored + profile.simc_arguments
+
+    def _has_streamed_profiles(self) -> bool:
+        """Check whether any stream still yields a profile without losing it."""
+        for i, stream in enumerate(self._streams):
+            for profile in stream:
+                self._streams[i] = itertools.chain([profile], stream)
+                return True
+        return False
+
+    def _iter_profilesets(self) -> typing.Iterator[Simulation_Data]:
+        """All profiles but the base actor. Streams are consumed, only the names of their profiles are kept.
+
+        Raises:
+            ValueError -- Raised if a streamed profile doesn't share the base settings of the group.
+            AlreadySetError -- Raised if a streamed profile name is used by a different profile.
+        """
+        yield from self.profiles[1:]
+
+        for stream in self._streams:
+            for profile in stream:
+                if not self.profiles[0].is_equal(profile):
+                    raise ValueError(
+                        "Streamed profile '{}' doesn't match the base settings of simulation_group '{}'.".format(
+                            profile.name, self.name
+                        )
+                    )
+                profile_hash = hash(
+                    (profile.profile_arguments, tuple(profile.simc_arguments))
+                )
+                if profile.name in self._streamed_hashes:
+                    if self._streamed_hashes[profile.name] == profile_hash:
+                        logger.warning(
+                            "Profile '{}' was added twice to simulation_group '{}'. Skipping the duplicate.".format(
+                                profile.name, self.name
+                            )
+                        )
+                        continue
+                    raise AlreadySetError(
+                        "Profile name '{}' is already used in simulation_group '{}'.".format(
+                            profile.name, self.name
+                        )
+                    )
+                if profile.name in self._profile_index:
+                    raise AlreadySetError(
+                        "Profile name '{}' is already used in simulation_group '{}'.".format(
+                            profile.name, self.name
+                        )
+                    )
+                self._streamed_hashes[profile.name] = profile_hash
+                self._streamed_results[profile.name] = {}
+                yield profile
+        self._streams = []
+
+    def _create_hasher(self, profile: Simulation_Data) -> "hashlib.blake2b":
+        """Hasher of the canonical input of profile. Update it with profileset arguments to get their input."""
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr(dataclasses.astuple(profile.settings)).encode())
+        self._update_hasher(hasher, profile.get_all_simc_arguments())
+        return hasher
+
+    def _get_effective_arguments(
+        self, arguments: typing.Iterable[str]
+    ) -> typing.List[str]:
+        """Arguments without comments and empty lines."""
+        return [
+            argument.strip()
+            for argument in arguments
+            if argument.strip() and not argument.strip().startswith("#")
+        ]
+
+    def _update_hasher(
+        self, hasher: "hashlib.blake2b", arguments: typing.Iterable[str]
+    ) -> None:
+        for argument in self._get_effective_arguments(arguments):
+            hasher.update(argument.encode())
+            hasher.update(b"\0")
+
+    def _set_registered_results(self, profile_name: str, key: bytes) -> bool:
+        """Set results of key from registry. Returns False if they are unknown."""
+        if self.registry is None:
+            return False
+        values = self.registry.get(key, self.data_types)
+        if values is None:
+            return False
+        for data_type in self.data_types:
+            self.set_value_of(profile_name, data_type, values[data_type.value])
+        return True
+
+    def _register_results(self) -> None:
+        if self.registry is None:
+            return
+        for profile_name, key in self._result_keys.items():
+            values = {
+                data_type.value: self.get_value_of(profile_name, data_type)
+                for data_type in self.data_types
+            }
+            self.registry.add(
+                key,
+                {data_type: value for data_type, value in values.items() if value > -1},
+            )
+
+    def _iter_unique_profilesets(
+        self, base_keys: typing.Set[str], excluded_keys: typing.Collection[str] = ()
+    ) -> typing.Iterator[typing.Tuple[Simulation_Data, typing.List[str]]]:
+        """Yields (profile, arguments to write) for all profilesets with a unique input.
+
+        The input of a profileset is the base actor's input followed by the
+        arguments written for the profileset, ignoring comments and empty
+        lines. Repeating the last arguments of the base actor doesn't change
+        its input, unless they append (+=). Profilesets with the same input
+        as an earlier one (or the base actor) are not yielded. They are registered as aliases and receive
+        the results of the earlier profile in set_json_data(). Profilesets
+        whose input is known to the registry get their results right away.
+
+        Arguments:
+            base_keys {typing.Set[str]} -- keys of the base actor's simc_arguments
+            excluded_keys {typing.Collection[str]} -- argument keys that aren't written (default: {()})
+        """
+        base_hasher = self._create_hasher(self.profiles[0])
+        base_key = base_hasher.digest()
+        base_arguments = self._get_effective_arguments(
+            self.profiles[0].get_all_simc_arguments()
+        )
+        # canonical input -> profile name
+        unique_names: typing.Dict[bytes, str] = {base_key: self.profiles[0].name}
+        self._aliases = {}
+        self._result_keys = {self.profiles[0].name: base_key}
+        registered = 0
+
+        for profile in self._iter_profilesets():
+            arguments = [
+                argument
+                for argument in self._get_profileset_arguments(profile, base_keys)
+                if argument.split("=")[0] not in excluded_keys
+            ]
+            effective_arguments = self._get_effective_arguments(arguments)
+            if (
+                len(effective_arguments) <= len(base_arguments)
+                and base_arguments[len(base_arguments) - len(effective_arguments) :]
+                == effective_arguments
+                and not any("+=" in argument for argument in effective_arguments)
+            ):
+                key = base_key
+            else:
+                hasher = base_hasher.copy()
+                self._update_hasher(hasher, effective_arguments)
+                key = hasher.digest()
+
+            if key in unique_names:
+                self._aliases[profile.name] = unique_names[key]
+                continue
+            unique_names[key] = profile.name
+            if self._set_registered_results(profile.name, key):
+                registered += 1
+                continue
+            self._result_keys[profile.name] = key
+            yield profile, arguments
+
+        if self._aliases:
+            logger.info(
+                "Collapsed {} duplicated profilesets of simulation_group '{}'.".format(
+                    len(self._aliases), self.name
+                )
+            )
+        if registered:
+            logger.info(
+                "Reused {} results of earlier simulations in simulation_group '{}'.".format(
+                    registered, self.name
+                )
+            )
+
+    def _simulate_single_profile(self) -> None:
+        """Simulate the only profile of the group, unless the registry knows its result and report."""
+        profile = self.profiles[0]
+        if self.registry is None:
+            profile.simulate()
+            return
+
+        key = self._create_hasher(profile).digest()
+        json_data = self.registry.get_json_data(key)
+        if json_data is not None and self._set_registered_results(profile.name, key):
+            profile.json_data = json_data
+            logger.debug(f"Reused the earlier simulation of '{profile.name}'.")
+            return
+
+        profile.simulate()
+        values = {
+            data_type.value: profile.get_value(data_type)
+            for data_type in self.data_types
+        }
+        self.registry.add(
+            key,
+            {data_type: value for data_type, value in values.items() if value > -1},
+            profile.json_data,
+        )
+
     def selfcheck(self) -> bool:
         """Compares the base content of all profiles. All profiles need to
             have the same values in each standard field (__init__ of
@@ -669,6 +1234,108 @@ class Simulation_Group:
             # write current output
             print("{}".format(print_line), end="\r", flush=True)  # kill line break
 
+    def _write_input(self, write: typing.Callable[[str], typing.Any]) -> None:
+        """Write the profileset input of the group, e.g. with the write method of a file."""
+        if (
+            FightStyle.CASTINGPATCHWERK in self.profiles[0].fight_style
+            and FightStyle.CASTINGPATCHWERK != self.profiles[0].fight_style
+        ):
+            simc_fight_style = FightStyle.CASTINGPATCHWERK
+            special_remark = "desired_targets=" + self.profiles[0].fight_style[-1]
+        else:
+            simc_fight_style = self.profiles[0].fight_style
+            special_remark = ""
+
+        # write the equal values to file
+        write("json={}\n".format(self.json_filename))
+        write(
+            "calculate_scale_factors={}\n".format(
+                self.profiles[0].calculate_scale_factors
+            )
+        )
+        write(
+            "profileset_metric={}\n".format(
+                ",".join(data_type.value for data_type in self.data_types)
+            )
+        )
+        write(
+            "calculate_scale_factors={}\n".format(
+                self.profiles[0].calculate_scale_factors
+            )
+        )
+        write("default_actions={}\n".format(self.profiles[0].default_actions))
+        write("default_skill={}\n".format(self.profiles[0].default_skill))
+        write(f"fight_style={simc_fight_style}\n")
+        write(f"{special_remark}\n")
+        write("fixed_time={}\n".format(self.profiles[0].fixed_time))
+        if self.profiles[0].html != "":
+            write("html={}\n".format(self.profiles[0].html))
+        write("iterations={}\n".format(self.profiles[0].iterations))
+        write("log={}\n".format(self.profiles[0].log))
+        write("optimize_expressions={}\n".format(self.profiles[0].optimize_expressions))
+        if int(self.profiles[0].ptr) == 1:
+            write("ptr={}\n".format(self.profiles[0].ptr))
+        write("target_error={}\n".format(self.profiles[0].target_error))
+        write("threads={}\n".format(self.threads))
+        write("profileset_work_threads={}\n".format(self.profileset_work_threads))
+
+        from simc_support.game_data.WowClass import WOWCLASSES
+
+        simc_wow_class_names = [
+            wow_class.simc_name.replace("_", "") for wow_class in WOWCLASSES
+        ]
+        base_keys = self._get_argument_keys(self.profiles[0])
+
+        # first used profile needs to be written as normal profile instead of profileset
+        logger.debug("simc_arguments of first profile of simulation_group")
+        logger.debug(self.profiles[0].get_all_simc_arguments())
+        for argument in self.profiles[0].get_all_simc_arguments():
+            write("{}\n".format(argument))
+        write('name="{}"\n\n# Profileset start\n'.format(self.profiles[0].name))
+        # or else in wrong scope
+        write("ready_trigger={}\n".format(self.profiles[0].ready_trigger))
+
+        # write all specific arguments to file
+        for profile, arguments in self._iter_unique_profilesets(
+            base_keys, simc_wow_class_names
+        ):
+            for argument in arguments:
+                write(
+                    'profileset."{profile_name}"+={argument}\n'.format(
+                        profile_name=profile.name,
+                        argument=argument,
+                    )
+                )
+
+    def _record_dry_run(self, dry_run: DryRun) -> None:
+        """Record the group in dry_run instead of simulating it. Profiles get the value 0."""
+        input_size = 0
+
+        def count(text: str) -> None:
+            nonlocal input_size
+            input_size += len(text.encode())
+
+        hits = self.registry.hits if self.registry is not None else 0
+        self._write_input(count)
+        reused = self.registry.hits - hits if self.registry is not None else 0
+
+        for profile_name in self._result_keys:
+            for data_type in self.data_types:
+                self.set_value_of(profile_name, data_type, 0)
+        self._register_results()
+
+        dry_run.simulations.append(
+            PlannedSimulation(
+                self.name,
+                len(self._result_keys),
+                self.profiles[0].iterations,
+                self.profiles[0].target_error,
+                input_size,
+                len(self._aliases),
+                reused,
+            )
+        )
+
     def simulate(self) -> bool:
         """Triggers the simulation of all profiles.
 
@@ -682,20 +1349,25 @@ class Simulation_Group:
         if self.profiles:
             self.set_simulation_start_time()
 
-            if len(self.profiles) == 1:
+            if len(self.profiles) == 1 and not self._has_streamed_profiles():
                 # if only one profiles is in the group this profile is simulated normally
                 try:
-                    self.profiles[0].simulate()
+                    self._simulate_single_profile()
                 except Exception as e:
                     raise e
 
-            elif len(self.profiles) >= 2:
+            elif len(self.profiles) >= 2 or self._streams:
                 # check for a path to executable
                 if not self.executable:
                     raise ValueError(
                         "No path_to_executable was set. Simulation can't start."
                     )
 
+                if _dry_run is not None:
+                    self._record_dry_run(_dry_run)
+                    self.set_simulation_end_time()
+                    return True
+
                 # write data to file, create file name
                 if self.filename:
                     raise AlreadySetError(
@@ -706,112 +1378,17 @@ class Simulation_Group:
                 else:
                     # temporary file names
                     self.uuid = str(uuid.uuid4())
-                    self.filename = "{}.simc".format(self.uuid)
-                    self.json_filename = "{}.json".format(self.uuid)
-
-                    if (
-                        FightStyle.CASTINGPATCHWERK in self.profiles[0].fight_style
-                        and FightStyle.CASTINGPATCHWERK != self.profiles[0].fight_style
-                    ):
-                        simc_fight_style = FightStyle.CASTINGPATCHWERK
-                        special_remark = (
-                            "desired_targets=" + self.profiles[0].fight_style[-1]
-                        )
-                    else:
-                        simc_fight_style = self.profiles[0].fight_style
-                        special_remark = ""
+                    self.filename = scratch.get_path("{}.simc".format(self.uuid))
+                    self.json_filename = scratch.get_path("{}.json".format(self.uuid))
 
                     # write arguments to file
                     with open(self.filename, "w") as f:
-                        # write the equal values to file
-                        f.write("json={}\n".format(self.json_filename))
-                        f.write(
-                            "calculate_scale_factors={}\n".format(
-                                self.profiles[0].calculate_scale_factors
-                            )
-                        )
-                        f.write("profileset_metric={}\n".format(",".join(["dps"])))
-                        f.write(
-                            "calculate_scale_factors={}\n".format(
-                                self.profiles[0].calculate_scale_factors
-                            )
-                        )
-                        f.write(
-                            "default_actions={}\n".format(
-                                self.profiles[0].default_actions
-                            )
-                        )
-                        f.write(
-                            "default_skill={}\n".format(self.profiles[0].default_skill)
-                        )
-                        f.write(f"fight_style={simc_fight_style}\n")
-                        f.write(f"{special_remark}\n")
-                        f.write("fixed_time={}\n".format(self.profiles[0].fixed_time))
-                        if self.profiles[0].html != "":
-                            f.write("html={}\n".format(self.profiles[0].html))
-                        f.write("iterations={}\n".format(self.profiles[0].iterations))
-                        f.write("log={}\n".format(self.profiles[0].log))
-                        f.write(
-                            "optimize_expressions={}\n".format(
-                                self.profiles[0].optimize_expressions
-                            )
-                        )
-                        if int(self.profiles[0].ptr) == 1:
-                            f.write("ptr={}\n".format(self.profiles[0].ptr))
-                        f.write(
-                            "target_error={}\n".format(self.profiles[0].target_error)
-                        )
-                        f.write("threads={}\n".format(self.threads))
-                        f.write(
-                            "profileset_work_threads={}\n".format(
-                                self.profileset_work_threads
-                            )
-                        )
-
-                        # write all specific arguments to file
-                        for profile in self.profiles:
-                            # first used profile needs to be written as normal profile instead of profileset
-                            if profile == self.profiles[0]:
-                                logger.debug(
-                                    "simc_arguments of first profile of simulation_group"
-                                )
-                                logger.debug(profile.simc_arguments)
-                                for argument in profile.simc_arguments:
-                                    f.write("{}\n".format(argument))
-                                f.write(
-                                    'name="{}"\n\n# Profileset start\n'.format(
-                                        profile.name
-                                    )
-                                )
-                                # or else in wrong scope
-                                f.write(
-                                    "ready_trigger={}\n".format(
-                                        self.profiles[0].ready_trigger
-                                    )
-                                )
+                        self._write_input(f.write)
 
-                            else:
-                                from simc_support.game_data.WowClass import WOWCLASSES
-
-                                simc_wow_class_names = [
-                                    wow_class.simc_name.replace("_", "")
-                                    for wow_class in WOWCLASSES
-                                ]
-                                filtered_arguments = [
-                                    arg
-                                    for arg in profile.simc_arguments
-                                    if arg.split("=")[0] not in simc_wow_class_names
-                                ]
-                                for argument in filtered_arguments:
-                                    f.write(
-                                        'profileset."{profile_name}"+={argument}\n'.format(
-                                            profile_name=profile.name,
-                                            argument=argument,
-                                        )
-                                    )
-
-                    with open(self.filename, "r") as f:
-                        logger.debug(f.read())
+                    # generated files can get huge, don't read them for nothing
+                    if logger.isEnabledFor(logging.DEBUG):
+                        with open(self.filename, "r") as f:
+                            logger.debug(f.read())
                     # counter of failed simulation attempts
                     fail_counter = 0
                     simulation_output: subprocess.Popen
@@ -889,6 +1466,7 @@ class Simulation_Group:
                             f.write("# FAILED PROFILE!\n")
                             f.write("# SimulationCraft Output:")
                             f.write(self.error)
+                        scratch.keep(self.filename)
 
                         raise SimulationError(self.error)
 
@@ -952,14 +1530,14 @@ class Simulation_Group:
         if self.profiles:
             self.set_simulation_start_time()
 
-            if len(self.profiles) == 1:
+            if len(self.profiles) == 1 and not self._has_streamed_profiles():
                 # if only one profiles is in the group this profile is simulated normally
                 try:
-                    self.profiles[0].simulate()
+                    self._simulate_single_profile()
                 except Exception as e:
                     raise e
 
-            elif len(self.profiles) >= 2:
+            elif len(self.profiles) >= 2 or self._streams:
                 # write data to file, create file name
                 if self.filename:
                     raise AlreadySetError(
@@ -980,7 +1558,7 @@ class Simulation_Group:
                         simc_fight_style = self.profiles[0].fight_style
                         special_remark = ""
 
-                    self.filename = str(uuid.uuid4()) + ".simc"
+                    self.filename = scratch.get_path(str(uuid.uuid4()) + ".simc")
 
                     # if somehow the random naming function created the same name twice
                     if os.path.isfile(self.filename):
@@ -989,10 +1567,17 @@ class Simulation_Group:
                                 self.filename
                             )
                         )
-                        self.filename = str(uuid.uuid4()) + ".simc"
+                        self.filename = scratch.get_path(str(uuid.uuid4()) + ".simc")
                     # write arguments to file
                     with open(self.filename, "w") as f:
                         # write the equal values to file
+                        f.write(
+                            "profileset_metric={}\n".format(
+                                ",".join(
+                                    data_type.value for data_type in self.data_types
+                                )
+                            )
+                        )
                         f.write(
                             "default_actions={}\n".format(
                                 self.profiles[0].default_actions
@@ -1016,34 +1601,34 @@ class Simulation_Group:
                             "target_error={}\n".format(self.profiles[0].target_error)
                         )
 
+                        base_keys = self._get_argument_keys(self.profiles[0])
+
+                        # first used profile needs to be written as normal profile instead of profileset
+                        for argument in self.profiles[0].get_all_simc_arguments():
+                            f.write("{}\n".format(argument))
+                        f.write(
+                            'name="{}"\n\n# Profileset start\n'.format(
+                                self.profiles[0].name
+                            )
+                        )
+                        # or else in wrong scope
+                        f.write(
+                            "ready_trigger={}\n".format(self.profiles[0].ready_trigger)
+                        )
+
                         # write all specific arguments to file
-                        for profile in self.profiles:
-                            # first used profile needs to be written as normal profile instead of profileset
-                            if profile == self.profiles[0]:
-                                for argument in profile.simc_arguments:
-                                    f.write("{}\n".format(argument))
-                                f.write(
-                                    'name="{}"\n\n# Profileset start\n'.format(
-                                        profile.name
-                                    )
-                                )
-                                # or else in wrong scope
+                        for profile, arguments in self._iter_unique_profilesets(
+                            base_keys
+                        ):
+                            for special_argument in arguments:
                                 f.write(
-                                    "ready_trigger={}\n".format(
-                                        self.profiles[0].ready_trigger
+                                    'profileset."{profile_name}"+={argument}\n'.format(
+                                        profile_name=profile.name,
+                                        argument=special_argument,
                                     )
                                 )
-
-                            else:
-                                for special_argument in profile.simc_arguments:
-                                    f.write(
-                                        'profileset."{profile_name}"+={argument}\n'.format(
-                                            profile_name=profile.name,
-                                            argument=special_argument,
-                                        )
-                                    )
-                                # add iterations hack
-                                # f.write("profileset.\"{profile_name}\"+=iterations={iterations}\n".format(profile_name=profile.name, iterations=self.profiles[0].iterations))
+                            # add iterations hack
+                            # f.write("profileset.\"{profile_name}\"+=iterations={iterations}\n".format(profile_name=profile.name, iterations=self.profiles[0].iterations))
 
                     # create advanced input string
                     raidbots_advancedInput = ""
@@ -1168,7 +1753,10 @@ class Simulation_Group:
                         )
                         logger.debug(raidbots_output)
 
-                        with open("{}.error".format(raidbots_sim_id), "w") as f:
+                        error_filename = scratch.get_path(
+                            "{}.error".format(raidbots_sim_id)
+                        )
+                        with open(error_filename, "w") as f:
                             f.write("############## INPUT #############\n")
                             f.write(json.dumps(raidbots_advancedInput))
                             f.write("\n\n############# RECEIVED ###########\n")
@@ -1188,9 +1776,10 @@ class Simulation_Group:
                                 f.write(
                                     "\n\n############## DATA ##############\nNo data available.\n"
                                 )
+                        scratch.keep(error_filename)
 
                         raise SimulationError(
-                            "Simulating with Raidbots failed. Please check out {}.error file.".format(
+                            "Simulating with Raidbots failed. Please check out {}.error file in the kept files.".format(
                                 raidbots_sim_id
                             )
                         )
@@ -1234,15 +1823,35 @@ class Simulation_Group:
           data {dict} -- json data from SimulationCraft json report
         """
         logger.debug("Setting dps for baseprofile.")
-        self.set_dps_of(
-            data["sim"]["players"][0]["name"],
-            data["sim"]["players"][0]["collected_data"]["dps"]["mean"],
-        )
+        base_name = data["sim"]["players"][0]["name"]
+        collected_data = data["sim"]["players"][0]["collected_data"]
+        for data_type in self.data_types:
+            if data_type.value in collected_data:
+                self.set_value_of(
+                    base_name, data_type, collected_data[data_type.value]["mean"]
+                )
         logger.debug("Set dps for baseprofile.")
 
-        for profile in data["sim"]["profilesets"]["results"]:
+        # all profilesets might have been known already
+        for profile in data["sim"].get("profilesets", {}).get("results", []):
             logger.debug("Setting dps for {}".format(profile["name"]))
+            # first metric of profileset_metric
             self.set_dps_of(profile["name"], profile["mean"])
+            for metric in profile.get("additional_metrics", []):
+                try:
+                    data_type = DataType(metric["metric"])
+                except ValueError:
+                    continue
+                self.set_value_of(profile["name"], data_type, metric["mean"])
+
+        # duplicated profilesets weren't simulated
+        for alias, profile_name in self._aliases.items():
+            for data_type in self.data_types:
+                value = self.get_value_of(profile_name, data_type)
+                if value > -1:
+                    self.set_value_of(alias, data_type, value)
+
+        self._register_results()
 
     def add(self, simulation_instance: Simulation_Data) -> bool:
         """Add another simulation_instance object to the group.
@@ -1253,16 +1862,39 @@ class Simulation_Group:
         Raises:
             e -- Raised if appending a list element files.
             TypeError -- Raised if simulation_instance is not of type simulation_data
+            AlreadySetError -- Raised if another profile with the same name but different simc_arguments is part of the group.
 
         Returns:
-            bool -- True if added.
+            bool -- True if added, False if an identical profile with the same name is already part of the group.
         """
         if type(simulation_instance) == Simulation_Data:
+            if simulation_instance.name in self._profile_index:
+                # the index might be outdated due to renamed profiles
+                self._rebuild_index()
+            if simulation_instance.name in self._profile_index:
+                existing = self._profile_index[simulation_instance.name]
+                # simc would merge both profilesets anyway
+                if (
+                    existing.get_all_simc_arguments()
+                    == simulation_instance.get_all_simc_arguments()
+                ):
+                    logger.warning(
+                        "Profile '{}' was added twice to simulation_group '{}'. Skipping the duplicate.".format(
+                            simulation_instance.name, self.name
+                        )
+                    )
+                    return False
+                raise AlreadySetError(
+                    "Profile name '{}' is already used in simulation_group '{}'.".format(
+                        simulation_instance.name, self.name
+                    )
+                )
             try:
                 self.profiles.append(simulation_instance)
             except Exception as e:
                 raise e
             else:
+                self._profile_index[simulation_instance.name] = simulation_instance
                 return True
         else:
             raise TypeError(
@@ -1271,6 +1903,57 @@ class Simulation_Group:
                 )
             )
 
+    def add_stream(
+        self, simulation_instances: typing.Iterable[Simulation_Data]
+    ) -> None:
+        """Add profiles lazily. Use this for large generated groups.
+
+        The stream is consumed while the input file is written, so only
+        names and results of streamed profiles are kept. They are not part of
+        profiles, use iter_results(), get_dps_of() or get_value_of() to read
+        their results. If the group is still empty, the first streamed
+        profile is added as base actor.
+
+        Arguments:
+            simulation_instances {typing.Iterable[Simulation_Data]} -- e.g. a generator of profiles
+        """
+        stream = iter(simulation_instances)
+        if not self.profiles:
+            for simulation_instance in stream:
+                self.add(simulation_instance)
+                break
+        self._streams.append(stream)
+
+    def iter_results(
+        self, data_type: DataType = DataType.DPS
+    ) -> typing.Iterator[typing.Tuple[str, int]]:
+        """Yields (name, value) of all profiles, including streamed ones.
+
+        Arguments:
+            data_type {DataType} -- wanted metric (default: {DataType.DPS})
+        """
+        for profile in self.profiles:
+            yield profile.name, profile.get_value(data_type)
+        for profile_name, values in self._streamed_results.items():
+            yield profile_name, values.get(data_type.value, -1)
+
+    def remove(self, profile_name: str) -> Simulation_Data:
+        """Remove the named profile from the group.
+
+        Arguments:
+            profile_name {str} -- Name of the profile. e.g. 'baseline'
+
+        Raises:
+            KeyError -- Raised if no profile has this name.
+
+        Returns:
+            Simulation_Data -- the removed profile
+        """
+        profile = self._get_profile(profile_name)
+        self.profiles.remove(profile)
+        del self._profile_index[profile_name]
+        return profile
+
     def get_dps_of(self, profile_name: str) -> int:
         """Returns DPS of the wanted/named profile.
 
@@ -1280,24 +1963,54 @@ class Simulation_Group:
         Returns:
             int -- dps
         """
-
-        for profile in self.profiles:
-            if profile.name == profile_name:
-                return profile.get_dps()
-        raise KeyError(
-            "Profile_name '{}' wasn't found in the simulation_group.".format(
-                profile_name
-            )
-        )
+        return self.get_value_of(profile_name, DataType.DPS)
 
     def set_dps_of(self, profile_name: str, dps: Union[int, float, str]) -> bool:
+        return self.set_value_of(profile_name, DataType.DPS, dps)
+
+    def get_value_of(self, profile_name: str, data_type: DataType) -> int:
+        """Returns the value of a metric of the wanted/named profile.
+
+        Arguments:
+            profile_name {str} -- Name of the profile. e.g. 'baseline'
+            data_type {DataType} -- wanted metric
+
+        Returns:
+            int -- value
+        """
+        if profile_name in self._streamed_results:
+            return self._streamed_results[profile_name].get(data_type.value, -1)
+        return self._get_profile(profile_name).get_value(data_type)
+
+    def set_value_of(
+        self, profile_name: str, data_type: DataType, value: Union[int, float, str]
+    ) -> bool:
+        if profile_name in self._streamed_results:
+            try:
+                self._streamed_results[profile_name][data_type.value] = int(
+                    float(value)
+                )
+            except Exception as e:
+                logger.error(
+                    "Setting {} for profile {} failed. {}".format(
+                        data_type.value, profile_name, e
+                    )
+                )
+                return False
+            return True
+
         try:
-            for profile in self.profiles:
-                if profile.name == profile_name:
-                    profile.set_dps(dps, external=False)
+            profile = self._get_profile(profile_name)
+        except KeyError:
+            # results of unknown profiles are ignored
+            return True
+        try:
+            profile.set_value(data_type, value, external=False)
         except Exception as e:
             logger.error(
-                "Setting dps for profile {} failed. {}".format(profile_name, e)
+                "Setting {} for profile {} failed. {}".format(
+                    data_type.value, profile_name, e
+                )
             )
             return False
         else:
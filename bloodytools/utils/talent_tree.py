@@ -0,0 +1,289 @@
+"""Talent trees of simc_support and the rules builds have to follow in them.
+
+A build assigns ranks to the nodes of the class and spec tree of a spec and
+picks one talent of each selected choice node. Builds are read from WoW
+export strings (talents=) or from class_talents/spec_talents lists of talent
+names, and written as export strings.
+
+A build is valid if
+  - no node exceeds its max rank,
+  - each selected node with parents has a parent at max rank,
+  - each gated node has enough points spent above its gate in its tree.
+Game builds can break these rules if simc_support's tree data is outdated.
+
+Free nodes are granted by the game. They are part of neither export strings
+nor builds and count as maxed parents.
+"""
+
+import dataclasses
+import functools
+import json
+import logging
+import typing
+
+import pkg_resources
+
+from simc_support.game_data.Talent import TreeNodeType
+from simc_support.game_data.WowSpec import WowSpec
+
+logger = logging.getLogger(__name__)
+
+CLASS_TREE = "class_talents"
+SPEC_TREE = "spec_talents"
+
+BASE64_CHARS = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/"
+# see Blizzard_ClassTalentImportExport.lua
+SERIALIZATION_VERSION = 1
+VERSION_BITS = 8
+SPEC_BITS = 16
+TREE_HASH_BITS = 128
+RANK_BITS = 6
+CHOICE_BITS = 2
+
+# node id -> rank
+Ranks = typing.Dict[int, int]
+# node id -> index of the picked talent of a choice node
+Choices = typing.Dict[int, int]
+
+
+class TalentBuildError(Exception):
+    pass
+
+
+@dataclasses.dataclass(frozen=True)
+class TalentNode:
+    id: int
+    tree: str
+    """CLASS_TREE or SPEC_TREE"""
+    max_rank: int
+    required_points: int
+    """points that have to be spent above the gate of the node"""
+    parent_ids: typing.Tuple[int, ...]
+    talents: typing.Tuple[str, ...]
+    """simc names of the selectable talents"""
+    talent_ids: typing.Tuple[int, ...]
+    is_choice: bool
+    is_free: bool
+
+
+def _load_free_node_ids(wow_spec: WowSpec) -> typing.Set[int]:
+    """simc_support doesn't keep the freeNode flag, it's read from its raw tree data."""
+    file_path = (
+        f"data_files/trees/{wow_spec.wow_class.simc_name}_{wow_spec.simc_name}.json"
+    )
+    try:
+        with pkg_resources.resource_stream("simc_support.game_data", file_path) as f:
+            raw_tree = json.load(f)
+    except FileNotFoundError:
+        logger.warning(f"No raw tree data for {wow_spec}, assuming no free nodes.")
+        return set()
+    return {
+        raw_node["id"]
+        for raw_node in raw_tree["classNodes"] + raw_tree["specNodes"]
+        if raw_node.get("freeNode", False)
+    }
+
+
+class _BitReader:
+    def __init__(self, export_string: str) -> None:
+        try:
+            values = [BASE64_CHARS.index(char) for char in export_string]
+        except ValueError as e:
+            raise TalentBuildError(
+                f"'{export_string}' isn't a talent export string."
+            ) from e
+        # least significant bit first
+        self._bits = [(value >> i) & 1 for value in values for i in range(6)]
+        self._position = 0
+
+    def read(self, bit_count: int) -> int:
+        if self._position + bit_count > len(self._bits):
+            raise TalentBuildError("Talent export string ended unexpectedly.")
+        value = 0
+        for i in range(bit_count):
+            value |= self._bits[self._position + i] << i
+        self._position += bit_count
+        return value
+
+
+class _BitWriter:
+    def __init__(self) -> None:
+        self._bits: typing.List[int] = []
+
+    def write(self, value: int, bit_count: int) -> None:
+        self._bits.extend((value >> i) & 1 for i in range(bit_count))
+
+    def get_string(self) -> str:
+        bits = self._bits + [0] * (-len(self._bits) % 6)
+        return "".join(
+            BASE64_CHARS[sum(bit << i for i, bit in enumerate(bits[j : j + 6]))]
+            for j in range(0, len(bits), 6)
+        )
+
+
+class TalentTrees:
+    """Class and spec tree of one spec."""
+
+    def __init__(self, wow_spec: WowSpec) -> None:
+        self.wow_spec = wow_spec
+        free_node_ids = _load_free_node_ids(wow_spec)
+        self.nodes: typing.Dict[int, TalentNode] = {}
+        for tree, simc_tree in (
+            (CLASS_TREE, wow_spec.class_tree),
+            (SPEC_TREE, wow_spec.spec_tree),
+        ):
+            for tree_node in simc_tree.tree_nodes:
+                self.nodes[tree_node.id] = TalentNode(
+                    id=tree_node.id,
+                    tree=tree,
+                    max_rank=tree_node.max_rank,
+                    required_points=tree_node.required_invested_points,
+                    parent_ids=tuple(tree_node.parent_ids),
+                    talents=tuple(t.simc_name for t in tree_node.talents),
+                    talent_ids=tuple(t.id for t in tree_node.talents),
+                    is_choice=tree_node.tree_node_type == TreeNodeType.CHOICE,
+                    is_free=tree_node.id in free_node_ids,
+                )
+        # nodes of all specs of the class, in export string order
+        self.node_order: typing.List[int] = list(wow_spec.full_node_order)
+        self._gates = sorted(
+            {n.required_points for n in self.nodes.values() if n.required_points}
+        )
+
+    def get_talent_name(self, node_id: int, choices: Choices) -> str:
+        talents = self.nodes[node_id].talents
+        return talents[min(choices.get(node_id, 0), len(talents) - 1)]
+
+    def decode(self, export_string: str) -> typing.Tuple[Ranks, Choices, int]:
+        """Ranks, choices and tree hash of a WoW talent export string."""
+        reader = _BitReader(export_string)
+        version = reader.read(VERSION_BITS)
+        if version != SERIALIZATION_VERSION:
+            raise TalentBuildError(
+                f"Unsupported talent export string version {version}."
+            )
+        spec_id = reader.read(SPEC_BITS)
+        if spec_id != self.wow_spec.id:
+            raise TalentBuildError(
+                f"Talent export string is for spec {spec_id}, not {self.wow_spec} ({self.wow_spec.id})."
+            )
+        tree_hash = reader.read(TREE_HASH_BITS)
+
+        ranks: Ranks = {}
+        choices: Choices = {}
+        for node_id in self.node_order:
+            if not reader.read(1):
+                continue
+            rank = reader.read(RANK_BITS) if reader.read(1) else None
+            choice = reader.read(CHOICE_BITS) if reader.read(1) else None
+            if node_id not in self.nodes:
+                raise TalentBuildError(
+                    f"Talent export string selects node {node_id}, which isn't part of {self.wow_spec}'s trees."
+                )
+            node = self.nodes[node_id]
+            ranks[node_id] = node.max_rank if rank is None else rank
+            # the game marks some nodes as choice nodes that simc_support doesn't
+            if choice is not None:
+                choices[node_id] = choice
+        return ranks, choices, tree_hash
+
+    def encode(self, ranks: Ranks, choices: Choices, tree_hash: int = 0) -> str:
+        """WoW talent export string, the tree hash may be 0."""
+        writer = _BitWriter()
+        writer.write(SERIALIZATION_VERSION, VERSION_BITS)
+        writer.write(self.wow_spec.id, SPEC_BITS)
+        writer.write(tree_hash, TREE_HASH_BITS)
+        for node_id in self.node_order:
+            rank = ranks.get(node_id, 0)
+            writer.write(int(rank > 0), 1)
+            if rank < 1:
+                continue
+            node = self.nodes[node_id]
+            is_partial = rank < node.max_rank
+            writer.write(int(is_partial), 1)
+            if is_partial:
+                writer.write(rank, RANK_BITS)
+            is_choice = node.is_choice or node_id in choices
+            writer.write(int(is_choice), 1)
+            if is_choice:
+                writer.write(choices.get(node_id, 0), CHOICE_BITS)
+        return writer.get_string()
+
+    def parse_talent_list(
+        self, tree: str, talent_list: str
+    ) -> typing.Tuple[Ranks, Choices]:
+        """Ranks and choices of a class_talents or spec_talents list, e.g. 'talent_a:2/talent_b:1'.
+
+        Talents are given by simc name or talent id.
+        """
+        ranks: Ranks = {}
+        choices: Choices = {}
+        for entry in talent_list.split("#")[0].strip().split("/"):
+            try:
+                talent, rank = entry.split(":")
+                rank_value = int(rank)
+            except ValueError as e:
+                raise TalentBuildError(
+                    f"'{entry}' isn't of the form talent:rank."
+                ) from e
+            if rank_value < 1:
+                continue
+            for node in self.nodes.values():
+                if node.tree != tree:
+                    continue
+                if talent in node.talents:
+                    index = node.talents.index(talent)
+                elif talent.isdigit() and int(talent) in node.talent_ids:
+                    index = node.talent_ids.index(int(talent))
+                else:
+                    continue
+                if not node.is_free:
+                    ranks[node.id] = rank_value
+                    if node.is_choice:
+                        choices[node.id] = index
+                break
+            else:
+                raise TalentBuildError(
+                    f"Talent '{talent}' isn't part of {self.wow_spec}'s {tree}."
+                )
+        return ranks, choices
+
+    def get_errors(
+        self, ranks: Ranks, tree: typing.Optional[str] = None
+    ) -> typing.Dict[int, str]:
+        """Node id -> why the node breaks the rules, empty for valid builds. Only checks nodes of tree if given."""
+        spent_points: typing.Dict[typing.Tuple[str, int], int] = {}
+        for node_id, rank in ranks.items():
+            node = self.nodes[node_id]
+            for gate in self._gates:
+                if node.required_points < gate:
+                    key = (node.tree, gate)
+                    spent_points[key] = spent_points.get(key, 0) + rank
+
+        errors: typing.Dict[int, str] = {}
+        for node_id, rank in ranks.items():
+            node = self.nodes[node_id]
+            if tree is not None and node.tree != tree:
+                continue
+            name = self.get_talent_name(node_id, {})
+            if rank > node.max_rank:
+                errors[node_id] = f"'{name}' exceeds its max rank {node.max_rank}."
+            elif node.parent_ids and not any(
+                self.nodes[parent_id].is_free
+                or ranks.get(parent_id, 0) >= self.nodes[parent_id].max_rank
+                for parent_id in node.parent_ids
+            ):
+                errors[node_id] = f"'{name}' has no parent at max rank."
+            elif node.required_points and (
+                spent_points.get((node.tree, node.required_points), 0)
+                < node.required_points
+            ):
+                errors[node_id] = (
+                    f"'{name}' needs {node.required_points} points spent above its gate."
+                )
+        return errors
+
+
+@functools.lru_cache(maxsize=None)
+def get_talent_trees(wow_spec: WowSpec) -> TalentTrees:
+    return TalentTrees(wow_spec)
@@ -1,9 +1,10 @@
 import datetime
 import logging
-import subprocess
+import os
 
 from bloodytools.utils.config import Config
 from bloodytools.utils.profile_extraction import get_profile
+from bloodytools.utils.run_metadata import get_run_metadata
 from simc_support.game_data.WowSpec import WowSpec
 
 logger = logging.getLogger(__name__)
@@ -50,15 +51,7 @@ def create_base_json_dict(
             simc_hash=settings.simc_hash, simc_hash_short=settings.simc_hash[0:7]
         )
 
-    try:
-        bloodytools_hash = (
-            subprocess.check_output(["git", "log", "-1", "--format=oneline"])
-            .strip()
-            .decode()
-            .split(" ")[0]
-        )
-    except Exception:
-        bloodytools_hash = None
+    run_metadata = get_run_metadata(settings.executable)
 
     return {
         "data_type": "{}".format(data_type.lower().replace(" ", "_")),
@@ -79,8 +72,9 @@ def create_base_json_dict(
             "simc_hash": settings.simc_hash,
         },
         "metadata": {
-            "bloodytools": bloodytools_hash,
+            "bloodytools": run_metadata.bloodytools_hash,
             "SimulationCraft": settings.simc_hash,
+            "SimulationCraft_version": run_metadata.simc_version,
             "timestamp": str(datetime.datetime.utcnow()),
         },
         "data": {},
@@ -121,8 +115,10 @@ def tokenize_str(string: str) -> str:
     return string
 
 
-def logger_config(logger: logging.Logger, debug=False):
+def logger_config(logger: logging.Logger, debug=False, directory: str = ""):
     # logging to file and console
+    if directory:
+        os.makedirs(directory, exist_ok=True)
     logger.setLevel(logging.DEBUG)
 
     # console handler
@@ -135,7 +131,9 @@ def logger_config(logger: logging.Logger, debug=False):
     logger.addHandler(console_handler)
 
     # file handler
-    file_handler = logging.FileHandler("debug.log", "w", encoding="utf-8")
+    file_handler = logging.FileHandler(
+        os.path.join(directory, "debug.log"), "w", encoding="utf-8"
+    )
     file_handler.setLevel(logging.DEBUG)
     file_formatter = logging.Formatter(
         "%(asctime)s - %(filename)s / %(funcName)s:%(lineno)s - %(levelname)s - %(message)s"
@@ -144,7 +142,9 @@ def logger_config(logger: logging.Logger, debug=False):
     logger.addHandler(file_handler)
 
     # error file handler
-    error_handler = logging.FileHandler("error.log", "w", encoding="utf-8")
+    error_handler = logging.FileHandler(
+        os.path.join(directory, "error.log"), "w", encoding="utf-8"
+    )
     error_handler.setLevel(logging.ERROR)
     error_formatter = logging.Formatter(
         "%(asctime)s - %(filename)s / %(funcName)s:%(lineno)s - %(levelname)s - %(message)s"
@@ -0,0 +1,145 @@
+"""Simulate specs and fight styles in parallel worker processes.
+
+The parent process loads everything the simulators read, e.g. game data,
+the profile index, profiles and talent tree paths. Afterwards the workers
+are forked and share that data copy-on-write instead of loading it again.
+Each job runs all simulators of one spec and fight style in one worker.
+Jobs are handed to idle workers one by one, in the given order. The parent
+process records each finished job in the job history.
+
+Without fork, e.g. on Windows, workers are spawned and load the data
+themselves.
+
+Without threads, simc uses all cores. Workers then share the cores like
+autotune.tune_group does, instead of each starting a thread per core.
+"""
+
+import copy
+import datetime
+import logging
+import multiprocessing
+import typing
+
+from bloodytools.simulations import simulator_factory
+from bloodytools.simulations.simulator import (
+    MissingTalentTreePathFileError,
+    load_talent_tree_paths,
+)
+from bloodytools.utils import autotune, game_data, scratch
+from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import Job, get_job_key
+from bloodytools.utils.history import JobHistory, JobRecord
+from bloodytools.utils.profile_extraction import get_profile
+from bloodytools.utils.result_registry import ResultRegistry
+from bloodytools.utils.run_metadata import (
+    RunMetadata,
+    get_run_metadata,
+    set_run_metadata,
+)
+from simc_support.game_data.WowSpec import get_wow_spec
+
+logger = logging.getLogger(__name__)
+
+# settings of the run, set in each worker
+_config: typing.Optional[Config] = None
+
+
+def preload(config: Config) -> None:
+    """Load all input data of the run into the caches of this process."""
+    simulators = [
+        simulator_factory.get_simulator(simulator_name)
+        for simulator_name in config.simulator_type_names
+    ]
+    game_data.preload(config.wow_specs)
+    get_run_metadata(config.executable)
+
+    for wow_spec in config.wow_specs:
+        # e.g. the trinkets of the configured itemlevel range
+        for simulator in simulators:
+            simulator.preload(wow_spec, config)
+
+        try:
+            load_talent_tree_paths(wow_spec)
+        except MissingTalentTreePathFileError:
+            pass
+        for fight_style in config.fight_styles:
+            try:
+                get_profile(wow_spec, fight_style, config)
+            except FileNotFoundError:
+                # reported by main, the job fails on its own
+                pass
+
+
+def _init_worker(config: Config, run_metadata: RunMetadata, is_forked: bool) -> None:
+    global _config
+    _config = config
+    # job directories are removed on pool.terminate() and a terminated run as well
+    scratch.handle_sigterm()
+    set_run_metadata(config.executable, run_metadata)
+    if not is_forked:
+        preload(config)
+
+
+def _run_job(job: Job) -> typing.Tuple[Job, int, JobRecord]:
+    """Returns the job, the number of reused simulation results and the record of the job."""
+    # main imports this module
+    from bloodytools.main import run_simulators
+
+    assert _config is not None
+    wow_class_name, wow_spec_name, fight_style = job
+    result_registry = ResultRegistry()
+    record = run_simulators(
+        _config,
+        get_wow_spec(wow_class_name, wow_spec_name),
+        fight_style,
+        result_registry,
+    )
+    return job, result_registry.hits, record
+
+
+def run_worker_pool(
+    config: Config, jobs: typing.List[Job], job_history: JobHistory
+) -> int:
+    """Run jobs in config.workers processes and add them to job_history.
+
+    Returns:
+        int: number of reused simulation results
+    """
+    if not jobs:
+        return 0
+    preload(config)
+    workers = min(config.workers, len(jobs))
+
+    start_method = (
+        "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+    )
+    context = multiprocessing.get_context(start_method)
+    logger.info(
+        f"Running {len(jobs)} spec and fight style combinations in {workers} {start_method}ed workers."
+    )
+
+    worker_config = config
+    if not config.threads:
+        worker_config = copy.copy(config)
+        worker_config.threads = str(max(1, autotune.get_core_count() // workers))
+        logger.info(f"Each worker simulates with {worker_config.threads} threads.")
+
+    hits = 0
+    with context.Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(
+            worker_config,
+            get_run_metadata(config.executable),
+            start_method == "fork",
+        ),
+    ) as pool:
+        # one job at a time, jobs differ a lot in their duration
+        for job, job_hits, record in pool.imap_unordered(_run_job, jobs, chunksize=1):
+            hits += job_hits
+            job_history.add(get_job_key(job, config), record)
+            wow_class_name, wow_spec_name, fight_style = job
+            logger.info(
+                f"Finished {wow_spec_name} {wow_class_name} fighting {fight_style} in {datetime.timedelta(seconds=round(record.seconds))}."
+            )
+    return hits
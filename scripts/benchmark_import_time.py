@@ -0,0 +1,40 @@
+"""Measure how long starting bloodytools takes in a fresh interpreter.
+
+Run from the repository root: PYTHONPATH=. python scripts/benchmark_import_time.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+REPETITIONS = 5
+
+COMMANDS = {
+    "--help": [sys.executable, "-m", "bloodytools", "--help"],
+    "import main": [sys.executable, "-c", "import bloodytools.main"],
+    "get races simulator": [
+        sys.executable,
+        "-c",
+        "from bloodytools.simulations import simulator_factory; simulator_factory.get_simulator('races')",
+    ],
+    "get all simulators": [
+        sys.executable,
+        "-c",
+        "from bloodytools.simulations import simulator_factory; simulator_factory.list_simulators()",
+    ],
+}
+
+
+def main() -> None:
+    for name, command in COMMANDS.items():
+        durations = []
+        for _ in range(REPETITIONS):
+            start = time.perf_counter()
+            subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+            durations.append(time.perf_counter() - start)
+        print(f"{name}: {statistics.median(durations):.2f}s (median of {REPETITIONS})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Measure how long parsing all fallback profiles takes.
+
+Run from the repository root: PYTHONPATH=. python scripts/benchmark_profile_extraction.py
+"""
+
+import glob
+import os
+import time
+
+from bloodytools.utils import profile_extraction
+from simc_support.game_data.WowClass import WOWCLASSES, WowClass
+
+REPETITIONS = 20
+
+
+def _get_wow_class(path: str) -> WowClass:
+    """T30_Death_Knight_Frost.simc -> Death Knight"""
+    file_name = os.path.basename(path).replace("_", " ")
+    return max(
+        (wow_class for wow_class in WOWCLASSES if wow_class.full_name in file_name),
+        key=lambda wow_class: len(wow_class.full_name),
+    )
+
+
+def main() -> None:
+    paths = sorted(glob.glob("fallback_profiles/**/*.simc", recursive=True))
+    wow_classes = [_get_wow_class(path) for path in paths]
+
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        for path, wow_class in zip(paths, wow_classes):
+            profile_extraction._parse_profile(path, wow_class)
+    parsing = (time.perf_counter() - start) / REPETITIONS
+
+    start = time.perf_counter()
+    for _ in range(REPETITIONS):
+        for path, wow_class in zip(paths, wow_classes):
+            profile_extraction.extract_profile(path, wow_class)
+    cached = (time.perf_counter() - start) / REPETITIONS
+
+    print(f"Parsed {len(paths)} profiles in {parsing * 1000:.2f}ms.")
+    print(f"Extracted {len(paths)} cached profiles in {cached * 1000:.2f}ms.")
+
+
+if __name__ == "__main__":
+    main()
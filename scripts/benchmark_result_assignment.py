@@ -0,0 +1,43 @@
+"""Measure how long assigning profileset results to a Simulation_Group takes.
+
+Run from the repository root: PYTHONPATH=. python scripts/benchmark_result_assignment.py
+"""
+
+import time
+
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+
+PROFILES = 50_000
+
+
+def main() -> None:
+    start = time.perf_counter()
+    group = Simulation_Group(name="benchmark", executable="simc")
+    for i in range(PROFILES):
+        group.add(Simulation_Data(name=f"profile {i}", executable="simc"))
+    creation = time.perf_counter() - start
+
+    json_data = {
+        "sim": {
+            "players": [
+                {"name": "profile 0", "collected_data": {"dps": {"mean": 100.0}}}
+            ],
+            "profilesets": {
+                "results": [
+                    {"name": f"profile {i}", "mean": 100.0 + i}
+                    for i in range(1, PROFILES)
+                ]
+            },
+        }
+    }
+
+    start = time.perf_counter()
+    group.set_json_data(json_data)
+    assignment = time.perf_counter() - start
+
+    print(f"Created {PROFILES} profiles in {creation:.2f}s.")
+    print(f"Assigned {PROFILES} results in {assignment:.2f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import dataclasses
 from simc_support.game_data import WowSpec
 from bloodytools.main import main
+from bloodytools.simulations import simulator_factory
 import unittest
 
 DONT_TEST = (
@@ -42,17 +43,26 @@ class ParsedInput:
     executable: str
     target_error: str
     all: bool = False
+    autotune: bool = False
     custom_apl: bool = False
     custom_fight_style: bool = False
     custom_profile: bool = False
     debug: bool = False
+    fuse: bool = False
     keep_files: bool = False
+    metrics: str = ""
+    pipeline: bool = False
+    plan: str = ""
+    scratch_directory: str = ""
+    log_directory: str = ""
     pretty: bool = False
     ptr: bool = False
     raidbots: bool = False
     profileset_work_threads: str = ""
     single_sim: str = ""
+    talent_screening: bool = False
     threads: str = ""
+    workers: int = 0
 
 
 class TestAll(unittest.TestCase):
@@ -63,6 +73,14 @@ class TestAll(unittest.TestCase):
 
         self.args = ParsedInput(target_error="1.0", executable="../simc/simc.exe")
 
+    def test_simulator_names(self):
+        for simulator_name in simulator_factory.list_simulator_names():
+            with self.subTest(simulator_name=simulator_name):
+                self.assertEqual(
+                    simulator_factory.get_simulator(simulator_name).snake_case_name(),
+                    simulator_name,
+                )
+
     def test_races(self):
         for spec in self.specs:
             with self.subTest(spec=spec):
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# print the modules loaded by parsing the arguments, e.g. for --help
+SCRIPT = """
+import json
+import sys
+
+sys.argv = ["bloodytools", "--help"]
+from bloodytools.utils.args import arg_parse_config
+
+try:
+    arg_parse_config()
+except SystemExit:
+    pass
+json.dump(sorted(sys.modules), sys.stderr)
+"""
+
+HEAVY_MODULES = ("requests", "yaml", "pkg_resources", "simc_support")
+
+
+class TestArgs(unittest.TestCase):
+    def test_help_doesnt_import_simulators(self) -> None:
+        # a fresh interpreter, other tests already imported everything
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            check=True,
+        )
+        modules = json.loads(result.stderr)
+
+        # the help lists the simulators by name
+        self.assertIn("talent_interactions", result.stdout.decode())
+        for name in HEAVY_MODULES:
+            self.assertNotIn(name, modules)
+        self.assertEqual(
+            [name for name in modules if name.startswith("bloodytools.simulations.")],
+            ["bloodytools.simulations.factory"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+import datetime
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.secondary_distribution_simulator import (
+    SecondaryDistributionSimulator,
+)
+from bloodytools.simulations.simulator import FUSED_GROUP_PREFIX
+from bloodytools.utils import autotune
+from bloodytools.utils.config import Config
+from bloodytools.utils.history import RuntimeHistory
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.WowSpec import get_wow_spec
+
+
+class TestTuneGroup(unittest.TestCase):
+    def test_few_profilesets_share_threads(self) -> None:
+        tuned = autotune.tune_group(3, 60000, 0.1, 16)
+        self.assertEqual(tuned.threads, 16)
+        self.assertEqual(tuned.profileset_work_threads, 5)
+
+    def test_workers_share_cores(self) -> None:
+        tuned = autotune.tune_group(100, 60000, 0.1, 16, workers=4)
+        self.assertEqual(tuned.threads, 4)
+        self.assertEqual(tuned.profileset_work_threads, 2)
+
+    def test_work_threads_fit_into_threads(self) -> None:
+        tuned = autotune.tune_group(100, 60000, 0.1, 1)
+        self.assertEqual(tuned.threads, 1)
+        self.assertEqual(tuned.profileset_work_threads, 1)
+
+    def test_short_profilesets(self) -> None:
+        self.assertEqual(
+            autotune.tune_group(100, 60000, 0.3, 16).profileset_work_threads, 1
+        )
+        self.assertEqual(
+            autotune.tune_group(None, 1000, None, 16).profileset_work_threads, 1
+        )
+
+    def test_history_wins(self) -> None:
+        tuned = autotune.tune_group(
+            100, 60000, 0.1, 16, thread_seconds_per_profileset=1.0
+        )
+        self.assertEqual(tuned.profileset_work_threads, 1)
+        tuned = autotune.tune_group(
+            100, 60000, 0.3, 16, thread_seconds_per_profileset=60.0
+        )
+        self.assertEqual(tuned.profileset_work_threads, 2)
+
+    def test_tune_workers(self) -> None:
+        self.assertEqual(autotune.tune_workers(2, 32), 2)
+        self.assertEqual(autotune.tune_workers(40, 32), 8)
+        self.assertEqual(autotune.tune_workers(40, 2), 1)
+
+
+class TestRuntimeHistory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "history.json")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_moving_average_is_persisted(self) -> None:
+        history = RuntimeHistory(self.path)
+        self.assertIsNone(history.get("races"))
+        history.add("races", 10.0)
+        history.add("races", 20.0)
+        self.assertAlmostEqual(RuntimeHistory(self.path).get("races") or 0.0, 13.0)
+
+    def test_broken_file_is_ignored(self) -> None:
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertIsNone(RuntimeHistory(self.path).get("races"))
+
+
+class TestSimulatorAutotune(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.simulator = SecondaryDistributionSimulator(
+            wow_spec=get_wow_spec("druid", "feral"),
+            fight_style="patchwerk",
+            settings=Config(
+                autotune=True,
+                threads="",
+                runtime_history=os.path.join(self.directory.name, "history.json"),
+            ),
+        )
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _create_streamed_group(
+        self, name: str = "simulation_group"
+    ) -> Simulation_Group:
+        simulation_group = self.simulator._create_simulation_group(name)
+        simulation_group.add_stream(
+            Simulation_Data(
+                name=f"profile {i}",
+                iterations="1000",
+                target_error="1.0",
+                simc_arguments=[f"talents={i}"],
+            )
+            for i in range(4)
+        )
+        return simulation_group
+
+    def _fake_simulate(self, simulation_group: Simulation_Group) -> None:
+        def simulate() -> bool:
+            # fake simc run: 3 profilesets in 6 seconds
+            simulation_group.sg_simulation_start_time = datetime.datetime(2024, 1, 1)
+            simulation_group.sg_simulation_end_time = datetime.datetime(
+                2024, 1, 1, 0, 0, 6
+            )
+            simulation_group.json_data = {
+                "sim": {
+                    "profilesets": {
+                        "results": [{"name": f"profile {i}"} for i in range(1, 4)]
+                    }
+                }
+            }
+            return True
+
+        simulation_group.simulate = simulate  # type: ignore
+
+    def _get_runtime(self, simulation_group: Simulation_Group) -> float:
+        return (
+            RuntimeHistory(self.simulator.settings.runtime_history).get(
+                self.simulator.get_runtime_history_key(simulation_group)
+            )
+            or 0.0
+        )
+
+    def test_streamed_group(self) -> None:
+        simulation_group = self._create_streamed_group()
+        self.assertEqual(len(simulation_group.profiles), 1)
+        self._fake_simulate(simulation_group)
+        simulate = simulation_group.simulate
+
+        def tuned_simulate() -> bool:
+            self.assertNotEqual(simulation_group.threads, "")
+            simulation_group.threads = "2"
+            return simulate()
+
+        simulation_group.simulate = tuned_simulate  # type: ignore
+        self.simulator._simulate(simulation_group)
+
+        self.assertEqual(self.simulator.simulated_profilesets, 3)
+        # 6 seconds * 2 threads / 3 profilesets
+        self.assertAlmostEqual(self._get_runtime(simulation_group), 4.0)
+
+    def test_runtime_without_autotune(self) -> None:
+        self.simulator.settings.autotune = False
+        simulation_group = self._create_streamed_group()
+        self._fake_simulate(simulation_group)
+        with mock.patch.object(autotune, "get_core_count", return_value=8):
+            self.simulator._simulate(simulation_group)
+
+        # threads="" uses all 8 cores
+        self.assertEqual(simulation_group.threads, "")
+        self.assertAlmostEqual(self._get_runtime(simulation_group), 16.0)
+
+    def test_fused_groups_are_kept_apart(self) -> None:
+        simulation_group = self._create_streamed_group()
+        fused_group = self._create_streamed_group(
+            FUSED_GROUP_PREFIX + "races+secondary_distributions"
+        )
+        self.assertNotEqual(
+            self.simulator.get_runtime_history_key(simulation_group),
+            self.simulator.get_runtime_history_key(fused_group),
+        )
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import (
+    CostModel,
+    get_job_key,
+    get_jobs,
+    order_longest_first,
+    project_duration,
+)
+from bloodytools.utils.history import JobHistory, JobRecord
+
+
+class TestCostModel(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.history = JobHistory(os.path.join(self.directory.name, "jobs.json"))
+        self.config = Config(
+            wow_class_spec_names=[("druid", "feral"), ("druid", "balance")],
+            fight_styles=["patchwerk", "hecticaddcleave"],
+            simulator_type_names=["races", "secondary_distributions"],
+        )
+        self.jobs = get_jobs(self.config)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_without_history_order_is_kept(self) -> None:
+        estimates = CostModel(self.history, self.config).estimate_all(self.jobs)
+        self.assertEqual(order_longest_first(self.jobs, estimates), self.jobs)
+        self.assertEqual(project_duration(self.jobs, estimates, 2), 0.0)
+
+    def test_longest_first(self) -> None:
+        feral_hectic = ("druid", "feral", "hecticaddcleave")
+        self.history.add(get_job_key(feral_hectic, self.config), JobRecord(100.0))
+        self.history.add(
+            get_job_key(("druid", "feral", "patchwerk"), self.config), JobRecord(10.0)
+        )
+        model = CostModel(JobHistory(self.history.path), self.config)
+        # the same job of another spec
+        self.assertEqual(model.estimate(("druid", "balance", "hecticaddcleave")), 100.0)
+
+        estimates = model.estimate_all(self.jobs)
+        ordered = order_longest_first(self.jobs, estimates)
+        self.assertEqual(
+            [job[2] for job in ordered],
+            ["hecticaddcleave", "hecticaddcleave", "patchwerk", "patchwerk"],
+        )
+        self.assertEqual(project_duration(ordered, estimates, 2), 110.0)
+        self.assertEqual(project_duration(ordered, estimates, 1), 220.0)
+
+    def test_key_depends_on_simulators(self) -> None:
+        job = self.jobs[0]
+        self.history.add(get_job_key(job, self.config), JobRecord(100.0))
+        other_config = Config(simulator_type_names=["races"])
+        model = CostModel(JobHistory(self.history.path), other_config)
+        self.assertIsNone(model.estimate(job))
+
+    def test_other_precision_is_scaled(self) -> None:
+        job = self.jobs[0]
+        precise_config = Config(
+            wow_class_spec_names=self.config.wow_class_spec_names,
+            fight_styles=self.config.fight_styles,
+            simulator_type_names=self.config.simulator_type_names,
+            iterations="60000",
+        )
+        precise_config.target_error["patchwerk"] = "0.2"
+        # 10 profilesets with 4000 iterations each
+        self.history.add(get_job_key(job, precise_config), JobRecord(100.0, 10, 40000))
+        history = JobHistory(self.history.path)
+
+        # half the target_error needs 4 times the iterations
+        precise_config.target_error["patchwerk"] = "0.1"
+        self.assertAlmostEqual(
+            CostModel(history, precise_config).estimate(job) or 0.0, 400.0
+        )
+        # but no more than the configured iterations
+        precise_config.target_error["patchwerk"] = "0.01"
+        self.assertAlmostEqual(
+            CostModel(history, precise_config).estimate(job) or 0.0, 1500.0
+        )
+        # the same job of another spec at another precision
+        self.assertAlmostEqual(
+            CostModel(history, precise_config).estimate(("druid", "balance", job[2]))
+            or 0.0,
+            1500.0,
+        )
+
+    def test_capped_records_are_clamped(self) -> None:
+        job = self.jobs[0]
+        config = Config(simulator_type_names=self.config.simulator_type_names)
+        config.target_error["patchwerk"] = "0.2"
+        config.iterations = "60000"
+        # all 10 profilesets stopped at the configured iterations
+        self.history.add(get_job_key(job, config), JobRecord(100.0, 10, 600000))
+        history = JobHistory(self.history.path)
+
+        config.target_error["patchwerk"] = "0.15"
+        config.iterations = "240000"
+        self.assertAlmostEqual(CostModel(history, config).estimate(job) or 0.0, 400.0)
+        # a looser target_error is still scaled down
+        config.target_error["patchwerk"] = "0.4"
+        self.assertAlmostEqual(CostModel(history, config).estimate(job) or 0.0, 25.0)
+
+    def test_records_are_averaged(self) -> None:
+        self.history.add("job", JobRecord(10.0, 100, 1000))
+        self.history.add("job", JobRecord(20.0, 100, 2000))
+        self.assertEqual(
+            JobHistory(self.history.path).get("job"), JobRecord(13.0, 100.0, 1300.0)
+        )
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import typing
+import unittest
+
+from bloodytools.utils import file_cache
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self) -> None:
+        file_cache.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "profile.simc")
+        self._write("level=70\n")
+        # paths read by _load
+        self.loaded: typing.List[str] = []
+
+    def tearDown(self) -> None:
+        file_cache.clear()
+        self.directory.cleanup()
+
+    def _write(self, content: str, mtime_ns: typing.Optional[int] = None) -> None:
+        with open(self.path, "w") as f:
+            f.write(content)
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def _load(self, path: str, suffix: str = "") -> str:
+        self.loaded.append(path)
+        return file_cache._read_text(path) + suffix
+
+    def test_unchanged_file_is_loaded_once(self) -> None:
+        first = file_cache.load(self.path, self._load)
+        self.assertIs(file_cache.load(self.path, self._load), first)
+        # relative and absolute paths share the entry
+        relative_path = os.path.relpath(self.path)
+        self.assertIs(file_cache.load(relative_path, self._load), first)
+        self.assertEqual(self.loaded, [self.path])
+
+    def test_arguments_are_cached_apart(self) -> None:
+        self.assertEqual(file_cache.load(self.path, self._load, "a"), "level=70\na")
+        self.assertEqual(file_cache.load(self.path, self._load, "b"), "level=70\nb")
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_changed_mtime_reloads(self) -> None:
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        file_cache.load(self.path, self._load)
+        # same size, only the modification time tells them apart
+        self._write("level=60\n", mtime_ns + 1_000_000_000)
+        self.assertEqual(file_cache.load(self.path, self._load), "level=60\n")
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_changed_size_reloads(self) -> None:
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        file_cache.load(self.path, self._load)
+        # same modification time, e.g. on file systems with coarse timestamps
+        self._write("level=70\nrace=orc\n", mtime_ns)
+        self.assertEqual(file_cache.load(self.path, self._load), "level=70\nrace=orc\n")
+        self.assertEqual(len(self.loaded), 2)
+
+    def test_missing_file(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            file_cache.read_text(os.path.join(self.directory.name, "missing.simc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
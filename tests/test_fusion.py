@@ -0,0 +1,132 @@
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.fusion import (
+    FusedRun,
+    is_fusable,
+    prepare_fused,
+    simulate_fused,
+)
+from bloodytools.simulations.race_simulator import RaceSimulator
+from bloodytools.simulations.simulator import FUSED_GROUP_PREFIX, Simulator
+from bloodytools.simulations.talent_interaction_simulator import (
+    TalentInteractionSimulator,
+)
+from bloodytools.simulations.trinket_simulator import TrinketSimulator
+from bloodytools.utils.config import Config
+from bloodytools.utils.data_type import DataType
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.WowSpec import get_wow_spec
+
+# fused profile name -> dps
+DPS = {
+    "races::baseline": 100000,
+    "races::troll": 100100,
+    "trinkets::baseline": 100000,
+    "trinkets::Trinket of Doom": 100500,
+}
+
+
+def _create_group(*profiles: typing.Tuple[str, typing.List[str]]) -> Simulation_Group:
+    simulation_group = Simulation_Group()
+    for name, simc_arguments in profiles:
+        simulation_group.add(Simulation_Data(name=name, simc_arguments=simc_arguments))
+    return simulation_group
+
+
+class TestFusion(unittest.TestCase):
+    def setUp(self) -> None:
+        wow_spec = get_wow_spec("druid", "feral")
+        settings = Config()
+        self.races = RaceSimulator(wow_spec, "patchwerk", settings)
+        self.trinkets = TrinketSimulator(wow_spec, "patchwerk", settings)
+        # profile names of each simulated group
+        self.simulated: typing.List[typing.List[str]] = []
+
+    def _simulate(self, simulation_group: Simulation_Group) -> bool:
+        self.simulated.append([profile.name for profile in simulation_group.profiles])
+        for profile in simulation_group.profiles:
+            profile.set_dps(DPS.get(profile.name, 1), external=False)
+        simulation_group.json_data = {"name": simulation_group.name}
+        return True
+
+    def _prepare(
+        self, prepared: typing.List[typing.Tuple[Simulator, Simulation_Group]]
+    ) -> FusedRun:
+        groups = {id(simulator): group for simulator, group in prepared}
+        with mock.patch.object(Simulator, "prepare", autospec=True) as prepare:
+            prepare.side_effect = lambda simulator: ({}, groups[id(simulator)])
+            return prepare_fused([simulator for simulator, _ in prepared])
+
+    def test_is_fusable(self) -> None:
+        self.assertTrue(is_fusable(self.races))
+        self.assertFalse(
+            is_fusable(
+                TalentInteractionSimulator(
+                    get_wow_spec("druid", "feral"), "patchwerk", Config()
+                )
+            )
+        )
+
+    def test_incompatible_groups_are_separate(self) -> None:
+        races = _create_group(("baseline", ["race=orc"]), ("troll", ["race=troll"]))
+        # the trinket would inherit race=orc from the merged base actor
+        trinkets = _create_group(
+            ("baseline", ["race=orc"]),
+            ("Trinket of Doom", ["trinket1=,id=1"]),
+        )
+        fused_run = self._prepare([(self.races, races), (self.trinkets, trinkets)])
+        self.assertEqual(fused_run.fused, [])
+        self.assertEqual(
+            [simulator for simulator, _, _ in fused_run.separate],
+            [self.races, self.trinkets],
+        )
+
+    def test_results_are_split(self) -> None:
+        races = _create_group(("baseline", ["race=orc"]), ("troll", ["race=troll"]))
+        trinkets = _create_group(
+            ("baseline", ["race=orc"]),
+            ("Trinket of Doom", ["race=orc", "trinket1=,id=1"]),
+        )
+        fused_run = self._prepare([(self.races, races), (self.trinkets, trinkets)])
+        self.assertEqual(len(fused_run.fused), 2)
+
+        with mock.patch.object(
+            Simulation_Group, "simulate", autospec=True, side_effect=self._simulate
+        ):
+            simulate_fused(fused_run)
+
+        # one run, profile names namespaced by the simulator
+        self.assertEqual(self.simulated, [list(DPS)])
+        self.assertEqual(
+            races.json_data, {"name": FUSED_GROUP_PREFIX + "races+trinkets"}
+        )
+        self.assertIs(trinkets.json_data, races.json_data)
+
+        self.assertEqual(
+            self.races._collect_data(races, DataType.DPS),
+            {"baseline": 100000, "troll": 100100},
+        )
+        self.assertEqual(
+            self.trinkets._collect_data(trinkets, DataType.DPS),
+            {"baseline": 100000, "Trinket of Doom": 100500},
+        )
+
+    def test_names_are_restored_on_errors(self) -> None:
+        races = _create_group(("baseline", ["race=orc"]), ("troll", ["race=troll"]))
+        trinkets = _create_group(("baseline", ["race=orc"]), ("human", ["race=human"]))
+        fused_run = self._prepare([(self.races, races), (self.trinkets, trinkets)])
+
+        with mock.patch.object(
+            Simulation_Group, "simulate", autospec=True, side_effect=RuntimeError
+        ):
+            with self.assertRaises(RuntimeError):
+                simulate_fused(fused_run)
+
+        self.assertEqual([p.name for p in races.profiles], ["baseline", "troll"])
+        self.assertEqual([p.name for p in trinkets.profiles], ["baseline", "human"])
+
+
+if __name__ == "__main__":
+    unittest.main()
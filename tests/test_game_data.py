@@ -0,0 +1,63 @@
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.trinket_pair_simulator import TrinketPairSimulator
+from bloodytools.simulations.trinket_simulator import (
+    TrinketSimulator,
+    _get_trinkets,
+    _select_trinkets,
+)
+from bloodytools.utils import game_data
+from bloodytools.utils.config import Config
+from simc_support.game_data.Trinket import get_trinkets_for_spec
+from simc_support.game_data.WowSpec import get_wow_spec
+
+
+class TestGameData(unittest.TestCase):
+    def setUp(self) -> None:
+        game_data.get_trinkets_for_spec.cache_clear()
+        _select_trinkets.cache_clear()
+        self.feral = get_wow_spec("druid", "feral")
+        self.balance = get_wow_spec("druid", "balance")
+
+    def tearDown(self) -> None:
+        game_data.get_trinkets_for_spec.cache_clear()
+        _select_trinkets.cache_clear()
+
+    def test_trinkets_are_queried_once_per_spec(self) -> None:
+        with mock.patch(
+            "bloodytools.utils.game_data.Trinket.get_trinkets_for_spec",
+            wraps=get_trinkets_for_spec,
+        ) as query:
+            game_data.preload([self.feral, self.balance])
+            trinkets = game_data.get_trinkets_for_spec(self.feral)
+            self.assertIs(game_data.get_trinkets_for_spec(self.feral), trinkets)
+
+        self.assertEqual(
+            query.call_args_list, [mock.call(self.feral), mock.call(self.balance)]
+        )
+        self.assertEqual(trinkets, get_trinkets_for_spec(self.feral))
+
+    def test_selection_is_cached_per_itemlevel_range(self) -> None:
+        settings = Config()
+        # both trinket simulators share the selection of the configured range
+        TrinketSimulator.preload(self.feral, settings)
+        TrinketPairSimulator.preload(self.feral, settings)
+        self.assertEqual(_select_trinkets.cache_info().misses, 1)
+
+        trinkets = _get_trinkets(self.feral, settings)
+        self.assertEqual(_select_trinkets.cache_info().misses, 1)
+        self.assertEqual(
+            trinkets,
+            list(
+                _select_trinkets(self.feral, settings.min_ilevel, settings.max_ilevel)
+            ),
+        )
+
+        settings.max_ilevel = settings.min_ilevel
+        _get_trinkets(self.feral, settings)
+        self.assertEqual(_select_trinkets.cache_info().misses, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
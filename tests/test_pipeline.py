@@ -0,0 +1,129 @@
+import os
+import tempfile
+import threading
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.pipeline import Task, run_pipelined
+from bloodytools.utils import scratch
+from bloodytools.utils.config import Config
+from bloodytools.utils.result_registry import ResultRegistry
+
+JOBS = [("druid", "feral", "patchwerk"), ("druid", "balance", "patchwerk")]
+
+
+class FakeTask(Task):
+    """Records its stages instead of simulating."""
+
+    def __init__(
+        self,
+        name: str,
+        events: typing.List[typing.Tuple[str, str, str]],
+        failing_stage: str = "",
+        error: typing.Type[BaseException] = ValueError,
+    ) -> None:
+        super().__init__([])
+        self.name = name
+        self.events = events
+        self.failing_stage = failing_stage
+        self.error = error
+
+    def _record(self, stage: str) -> None:
+        self.events.append((stage, self.name, threading.current_thread().name))
+        self.seconds += 1.0
+        if stage == self.failing_stage:
+            raise self.error(self.name)
+
+    def prepare(self) -> None:
+        self._record("prepare")
+
+    def simulate(self) -> None:
+        self._record("simulate")
+
+    def finish(self) -> None:
+        self._record("finish")
+
+
+class TestRunPipelined(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = Config(scratch_directory=self.directory.name)
+        # (stage, task name, thread name)
+        self.events: typing.List[typing.Tuple[str, str, str]] = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _create_tasks(
+        self, failing: str = "", error: typing.Type[BaseException] = ValueError
+    ) -> typing.List[typing.List[Task]]:
+        """Two tasks per job. The failing "<stage> <task name>" raises error."""
+        failing_stage, _, failing_name = failing.partition(" ")
+        return [
+            [
+                FakeTask(
+                    name,
+                    self.events,
+                    failing_stage if name == failing_name else "",
+                    error,
+                )
+                for name in (f"{spec} a", f"{spec} b")
+            ]
+            for _, spec, _ in JOBS
+        ]
+
+    def _run(self, job_tasks: typing.List[typing.List[Task]]) -> dict:
+        with mock.patch("bloodytools.pipeline.create_tasks", side_effect=job_tasks):
+            with scratch.run_directory(self.config) as run_directory:
+                try:
+                    return run_pipelined(self.config, JOBS, ResultRegistry())
+                finally:
+                    # all job directories are removed, even after errors
+                    self.assertEqual(os.listdir(run_directory), [])
+
+    def _get_events(self, stage: str) -> typing.List[str]:
+        return [name for event_stage, name, _ in self.events if event_stage == stage]
+
+    def test_stages_keep_the_order_of_tasks(self) -> None:
+        records = self._run(self._create_tasks())
+
+        names = ["feral a", "feral b", "balance a", "balance b"]
+        for stage in ("prepare", "simulate", "finish"):
+            self.assertEqual(self._get_events(stage), names)
+        for name in names:
+            stages = [
+                stage for stage, event_name, _ in self.events if event_name == name
+            ]
+            self.assertEqual(stages, ["prepare", "simulate", "finish"])
+
+        # simc runs in the calling thread, Python work next to it
+        threads = {stage: thread for stage, _, thread in self.events}
+        self.assertEqual(threads["prepare"], "prepare")
+        self.assertEqual(threads["simulate"], threading.current_thread().name)
+        self.assertEqual(threads["finish"], "finish")
+
+        self.assertEqual(list(records), JOBS)
+        self.assertEqual([record.seconds for record in records.values()], [6.0, 6.0])
+
+    def test_prepare_error_is_raised(self) -> None:
+        with self.assertRaisesRegex(ValueError, "feral b"):
+            self._run(self._create_tasks("prepare feral b"))
+        self.assertNotIn("balance a", self._get_events("prepare"))
+        self.assertNotIn("feral b", self._get_events("simulate"))
+
+    def test_simulate_error_is_raised(self) -> None:
+        with self.assertRaises(KeyboardInterrupt):
+            self._run(self._create_tasks("simulate feral a", KeyboardInterrupt))
+        self.assertEqual(self._get_events("simulate"), ["feral a"])
+        self.assertEqual(self._get_events("finish"), [])
+
+    def test_finish_error_is_raised(self) -> None:
+        with self.assertRaisesRegex(ValueError, "feral a"):
+            self._run(self._create_tasks("finish feral a"))
+        self.assertEqual(self._get_events("finish"), ["feral a"])
+        self.assertNotIn("balance b", self._get_events("simulate"))
+
+
+if __name__ == "__main__":
+    unittest.main()
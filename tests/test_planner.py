@@ -0,0 +1,53 @@
+import unittest
+
+from bloodytools.planner import PlannedRun, _estimate_core_hours_from_job
+from bloodytools.utils.simulation_objects import PlannedSimulation
+
+
+def _create_run(simulator: str, profiles: int, missing: str = "") -> PlannedRun:
+    return PlannedRun(
+        simulator=simulator,
+        wow_class="druid",
+        wow_spec="feral",
+        fight_style="patchwerk",
+        simulation=PlannedSimulation(
+            name="simulation_group",
+            profiles=profiles,
+            iterations="60000",
+            target_error="0.1",
+            input_size=0,
+        ),
+        core_hours_missing=missing,
+    )
+
+
+class TestCoreHours(unittest.TestCase):
+    def test_job_history_fills_missing_runs(self) -> None:
+        known = _create_run("races", 11)
+        known.core_hours = 1.0
+        known.core_hours_source = "runtime history"
+        first = _create_run("trinkets", 31, "no runtime history")
+        second = _create_run("talent_addition", 11, "no runtime history")
+        single = _create_run("secondary_distributions", 1, "no profilesets")
+
+        # 1800 seconds on 8 threads, 4 core hours
+        _estimate_core_hours_from_job([known, first, second, single], 1800.0, 8)
+
+        self.assertEqual(known.core_hours, 1.0)
+        # the remaining 3 core hours by 30 and 10 profilesets
+        self.assertAlmostEqual(first.core_hours or 0.0, 2.25)
+        self.assertAlmostEqual(second.core_hours or 0.0, 0.75)
+        self.assertEqual(first.core_hours_source, "job history")
+        self.assertEqual(first.core_hours_missing, "")
+        self.assertIsNone(single.core_hours)
+        self.assertEqual(single.core_hours_missing, "no profilesets")
+
+    def test_without_job_history(self) -> None:
+        run = _create_run("trinkets", 31, "no runtime history")
+        _estimate_core_hours_from_job([run], None, 8)
+        self.assertIsNone(run.core_hours)
+        self.assertEqual(run.core_hours_missing, "no runtime history or job history")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import os
+import tempfile
+import unittest
+
+from bloodytools.utils import file_cache
+from bloodytools.utils.profile_extraction import (
+    EmptyFileError,
+    IncompleteProfileError,
+    ProfileIndex,
+    extract_profile,
+)
+from simc_support.game_data.WowClass import WOWCLASSES
+from simc_support.game_data.WowSpec import get_wow_spec
+
+PROFILE = """warrior="T30_Warrior_Fury"
+level=70
+  race=orc
+race="human"
+# spec=arms
+spec='fury'
+role=attack
+set_bonus=tier30_2pc=1
+set_bonus="tier29_4pc"=1
+set_bonus=tier31_2pc=1
+head=helm,id=1,bonus_id=2/3,enchant=x.y,id=4
+head=,ilevel=447,gem_id="5"
+shoulder=,id=6,enchant_id=7:8,crafted_stats=36/49,drop_level=70
+spec_talents=a:1/b:2
+
+main_hand=
+"""
+
+
+class TestExtractProfile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wow_class = WOWCLASSES[0]
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "profile.simc")
+        file_cache.clear()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        file_cache.clear()
+
+    def _write(self, content: str) -> None:
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    def test_extract_profile(self):
+        self._write(PROFILE)
+
+        self.assertEqual(
+            extract_profile(self.path, self.wow_class),
+            {
+                "character": {
+                    "class": self.wow_class.simc_name,
+                    "level": "70",
+                    "race": "human",
+                    "spec": "fury",
+                    "role": "attack",
+                    "set_bonus=tier30_2pc": "1",
+                    "set_bonus=tier29_4pc": "1",
+                    "spec_talents": "a:1/b:2",
+                },
+                "items": {
+                    "head": {
+                        "id": "1",
+                        "bonus_id": "2/3",
+                        "enchant": "x",
+                        "ilevel": "447",
+                        "gem_id": "5",
+                    },
+                    "shoulders": {
+                        "id": "6",
+                        "enchant_id": "7:8",
+                        "crafted_stats": "36/49",
+                        "drop_level": "70",
+                    },
+                    "main_hand": {},
+                },
+            },
+        )
+
+    def test_empty_file(self):
+        for content in ("", "\n  \n"):
+            self._write(content)
+            with self.assertRaises(EmptyFileError):
+                extract_profile(self.path, self.wow_class)
+
+    def test_incomplete_profile(self):
+        self._write("level=70\nrace=orc\n")
+        with self.assertRaises(IncompleteProfileError):
+            extract_profile(self.path, self.wow_class)
+
+    def test_cache(self):
+        self._write(PROFILE)
+        profile = extract_profile(self.path, self.wow_class)
+
+        # modifications don't reach the cache
+        profile["items"].clear()
+        self.assertNotEqual(extract_profile(self.path, self.wow_class), profile)
+
+        # changed files are parsed again
+        self._write(PROFILE.replace("level=70", "level=100"))
+        self.assertEqual(
+            extract_profile(self.path, self.wow_class)["character"]["level"], "100"
+        )
+
+
+class TestProfileIndex(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.executable = os.path.join(self.directory.name, "simc")
+        tier_directory = os.path.join(self.directory.name, "profiles", "Tier30")
+        os.makedirs(tier_directory)
+        with open(os.path.join(tier_directory, "T30_Warrior_Fury.simc"), "w") as f:
+            f.write(PROFILE)
+
+        self.fury = get_wow_spec("warrior", "fury")
+        self.frost = get_wow_spec("death_knight", "frost")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_paths(self):
+        profile_index = ProfileIndex(self.executable)
+
+        self.assertEqual(
+            profile_index.get_simc_profile_path(self.fury, "30"),
+            os.path.join(
+                self.directory.name, "profiles", "Tier30", "T30_Warrior_Fury.simc"
+            ),
+        )
+        self.assertIsNone(profile_index.get_simc_profile_path(self.frost, "30"))
+        self.assertIsNotNone(
+            profile_index.get_fallback_profile_path(
+                self.frost, "30", "castingpatchwerk3"
+            )
+        )
+        self.assertIsNone(
+            profile_index.get_fallback_profile_path(self.fury, "30", "unknown")
+        )
+
+    def test_get_missing_profiles(self):
+        profile_index = ProfileIndex(self.executable)
+
+        self.assertEqual(
+            profile_index.get_missing_profiles(
+                [self.fury, self.frost], "30", ["castingpatchwerk3", "unknown"]
+            ),
+            [(self.frost, "unknown")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
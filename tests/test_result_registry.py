@@ -0,0 +1,130 @@
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.race_simulator import RaceSimulator
+from bloodytools.simulations.simulator import Simulator
+from bloodytools.simulations.trinket_simulator import TrinketSimulator
+from bloodytools.utils.config import Config
+from bloodytools.utils.data_type import DataType
+from bloodytools.utils.result_registry import ResultRegistry
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.WowSpec import get_wow_spec
+
+
+def _create_report(dps: typing.Dict[str, int]) -> dict:
+    """simc report with the first profile as base actor and all others as profilesets."""
+    (base_name, base_dps), *profilesets = dps.items()
+    return {
+        "sim": {
+            "players": [
+                {"name": base_name, "collected_data": {"dps": {"mean": base_dps}}}
+            ],
+            "profilesets": {
+                "results": [
+                    {"name": name, "mean": float(value)} for name, value in profilesets
+                ]
+            },
+        }
+    }
+
+
+class TestResultRegistry(unittest.TestCase):
+    def test_all_data_types_are_required(self) -> None:
+        registry = ResultRegistry()
+        registry.add(b"key", {"dps": 1})
+        self.assertEqual(registry.get(b"key", [DataType.DPS]), {"dps": 1})
+        self.assertIsNone(registry.get(b"key", [DataType.DPS, DataType.HPS]))
+        self.assertIsNone(registry.get(b"unknown", [DataType.DPS]))
+        self.assertEqual(registry.hits, 1)
+
+    def test_known_values_are_kept(self) -> None:
+        registry = ResultRegistry()
+        registry.add(b"key", {"dps": 1}, {"report": 1})
+        registry.add(b"key", {"dps": 2, "hps": 3}, {"report": 2})
+        self.assertEqual(
+            registry.get(b"key", [DataType.DPS, DataType.HPS]), {"dps": 1, "hps": 3}
+        )
+        self.assertEqual(registry.get_json_data(b"key"), {"report": 1})
+
+
+class TestReuseAcrossSimulators(unittest.TestCase):
+    def setUp(self) -> None:
+        self.registry = ResultRegistry()
+        wow_spec = get_wow_spec("druid", "feral")
+        settings = Config()
+        self.races = RaceSimulator(
+            wow_spec, "patchwerk", settings, result_registry=self.registry
+        )
+        self.trinkets = TrinketSimulator(
+            wow_spec, "patchwerk", settings, result_registry=self.registry
+        )
+
+    def _create_group(
+        self, simulator: Simulator, *profiles: typing.Tuple[str, typing.List[str]]
+    ) -> Simulation_Group:
+        simulation_group = simulator._create_simulation_group()
+        for name, simc_arguments in profiles:
+            simulation_group.add(
+                Simulation_Data(name=name, simc_arguments=simc_arguments)
+            )
+        return simulation_group
+
+    def _simulate(
+        self, simulation_group: Simulation_Group, dps: typing.Dict[str, int]
+    ) -> str:
+        """Write the input like simulate() and set the report. Returns the written input."""
+        written: typing.List[str] = []
+        simulation_group._write_input(written.append)
+        simulation_group.set_json_data(_create_report(dps))
+        return "".join(written)
+
+    def test_profilesets_are_reused(self) -> None:
+        races = self._create_group(
+            self.races, ("baseline", ["race=orc"]), ("troll", ["race=troll"])
+        )
+        self._simulate(races, {"baseline": 100000, "troll": 100100})
+
+        trinkets = self._create_group(
+            self.trinkets,
+            ("baseline", ["race=orc"]),
+            # same input as the troll of the race simulator
+            ("troll input", ["race=troll"]),
+            ("Trinket of Doom", ["race=orc", "trinket1=,id=1"]),
+        )
+        written = self._simulate(
+            trinkets, {"baseline": 100000, "Trinket of Doom": 100500}
+        )
+
+        self.assertNotIn("troll input", written)
+        self.assertIn("Trinket of Doom", written)
+        self.assertEqual(self.registry.hits, 1)
+        self.assertEqual(
+            self.trinkets._collect_data(trinkets, DataType.DPS),
+            {"baseline": 100000, "troll input": 100100, "Trinket of Doom": 100500},
+        )
+
+    def test_single_profiles_are_reused(self) -> None:
+        def simulate(profile: Simulation_Data) -> None:
+            profile.set_dps(100000, external=False)
+            profile.json_data = {"name": profile.name}
+
+        with mock.patch.object(
+            Simulation_Data, "simulate", autospec=True, side_effect=simulate
+        ) as simulate_profile:
+            probes = [
+                self._create_group(simulator, (simulator.name(), ["race=orc"]))
+                for simulator in (self.races, self.trinkets)
+            ]
+            for probe in probes:
+                probe.simulate()
+
+        simulate_profile.assert_called_once()
+        self.assertEqual(self.registry.hits, 1)
+        self.assertEqual(probes[1].get_dps_of("Trinkets"), 100000)
+        # the report is shared, e.g. to read the talents of the profile
+        self.assertIs(probes[1].profiles[0].json_data, probes[0].profiles[0].json_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import signal
+import subprocess
+import unittest
+from unittest import mock
+
+from bloodytools import worker_pool
+from bloodytools.utils import run_metadata
+from bloodytools.utils.config import Config
+from bloodytools.utils.run_metadata import (
+    RunMetadata,
+    get_run_metadata,
+    set_run_metadata,
+)
+from bloodytools.utils.utils import create_base_json_dict
+from simc_support.game_data.WowSpec import get_wow_spec
+
+SIMC_OUTPUT = (
+    b"SimulationCraft 1015-01 for World of Warcraft 10.1.5.50000 Live\n\nUsage: ..."
+)
+
+
+class TestRunMetadata(unittest.TestCase):
+    def setUp(self) -> None:
+        run_metadata._run_metadata.clear()
+        check_output = mock.patch(
+            "bloodytools.utils.run_metadata.subprocess.check_output",
+            return_value=b"0123abc commit message\n",
+        )
+        run = mock.patch(
+            "bloodytools.utils.run_metadata.subprocess.run",
+            return_value=subprocess.CompletedProcess([], 0, stdout=SIMC_OUTPUT),
+        )
+        self.check_output = check_output.start()
+        self.simc_run = run.start()
+        self.addCleanup(check_output.stop)
+        self.addCleanup(run.stop)
+
+    def tearDown(self) -> None:
+        run_metadata._run_metadata.clear()
+
+    def test_collected_once(self) -> None:
+        first = get_run_metadata("simc")
+        self.assertEqual(
+            first,
+            RunMetadata(
+                bloodytools_hash="0123abc",
+                simc_version="SimulationCraft 1015-01 for World of Warcraft 10.1.5.50000 Live",
+            ),
+        )
+        self.assertIs(get_run_metadata("simc"), first)
+        self.assertEqual(self.check_output.call_count, 1)
+        self.assertEqual(self.simc_run.call_count, 1)
+
+        # another executable is probed on its own
+        get_run_metadata("ptr/simc")
+        self.assertEqual(self.simc_run.call_count, 2)
+
+    def test_shared_by_all_results(self) -> None:
+        settings = Config(executable="simc")
+        with mock.patch("bloodytools.utils.utils.get_profile", return_value={}):
+            data_dicts = [
+                create_base_json_dict(
+                    "Races", get_wow_spec("druid", spec), "patchwerk", settings
+                )
+                for spec in ("feral", "balance")
+            ]
+
+        for data_dict in data_dicts:
+            self.assertEqual(data_dict["metadata"]["bloodytools"], "0123abc")
+        self.assertEqual(self.simc_run.call_count, 1)
+
+    def test_unknown_simc_version(self) -> None:
+        self.simc_run.side_effect = FileNotFoundError
+        self.assertEqual(get_run_metadata("missing/simc").simc_version, "")
+
+    def test_set_in_workers(self) -> None:
+        metadata = RunMetadata(bloodytools_hash="abc", simc_version="SimulationCraft")
+        set_run_metadata("simc", metadata)
+        self.assertIs(get_run_metadata("simc"), metadata)
+
+        config = Config(executable="worker/simc")
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        try:
+            worker_pool._init_worker(config, metadata, True)
+        finally:
+            signal.signal(signal.SIGTERM, previous_handler)
+            worker_pool._config = None
+
+        # workers use the metadata of the main process instead of probing
+        self.assertIs(get_run_metadata("worker/simc"), metadata)
+        self.check_output.assert_not_called()
+        self.simc_run.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import signal
+import tempfile
+import threading
+import unittest
+
+from bloodytools.utils import scratch
+from bloodytools.utils.config import Config
+
+
+class TestScratch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = Config(
+            scratch_directory=os.path.join(self.directory.name, "scratch"),
+            kept_files_directory=os.path.join(self.directory.name, "kept"),
+        )
+        self.job_name = scratch.get_job_name(("druid", "feral", "patchwerk"))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _write(self, file_name: str) -> str:
+        path = scratch.get_path(file_name)
+        with open(path, "w") as f:
+            f.write("iterations=1\n")
+        return path
+
+    def test_outside_of_jobs(self) -> None:
+        self.assertEqual(scratch.get_path("a.simc"), "a.simc")
+
+    def test_run_directory_is_removed(self) -> None:
+        root = self.config.scratch_directory
+        with self.assertRaises(KeyboardInterrupt):
+            with scratch.run_directory(self.config) as run_directory:
+                self.assertEqual(self.config.scratch_directory, run_directory)
+                with scratch.job_directory(self.config, self.job_name):
+                    self._write("a.simc")
+                raise KeyboardInterrupt
+        self.assertEqual(self.config.scratch_directory, root)
+        self.assertEqual(os.listdir(root), [])
+
+    def test_sigterm_removes_run_directory(self) -> None:
+        root = self.config.scratch_directory
+        previous_handler = signal.getsignal(signal.SIGTERM)
+        with self.assertRaises(SystemExit):
+            with scratch.run_directory(self.config):
+                with scratch.job_directory(self.config, self.job_name):
+                    self._write("a.simc")
+                    os.kill(os.getpid(), signal.SIGTERM)
+        self.assertEqual(os.listdir(root), [])
+        self.assertEqual(signal.getsignal(signal.SIGTERM), previous_handler)
+
+    def test_job_directory(self) -> None:
+        with scratch.run_directory(self.config):
+            with self.assertRaises(ValueError):
+                with scratch.job_directory(self.config, self.job_name) as directory:
+                    path = self._write("a.simc")
+                    self.assertEqual(os.path.dirname(path), directory)
+                    scratch.keep(self._write("b.simc"))
+                    raise ValueError
+            self.assertFalse(os.path.exists(directory))
+        self.assertEqual(
+            os.listdir(os.path.join(self.config.kept_files_directory, self.job_name)),
+            ["b.simc"],
+        )
+
+    def test_keep_files(self) -> None:
+        self.config.keep_files = True
+        with scratch.run_directory(self.config):
+            with scratch.job_directory(self.config, self.job_name):
+                self._write("a.simc")
+                self._write("a.json")
+        self.assertEqual(
+            sorted(
+                os.listdir(
+                    os.path.join(self.config.kept_files_directory, self.job_name)
+                )
+            ),
+            ["a.json", "a.simc"],
+        )
+
+    def test_directories_are_per_thread(self) -> None:
+        paths = []
+
+        def write() -> None:
+            paths.append(scratch.get_path("a.simc"))
+
+        with scratch.run_directory(self.config):
+            with scratch.job_directory(self.config, self.job_name) as directory:
+                thread = threading.Thread(target=write)
+                thread.start()
+                thread.join()
+                self.assertEqual(paths, ["a.simc"])
+                self.assertEqual(
+                    scratch.get_path("a.simc"), os.path.join(directory, "a.simc")
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from bloodytools.simulations.secondary_distribution_simulator import (
+    SecondaryDistributionSimulator,
+)
+from bloodytools.utils import file_cache
+from bloodytools.utils.config import Config
+from simc_support.game_data.WowSpec import get_wow_spec
+
+FALLBACK_PROFILE = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "fallback_profiles",
+    "castingpatchwerk3",
+    "Tier30",
+    "T30_Druid_Feral.simc",
+)
+
+
+class TestSecondaryDistributionSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        simc_directory = os.path.join(self.directory.name, "SimulationCraft")
+        profiles_directory = os.path.join(simc_directory, "profiles", "Tier30")
+        os.makedirs(profiles_directory)
+        shutil.copy(FALLBACK_PROFILE, profiles_directory)
+        file_cache.clear()
+
+        self.simulator = SecondaryDistributionSimulator(
+            wow_spec=get_wow_spec("druid", "feral"),
+            fight_style="castingpatchwerk3",
+            settings=Config(executable=os.path.join(simc_directory, "simc"), tier="30"),
+        )
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_secondary_stats_from_commented_gear_lines(self) -> None:
+        # "# gear_crit_rating=4450" etc.
+        self.assertEqual(
+            self.simulator.get_available_secondary_stats({}),
+            4450 + 2646 + 4585 + 1015,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.talent_interaction_simulator import (
+    TalentInteractionSimulator,
+)
+from bloodytools.utils.config import Config
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.WowSpec import get_wow_spec
+
+# talent removal -> dps
+DPS = {
+    "baseline": 100000,
+    "a": 98000,
+    "b": 97000,
+    "c": 99000,
+    # below the 1% threshold
+    "d": 99950,
+    "b+a": 94000,
+    "a+c": 97000,
+    "b+c": 96500,
+}
+
+
+class TestTalentInteractionSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = TalentInteractionSimulator(
+            wow_spec=get_wow_spec("druid", "feral"),
+            fight_style="patchwerk",
+            settings=Config(
+                talent_interaction_threshold=1.0,
+                talent_interaction_max_talents=12,
+                talent_interaction_shard_size=2,
+            ),
+        )
+        self.simulator._builds = {"build": ["class_talents=a:1/b:1/c:1/d:1"]}
+        self.simulator._base_actor = Simulation_Data(
+            name=self.simulator.get_profile_name("build", "baseline")
+        )
+        # profile names of each simulated group
+        self.simulated_groups: typing.List[typing.List[str]] = []
+
+    def _get_talent(self, profile_name: str) -> str:
+        return profile_name.split(self.simulator.profile_split_character())[1]
+
+    def _create_group(self) -> Simulation_Group:
+        simulation_group = Simulation_Group(name="talents")
+        for talent in ("baseline", "a", "b", "c", "d"):
+            simulation_group.add(
+                Simulation_Data(
+                    name=self.simulator.get_profile_name("build", talent),
+                    simc_arguments=[f"# {talent}"],
+                )
+            )
+        return simulation_group
+
+    def _simulate(self, simulation_group: Simulation_Group) -> bool:
+        for profile in simulation_group.profiles:
+            profile.set_dps(DPS[self._get_talent(profile.name)], external=False)
+        self.simulated_groups.append([p.name for p in simulation_group.profiles])
+        simulation_group.json_data = {}
+        return True
+
+    def test_candidate_talents(self) -> None:
+        simulation_group = self._create_group()
+        self._simulate(simulation_group)
+
+        # strongest first, d stays below the threshold
+        self.assertEqual(
+            self.simulator._get_candidate_talents(simulation_group, "build"),
+            ["b", "a", "c"],
+        )
+        self.simulator.settings.talent_interaction_max_talents = 2
+        self.assertEqual(
+            self.simulator._get_candidate_talents(simulation_group, "build"),
+            ["b", "a"],
+        )
+        self.simulator.settings.talent_interaction_threshold = 2.5
+        self.assertEqual(
+            self.simulator._get_candidate_talents(simulation_group, "build"), ["b"]
+        )
+
+    def test_interactions_of_shards(self) -> None:
+        simulation_group = self._create_group()
+        with mock.patch.object(
+            Simulation_Group, "simulate", autospec=True, side_effect=self._simulate
+        ):
+            self.simulator._simulate(simulation_group)
+
+        # single removals, then 3 pairs in shards of 2, each led by the baseline
+        self.assertEqual(
+            [
+                [self._get_talent(name) for name in names]
+                for names in self.simulated_groups
+            ],
+            [
+                ["baseline", "a", "b", "c", "d"],
+                ["baseline", "b+a", "b+c"],
+                ["baseline", "a+c"],
+            ],
+        )
+        self.assertEqual(self.simulator._candidates, {"build": ["b", "a", "c"]})
+
+        interactions = self.simulator._interactions["build"]
+        # (dps_ab - baseline) - (dps_a - baseline) - (dps_b - baseline)
+        self.assertEqual(interactions["a"]["b"], 94000 - 98000 - 97000 + 100000)
+        self.assertEqual(interactions["b"]["a"], interactions["a"]["b"])
+        self.assertEqual(interactions["a"]["c"], 0)
+        self.assertEqual(interactions["c"]["b"], 500)
+        self.assertNotIn("d", interactions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from bloodytools.simulations.talent_removal_simulator import TalentRemovalSimulator
+from bloodytools.utils.config import Config
+from simc_support.game_data.WowSpec import get_wow_spec
+
+SIMC_ARGS = [
+    "talents=BcGAAAAAAAAAAAAAAAAAAAAAAA",
+    "class_talents=a:1/b:2/c:0 # comment",
+    "spec_talents=d:1/e:1",
+    "race=orc",
+]
+
+
+class TestTalentRemovalSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = TalentRemovalSimulator(
+            wow_spec=get_wow_spec("druid", "feral"),
+            fight_style="patchwerk",
+            settings=Config(),
+        )
+
+    def test_removable_talents(self) -> None:
+        # export strings can't be edited point-wise, talents without points can't be removed
+        self.assertEqual(
+            self.simulator._get_removable_talents(SIMC_ARGS), ["a", "b", "d", "e"]
+        )
+
+    def test_remove_two_talents_of_one_string(self) -> None:
+        self.assertEqual(
+            self.simulator._remove_talents(SIMC_ARGS, ["a", "b"]),
+            [
+                "talents=BcGAAAAAAAAAAAAAAAAAAAAAAA",
+                "spec_talents=d:1/e:1",
+                "race=orc",
+                # c:0 is dropped, modified strings come last
+                "class_talents=a:0/b:1",
+            ],
+        )
+
+    def test_remove_talents_of_class_and_spec_string(self) -> None:
+        self.assertEqual(
+            self.simulator._remove_talents(SIMC_ARGS, ["a", "d"]),
+            [
+                "talents=BcGAAAAAAAAAAAAAAAAAAAAAAA",
+                "race=orc",
+                "class_talents=b:2/a:0",
+                "spec_talents=e:1/d:0",
+            ],
+        )
+
+    def test_remove_unknown_talent(self) -> None:
+        self.assertEqual(
+            self.simulator._remove_talents(SIMC_ARGS, ["c", "x"]),
+            SIMC_ARGS,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.talent_removal_simulator import TalentRemovalSimulator
+from bloodytools.utils.config import Config
+from bloodytools.utils.simulation_objects import Simulation_Data, Simulation_Group
+from simc_support.game_data.WowSpec import get_wow_spec
+
+# talent -> (screening dps, full precision dps)
+RESULTS = {
+    "baseline": (100000, 101000),
+    # 0.2% + 0.6% noise stays below the 1% threshold
+    "close": (100200, 100500),
+    # 0.4% + 0.6% noise reaches the threshold
+    "border": (100400, 100900),
+    "far": (99000, 99500),
+}
+
+
+class TestTalentScreeningSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.simulator = TalentRemovalSimulator(
+            wow_spec=get_wow_spec("druid", "feral"),
+            fight_style="patchwerk",
+            settings=Config(
+                talent_screening=True,
+                talent_screening_target_error="0.3",
+                talent_screening_threshold=1.0,
+            ),
+        )
+        self.simulator.pre_processing({})
+        # target_error of each simulated profile
+        self.simulated: typing.Dict[str, typing.List[str]] = {}
+
+    def _create_group(self) -> Simulation_Group:
+        simulation_group = Simulation_Group(name="talents")
+        for talent in RESULTS:
+            simulation_group.add(
+                Simulation_Data(
+                    name=self.simulator.get_profile_name("build", talent),
+                    target_error="0.1",
+                    simc_arguments=[f"# {talent}"],
+                )
+            )
+        return simulation_group
+
+    def _simulate(self, simulation_group: Simulation_Group) -> bool:
+        for profile in simulation_group.profiles:
+            talent = profile.name.split(self.simulator.profile_split_character())[1]
+            screening, full = RESULTS[talent]
+            is_screening = profile.target_error == "0.3"
+            profile.set_dps(screening if is_screening else full, external=False)
+            self.simulated.setdefault(profile.name, []).append(profile.target_error)
+        simulation_group.json_data = {}
+        return True
+
+    def test_screened_profile_names(self) -> None:
+        screening_group = self._create_group()
+        for profile in screening_group.profiles:
+            talent = profile.name.split(self.simulator.profile_split_character())[1]
+            profile.set_dps(RESULTS[talent][0], external=False)
+
+        self.assertEqual(
+            self.simulator._get_screened_profile_names(screening_group),
+            {self.simulator.get_profile_name("build", "close")},
+        )
+
+    def test_screened_dps_is_rebased(self) -> None:
+        simulation_group = self._create_group()
+        with mock.patch.object(
+            Simulation_Group, "simulate", autospec=True, side_effect=self._simulate
+        ):
+            self.simulator._simulate(simulation_group)
+
+        close = self.simulator.get_profile_name("build", "close")
+        # only the screened talent skips the full precision run
+        self.assertEqual(self.simulated[close], ["0.3"])
+        for talent in ("baseline", "border", "far"):
+            self.assertEqual(
+                self.simulated[self.simulator.get_profile_name("build", talent)],
+                ["0.3", "0.1"],
+            )
+
+        # final baseline + screening delta
+        self.assertEqual(simulation_group.get_dps_of(close), 101000 + 200)
+        self.assertEqual(
+            simulation_group.get_dps_of(
+                self.simulator.get_profile_name("build", "far")
+            ),
+            99500,
+        )
+        self.assertEqual(
+            self.simulator._talent_status,
+            {
+                "build": {
+                    "baseline": "measured",
+                    "close": "screened",
+                    "border": "measured",
+                    "far": "measured",
+                }
+            },
+        )
+
+    def test_status_without_simulation(self) -> None:
+        # --plan and --fuse skip _simulate
+        data_dict = self.simulator.post_processing(
+            {"data": {"build": {"baseline": 101000}}}
+        )
+        self.assertEqual(data_dict["talent_status"], {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from bloodytools.simulations.talent_optimizer_simulator import TalentBuild
+from bloodytools.utils.talent_tree import (
+    CLASS_TREE,
+    SPEC_TREE,
+    TalentBuildError,
+    get_talent_trees,
+)
+from simc_support.game_data.WowSpec import get_wow_spec
+
+# "The Compromise" of talent_tree_paths/druid_feral.yaml, all points are spent
+EXPORT_STRING = "BcGAAAAAAAAAAAAAAAAAAAAAAAAAAAAAQSLNJKJJJJl0OAKJRikAAAAAAAAkEAESSSCJJpkASAAAAAAgEAAA"
+
+
+class TestTalentTrees(unittest.TestCase):
+    def setUp(self) -> None:
+        self.trees = get_talent_trees(get_wow_spec("druid", "feral"))
+
+    def test_export_string(self) -> None:
+        ranks, choices, tree_hash = self.trees.decode(EXPORT_STRING)
+        self.assertEqual(sum(ranks.values()), 61)
+        self.assertEqual(self.trees.get_errors(ranks), {})
+        self.assertEqual(self.trees.encode(ranks, choices, tree_hash), EXPORT_STRING)
+
+    def test_export_string_of_other_spec(self) -> None:
+        trees = get_talent_trees(get_wow_spec("druid", "balance"))
+        with self.assertRaises(TalentBuildError):
+            trees.decode(EXPORT_STRING)
+
+    def test_talent_list(self) -> None:
+        ranks, choices, _ = self.trees.decode(EXPORT_STRING)
+        for tree in (CLASS_TREE, SPEC_TREE):
+            talent_list = "/".join(
+                f"{self.trees.get_talent_name(node_id, choices)}:{rank}"
+                for node_id, rank in ranks.items()
+                if self.trees.nodes[node_id].tree == tree
+            )
+            tree_ranks, _ = self.trees.parse_talent_list(tree, talent_list)
+            self.assertEqual(
+                tree_ranks,
+                {n: r for n, r in ranks.items() if self.trees.nodes[n].tree == tree},
+            )
+
+        with self.assertRaises(TalentBuildError):
+            self.trees.parse_talent_list(CLASS_TREE, "a:1/b:2/c:1/d:1")
+
+    def test_rules(self) -> None:
+        ranks, _, _ = self.trees.decode(EXPORT_STRING)
+        # a selected node without any selected parent
+        node = next(
+            n
+            for n in self.trees.nodes.values()
+            if n.parent_ids
+            and not n.is_free
+            and n.id not in ranks
+            and not any(p in ranks or self.trees.nodes[p].is_free for p in n.parent_ids)
+        )
+        errors = self.trees.get_errors({**ranks, node.id: 1})
+        self.assertEqual(list(errors), [node.id])
+
+
+class TestTalentBuild(unittest.TestCase):
+    def setUp(self) -> None:
+        self.trees = get_talent_trees(get_wow_spec("druid", "feral"))
+
+    def test_neighbours_of_fully_invested_build(self) -> None:
+        build = TalentBuild.from_simc_arguments(
+            "start", ["talents=" + EXPORT_STRING], self.trees
+        )
+        self.assertEqual(build.get_simc_arguments(), ["talents=" + EXPORT_STRING])
+
+        neighbours = list(build.neighbours())
+        self.assertTrue(neighbours)
+        self.assertEqual(
+            len({n.key() for n in neighbours}), len(neighbours), "duplicate moves"
+        )
+        for neighbour in neighbours:
+            self.assertEqual(len(neighbour.swaps), 1)
+            self.assertEqual(self.trees.get_errors(neighbour.ranks), {})
+            self.assertEqual(sum(neighbour.ranks.values()), 61)
+            ranks, _, _ = self.trees.decode(
+                neighbour.get_simc_arguments()[0].split("=", 1)[1]
+            )
+            self.assertEqual(ranks, neighbour.ranks)
+
+    def test_unknown_talents(self) -> None:
+        with self.assertRaises(TalentBuildError):
+            TalentBuild.from_simc_arguments(
+                "unknown",
+                ["class_talents=a:1/b:2/c:1/d:1", "spec_talents=e:1/f:2/g:1"],
+                self.trees,
+            )
+        with self.assertRaises(TalentBuildError):
+            TalentBuild.from_simc_arguments("no talents", ["race=orc"], self.trees)
+
+
+if __name__ == "__main__":
+    unittest.main()
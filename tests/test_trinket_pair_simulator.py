@@ -0,0 +1,93 @@
+import typing
+import unittest
+from unittest import mock
+
+from bloodytools.simulations.trinket_pair_simulator import (
+    TrinketCandidate,
+    TrinketPairSimulator,
+)
+from bloodytools.utils.config import Config
+from bloodytools.utils.simulation_objects import Simulation_Group
+from simc_support.game_data.Trinket import get_trinkets_for_spec
+from simc_support.game_data.WowSpec import get_wow_spec
+
+
+class TestTrinketPairSimulator(unittest.TestCase):
+    def setUp(self) -> None:
+        self.wow_spec = get_wow_spec("druid", "feral")
+        self.simulator = TrinketPairSimulator(
+            wow_spec=self.wow_spec,
+            fight_style="patchwerk",
+            settings=Config(trinket_pair_max_pairs=0),
+        )
+        trinkets = list(get_trinkets_for_spec(self.wow_spec))[:3]
+        self.candidates = [
+            TrinketCandidate(
+                name=trinket.name,
+                trinket=trinket,
+                itemlevel=447,
+                item_string=f",id={trinket.item_id},ilevel=447",
+            )
+            for trinket in trinkets
+        ]
+        # profile names of each simulated group
+        self.simulated_groups: typing.List[typing.List[str]] = []
+
+    def _simulate(self, simulation_group: Simulation_Group) -> bool:
+        # the gain of a trinket is 100 times its position
+        gains = {c.name: 100 * (i + 1) for i, c in enumerate(self.candidates)}
+        for profile in simulation_group.profiles:
+            names = profile.name.split(self.simulator.profile_split_character())
+            dps = 100000 + sum(gains.get(name, 0) for name in names)
+            profile.set_dps(dps, external=False)
+        self.simulated_groups.append([p.name for p in simulation_group.profiles])
+        simulation_group.json_data = {}
+        return True
+
+    def test_all_pairs_pruned(self) -> None:
+        gains = {candidate.name: 100 for candidate in self.candidates}
+        simulated, pruned = self.simulator._select_pairs(self.candidates, gains, 100000)
+        self.assertEqual(simulated, [])
+        self.assertEqual(len(pruned), 3)
+
+        self.simulator._single_trinkets = {"baseline": 100000}
+        self.simulator._pruned = {
+            a.name: {b.name: True for b in self.candidates if b is not a}
+            for a in self.candidates
+        }
+        data_dict = self.simulator.post_processing({"data": {"baseline": 100000}})
+        self.assertEqual(data_dict["sorted_pairs"], [])
+        self.assertEqual(data_dict["sorted_data_keys"], [])
+        self.assertEqual(data_dict["data"], {"baseline": 100000})
+        self.assertEqual(data_dict["data_pruned"], self.simulator._pruned)
+
+    def test_single_trinkets_are_simulated_in_simulate(self) -> None:
+        self.simulator.settings.trinket_pair_max_pairs = 1
+        simulation_group = Simulation_Group(name="trinket pairs")
+        with mock.patch.object(
+            Simulation_Group, "simulate", autospec=True, side_effect=self._simulate
+        ):
+            self.simulator.add_simulation_data(simulation_group, {"profile": {}})
+            # preparing doesn't simulate, e.g. for --plan
+            self.assertEqual(self.simulated_groups, [])
+            self.assertEqual([p.name for p in simulation_group.profiles], ["baseline"])
+
+            self.simulator._candidates = self.candidates
+            self.simulator._simulate(simulation_group)
+
+        a, b, c = (candidate.name for candidate in self.candidates)
+        best_pair = self.simulator.get_profile_name(c, b)
+        self.assertEqual(
+            self.simulated_groups, [["baseline", a, b, c], ["baseline", best_pair]]
+        )
+        self.assertEqual(simulation_group.get_dps_of(best_pair), 100500)
+        self.assertEqual(
+            self.simulator._single_trinkets,
+            {"baseline": 100000, a: 100100, b: 100200, c: 100300},
+        )
+        self.assertFalse(self.simulator._pruned[b][c])
+        self.assertTrue(self.simulator._pruned[a][b])
+
+
+if __name__ == "__main__":
+    unittest.main()
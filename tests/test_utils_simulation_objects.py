@@ -1,3 +1,5 @@
+import copy
+import dataclasses
 import datetime
 import os
 import time
@@ -5,6 +7,8 @@ import unittest
 import uuid
 
 from bloodytools.utils import simulation_objects
+from bloodytools.utils.data_type import DataType
+from bloodytools.utils.result_registry import ResultRegistry
 
 
 class TestSimulationDataInit(unittest.TestCase):
@@ -228,6 +232,59 @@ class TestSimulationDataMethods(unittest.TestCase):
         sd_threads = simulation_objects.Simulation_Data(threads="4")
         self.assertFalse(sd_threads.is_equal(sd1))
 
+    def test_shared_settings(self):
+        sd1 = simulation_objects.Simulation_Data(target_error="0.5")
+        sd2 = simulation_objects.Simulation_Data(target_error=0.5)
+        self.assertIs(sd1.settings, sd2.settings)
+        with self.assertRaises(AttributeError):
+            sd1.unknown_attribute = 1
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            sd1.settings.target_error = "1.0"
+
+        sd2.target_error = "1.0"
+        self.assertEqual(sd1.target_error, "0.5")
+        self.assertFalse(sd1.is_equal(sd2))
+        sd2.target_error = "0.5"
+        self.assertIs(sd1.settings, sd2.settings)
+        self.assertIs(sd1.copy().settings, sd1.settings)
+
+    def test_profile_arguments(self):
+        profile = {
+            "character": {"class": "death_knight", "race": "human"},
+            "items": {"head": {"id": 1}},
+        }
+        sd1 = simulation_objects.Simulation_Data(
+            profile=profile, simc_arguments=["race=orc"]
+        )
+        sd2 = simulation_objects.Simulation_Data(profile=profile)
+        self.assertEqual(
+            sd1.profile_arguments, ("deathknight=baseline", "race=human", "head=,id=1")
+        )
+        self.assertIs(sd1.profile_arguments, sd2.profile_arguments)
+        self.assertEqual(sd1.simc_arguments, ["race=orc"])
+        self.assertEqual(
+            sd1.get_all_simc_arguments(),
+            ["deathknight=baseline", "race=human", "head=,id=1", "race=orc"],
+        )
+        self.assertIs(sd1.copy().profile_arguments, sd1.profile_arguments)
+        # equal but independent profile dicts share the rendering
+        self.assertIs(
+            simulation_objects.render_profile(copy.deepcopy(profile)),
+            sd1.profile_arguments,
+        )
+        self.assertEqual(
+            sd1.get_simc_arguments_from_profile(profile), list(sd1.profile_arguments)
+        )
+        with self.assertRaises(ValueError):
+            simulation_objects.render_profile({"items": {}})
+
+        # profilesets only get their deltas and restore what the base actor changed
+        sg = simulation_objects.Simulation_Group([sd1, sd2])
+        keys = sg._get_argument_keys(sd1)
+        self.assertEqual(sg._get_profileset_arguments(sd2, keys), ["race=human"])
+        sd3 = simulation_objects.Simulation_Data(simc_arguments=["race=gnome"])
+        self.assertEqual(sg._get_profileset_arguments(sd3, keys), ["race=gnome"])
+
     def test_get_dps(self):
         self.assertEqual(self.sd.get_dps(), -1)
         self.sd.set_dps(12345.8)
@@ -249,6 +306,15 @@ class TestSimulationDataMethods(unittest.TestCase):
             self.sd.set_dps("Bonjour", external=False)
         self.assertEqual(self.sd.get_dps(), -1)
 
+    def test_set_value(self):
+        self.assertEqual(self.sd.get_value(DataType.HPS), -1)
+        self.sd.set_value(DataType.HPS, "456.7")
+        self.assertEqual(self.sd.get_value(DataType.HPS), 456)
+        with self.assertRaises(simulation_objects.AlreadySetError):
+            self.sd.set_value(DataType.HPS, 1)
+        self.sd.set_value(DataType.DPS, 123)
+        self.assertEqual(self.sd.get_dps(), 123)
+
     def test_get_simulation_duration(self):
         with self.assertRaises(simulation_objects.NotStartedYetError):
             self.assertEqual(self.sd.get_simulation_duration(), None)
@@ -412,6 +478,219 @@ class TestSimulationGroupMethods(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.sg.add("Bananana")
 
+    def test_add_duplicate_name(self):
+        self.sd1.name = "same"
+        self.sd2.name = "same"
+        sg = simulation_objects.Simulation_Group(self.sd1)
+        with self.assertRaises(simulation_objects.AlreadySetError):
+            sg.add(self.sd2)
+        # identical profiles are skipped
+        self.assertFalse(sg.add(self.sd1.copy()))
+        self.assertEqual(len(sg.profiles), 1)
+        with self.assertRaises(simulation_objects.AlreadySetError):
+            simulation_objects.Simulation_Group([self.sd1, self.sd2])
+
+    def test_name_index(self):
+        self.sd1.name = "a"
+        self.sd2.name = "b"
+        sg = simulation_objects.Simulation_Group([self.sd1, self.sd2])
+        sg.set_dps_of("b", 200)
+        self.assertEqual(sg.get_dps_of("b"), 200)
+
+        # renamed in place
+        self.sd1.name = "c"
+        sg.set_dps_of("c", 100)
+        self.assertEqual(sg.get_dps_of("c"), 100)
+        with self.assertRaises(KeyError):
+            sg.get_dps_of("a")
+
+        self.assertIs(sg.remove("c"), self.sd1)
+        self.assertEqual(sg.profiles, [self.sd2])
+        with self.assertRaises(KeyError):
+            sg.get_dps_of("c")
+
+        # profiles appended without add
+        new_data = simulation_objects.Simulation_Data(target_error=1.0, name="d")
+        sg.profiles.append(new_data)
+        self.assertEqual(sg.get_dps_of("d"), -1)
+
+    def test_add_stream(self):
+        created = []
+
+        def create_profiles():
+            for i in range(3):
+                created.append(i)
+                yield simulation_objects.Simulation_Data(
+                    name=f"profile {i}",
+                    target_error="1.0",
+                    simc_arguments=[f"talents={i}"],
+                )
+
+        sg = simulation_objects.Simulation_Group()
+        sg.add_stream(create_profiles())
+        # only the base actor was created
+        self.assertEqual(created, [0])
+        self.assertEqual([p.name for p in sg.profiles], ["profile 0"])
+        self.assertTrue(sg._has_streamed_profiles())
+        self.assertEqual(created, [0, 1])
+
+        # streams are consumed while the input file is written
+        self.assertEqual(
+            [p.name for p in sg._iter_profilesets()], ["profile 1", "profile 2"]
+        )
+        self.assertEqual(len(sg.profiles), 1)
+        self.assertFalse(sg._has_streamed_profiles())
+
+        sg.set_json_data(
+            {
+                "sim": {
+                    "players": [
+                        {"name": "profile 0", "collected_data": {"dps": {"mean": 1}}}
+                    ],
+                    "profilesets": {
+                        "results": [
+                            {"name": "profile 1", "mean": 2.0},
+                            {"name": "profile 2", "mean": 3.0},
+                        ]
+                    },
+                }
+            }
+        )
+        self.assertEqual(sg.get_dps_of("profile 2"), 3)
+        self.assertEqual(
+            list(sg.iter_results()),
+            [("profile 0", 1), ("profile 1", 2), ("profile 2", 3)],
+        )
+
+    def test_duplicated_profilesets(self):
+        self.sd1.name = "base"
+        self.sd2.name = "a"
+        alias = self.sd2.copy()
+        alias.name = "b"
+        alias.simc_arguments.append("# only a comment")
+        sg = simulation_objects.Simulation_Group(
+            [self.sd1, self.sd2, alias], data_types=[DataType.HPS]
+        )
+
+        written = [
+            profile.name
+            for profile, _ in sg._iter_unique_profilesets(
+                sg._get_argument_keys(self.sd1)
+            )
+        ]
+        self.assertEqual(written, ["a"])
+
+        sg.set_json_data(
+            {
+                "sim": {
+                    "players": [
+                        {"name": "base", "collected_data": {"dps": {"mean": 1}}}
+                    ],
+                    "profilesets": {
+                        "results": [
+                            {
+                                "name": "a",
+                                "mean": 2.0,
+                                "additional_metrics": [
+                                    {"metric": "hps", "mean": 3.0},
+                                ],
+                            },
+                        ]
+                    },
+                }
+            }
+        )
+        self.assertEqual(sg.get_dps_of("b"), 2)
+        self.assertEqual(sg.get_value_of("b", DataType.HPS), 3)
+
+    def test_result_registry(self):
+        self.sd1.name = "base"
+        self.sd2.name = "a"
+        # profiles of another group of the run
+        base = self.sd1.copy()
+        # identical to the base actor
+        same_as_base = self.sd1.copy()
+        same_as_base.name = "same as base"
+        known = self.sd2.copy()
+        known.name = "known"
+
+        registry = ResultRegistry()
+        sg = simulation_objects.Simulation_Group(
+            [self.sd1, self.sd2], registry=registry
+        )
+        base_keys = sg._get_argument_keys(self.sd1)
+        self.assertEqual(
+            [p.name for p, _ in sg._iter_unique_profilesets(base_keys)], ["a"]
+        )
+        sg.set_json_data(
+            {
+                "sim": {
+                    "players": [
+                        {"name": "base", "collected_data": {"dps": {"mean": 1}}}
+                    ],
+                    "profilesets": {"results": [{"name": "a", "mean": 2.0}]},
+                }
+            }
+        )
+        self.assertEqual(len(registry), 2)
+
+        sg = simulation_objects.Simulation_Group(
+            [base, same_as_base, known], registry=registry
+        )
+        self.assertEqual(list(sg._iter_unique_profilesets(base_keys)), [])
+        self.assertEqual(sg._aliases, {"same as base": "base"})
+        self.assertEqual(sg.get_dps_of("known"), 2)
+        self.assertEqual(registry.hits, 1)
+
+        # all profilesets were known, simc only simulated the base actor
+        sg.set_json_data(
+            {
+                "sim": {
+                    "players": [
+                        {"name": "base", "collected_data": {"dps": {"mean": 3}}}
+                    ]
+                }
+            }
+        )
+        self.assertEqual(sg.get_dps_of("same as base"), 3)
+
+    def test_dry_run(self):
+        self.sd1.name = "base"
+        self.sd2.name = "a"
+        alias = self.sd2.copy()
+        alias.name = "b"
+        registry = ResultRegistry()
+        sg = simulation_objects.Simulation_Group(
+            [self.sd1, self.sd2, alias], executable="simc", registry=registry
+        )
+        probes = [
+            simulation_objects.Simulation_Group(self.sd1.copy(), registry=registry)
+            for _ in range(2)
+        ]
+        with simulation_objects.dry_run() as recorder:
+            self.assertTrue(sg.simulate())
+            for probe in probes:
+                probe.simulate()
+
+        self.assertFalse(sg.filename)
+        self.assertEqual(sg.get_dps_of("a"), 0)
+        # the second probe was known to the registry
+        self.assertEqual(len(recorder.simulations), 2)
+        self.assertEqual(registry.hits, 1)
+        planned = recorder.simulations[0]
+        self.assertEqual(planned.profiles, 2)
+        self.assertEqual(planned.collapsed, 1)
+        self.assertGreater(planned.input_size, 0)
+        self.assertIsNone(simulation_objects._dry_run)
+
+    def test_add_stream_wrong_settings(self):
+        sg = simulation_objects.Simulation_Group(self.sd1)
+        sg.add_stream(
+            [simulation_objects.Simulation_Data(name="x", target_error="2.0")]
+        )
+        with self.assertRaises(ValueError):
+            list(sg._iter_profilesets())
+
     @unittest.skip(
         reason="simulating would assume a SimulationCraft executable is available. But that's not to be expected during testing."
     )
@@ -509,6 +788,47 @@ class TestSimulationGroupMethods(unittest.TestCase):
         self.sg.profiles[1].simc_arguments = ["talents=3333333"]
         self.assertTrue(self.sg.simulate())
 
+    def test_set_json_data_metrics(self):
+        self.sd1.name = "base"
+        self.sd2.name = "other"
+        sg = simulation_objects.Simulation_Group(
+            [self.sd1, self.sd2], data_types=[DataType.HPS]
+        )
+        self.assertEqual(sg.data_types, [DataType.DPS, DataType.HPS])
+        sg.set_json_data(
+            {
+                "sim": {
+                    "players": [
+                        {
+                            "name": "base",
+                            "collected_data": {
+                                "dps": {"mean": 100.0},
+                                "hps": {"mean": 50.0},
+                                "dtps": {"mean": 10.0},
+                            },
+                        }
+                    ],
+                    "profilesets": {
+                        "results": [
+                            {
+                                "name": "other",
+                                "mean": 200.0,
+                                "additional_metrics": [
+                                    {"metric": "hps", "mean": 60.0},
+                                ],
+                            }
+                        ]
+                    },
+                }
+            }
+        )
+        self.assertEqual(sg.get_dps_of("base"), 100)
+        self.assertEqual(sg.get_value_of("base", DataType.HPS), 50)
+        # not requested
+        self.assertEqual(sg.get_value_of("base", DataType.DTPS), -1)
+        self.assertEqual(sg.get_dps_of("other"), 200)
+        self.assertEqual(sg.get_value_of("other", DataType.HPS), 60)
+
     def test_simulate_profilesets_no_profiles(self):
         self.sg.profiles = None
         self.assertFalse(self.sg.simulate())
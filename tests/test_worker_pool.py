@@ -0,0 +1,122 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from bloodytools import worker_pool
+from bloodytools.simulations.simulator import MissingTalentTreePathFileError
+from bloodytools.utils.config import Config
+from bloodytools.utils.cost_model import get_job_key
+from bloodytools.utils.history import JobHistory, JobRecord
+from bloodytools.utils.result_registry import ResultRegistry
+from simc_support.game_data.WowSpec import WowSpec, get_wow_spec
+
+JOBS = [("druid", "feral", "patchwerk"), ("druid", "balance", "patchwerk")]
+
+
+def _run_simulators(
+    config: Config,
+    wow_spec: WowSpec,
+    fight_style: str,
+    result_registry: ResultRegistry,
+) -> JobRecord:
+    # report the threads each worker simulated with as seconds
+    result_registry.hits = 1
+    return JobRecord(seconds=float(config.threads))
+
+
+class TestWorkerPool(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.config = Config(
+            wow_class_spec_names=[("druid", "feral"), ("druid", "balance")],
+            fight_styles=["patchwerk"],
+            simulator_type_names=["races"],
+            workers=2,
+        )
+        self.job_history = JobHistory(os.path.join(self.directory.name, "jobs.json"))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _run(self) -> int:
+        with mock.patch("bloodytools.main.run_simulators", _run_simulators), mock.patch(
+            "bloodytools.worker_pool.preload"
+        ), mock.patch(
+            "bloodytools.worker_pool.autotune.get_core_count", return_value=8
+        ):
+            return worker_pool.run_worker_pool(self.config, JOBS, self.job_history)
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "workers are spawned"
+    )
+    def test_workers_share_cores(self) -> None:
+        hits = self._run()
+
+        self.assertEqual(hits, 2)
+        records = [self.job_history.get(get_job_key(job, self.config)) for job in JOBS]
+        self.assertEqual([record.seconds for record in records if record], [4.0, 4.0])
+        # the main process keeps its settings
+        self.assertEqual(self.config.threads, "")
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "workers are spawned"
+    )
+    def test_configured_threads_are_kept(self) -> None:
+        self.config.threads = "3"
+        self._run()
+
+        for job in JOBS:
+            record = self.job_history.get(get_job_key(job, self.config))
+            self.assertEqual(record.seconds if record else None, 3.0)
+
+    def test_without_jobs(self) -> None:
+        self.assertEqual(
+            worker_pool.run_worker_pool(self.config, [], self.job_history), 0
+        )
+
+
+class TestPreload(unittest.TestCase):
+    def test_loads_all_inputs(self) -> None:
+        config = Config(
+            wow_class_spec_names=[("druid", "feral"), ("druid", "balance")],
+            fight_styles=["patchwerk", "beastlord"],
+            simulator_type_names=["races"],
+        )
+        with mock.patch(
+            "bloodytools.worker_pool.simulator_factory.get_simulator"
+        ) as get_simulator, mock.patch(
+            "bloodytools.worker_pool.game_data.preload"
+        ) as preload_game_data, mock.patch(
+            "bloodytools.worker_pool.get_run_metadata"
+        ) as get_run_metadata, mock.patch(
+            "bloodytools.worker_pool.load_talent_tree_paths",
+            side_effect=MissingTalentTreePathFileError,
+        ) as load_talent_tree_paths, mock.patch(
+            "bloodytools.worker_pool.get_profile", side_effect=FileNotFoundError
+        ) as get_profile:
+            # missing inputs are reported by the jobs
+            worker_pool.preload(config)
+
+        get_simulator.assert_called_once_with("races")
+        self.assertEqual(
+            get_simulator.return_value.preload.call_args_list,
+            [mock.call(wow_spec, config) for wow_spec in config.wow_specs],
+        )
+        preload_game_data.assert_called_once_with(config.wow_specs)
+        get_run_metadata.assert_called_once_with(config.executable)
+        self.assertEqual(load_talent_tree_paths.call_count, 2)
+        self.assertEqual(
+            [c.args[:2] for c in get_profile.call_args_list],
+            [
+                (get_wow_spec("druid", "feral"), "patchwerk"),
+                (get_wow_spec("druid", "feral"), "beastlord"),
+                (get_wow_spec("druid", "balance"), "patchwerk"),
+                (get_wow_spec("druid", "balance"), "beastlord"),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()